@@ -1,5 +1,5 @@
 """Core modules for the ExtractTimeseries application."""
 
-from . import logic
+from . import catalog, logic, swmm_out
 
-__all__ = ["logic"]
+__all__ = ["catalog", "logic", "swmm_out"]
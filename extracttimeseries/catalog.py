@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistent catalog index for SWMM ``.out`` files
+------------------------------------------------
+- Stores element IDs, variable names, period count, start time, report step
+  and section offsets in a small JSON sidecar
+- Validated against file size, mtime and a hash of the opening/closing records
+- Written next to the ``.out`` file, or into a cache directory when configured
+  (or when the model directory is read-only)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+CATALOG_VERSION = 1
+CATALOG_SUFFIX = ".catalog.json"
+CACHE_DIR_ENV = "EXTRACTTIMESERIES_CACHE_DIR"
+
+_settings: Dict[str, Any] = {"enabled": True, "cache_dir": os.environ.get(CACHE_DIR_ENV, "")}
+
+
+def configure_catalog(*, enabled: Optional[bool] = None, cache_dir: Optional[str] = None) -> None:
+    """Enable/disable sidecar catalogs or redirect them to ``cache_dir``."""
+
+    if enabled is not None:
+        _settings["enabled"] = bool(enabled)
+    if cache_dir is not None:
+        _settings["cache_dir"] = cache_dir
+
+
+def catalog_settings() -> Dict[str, Any]:
+    """Return the current :func:`configure_catalog` settings (e.g. for worker processes)."""
+
+    return dict(_settings)
+
+
+def default_cache_dir() -> str:
+    """Return the per-user fallback directory for catalogs."""
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "extracttimeseries")
+
+
+def _cache_name(abs_path: str) -> str:
+    digest = hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:12]
+    return f"{os.path.basename(abs_path)}.{digest}{CATALOG_SUFFIX}"
+
+
+def catalog_paths(outfile: str) -> list:
+    """Return candidate catalog locations for ``outfile`` in lookup order."""
+
+    abs_path = os.path.abspath(outfile)
+    if _settings["cache_dir"]:
+        return [os.path.join(_settings["cache_dir"], _cache_name(abs_path))]
+    return [
+        abs_path + CATALOG_SUFFIX,
+        os.path.join(default_cache_dir(), _cache_name(abs_path)),
+    ]
+
+
+def file_signature(outfile: str) -> Dict[str, Any]:
+    """Return the size, mtime and header hash used to validate a catalog.
+
+    The hash covers the opening record (magic, version, units, counts) and the
+    closing record (section offsets, period count, error code), which only
+    requires reading the first and last few bytes of the file.
+    """
+
+    st = os.stat(outfile)
+    with open(outfile, "rb") as fh:
+        head = fh.read(28)
+        fh.seek(max(0, st.st_size - 24))
+        tail = fh.read(24)
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "header_hash": hashlib.sha1(head + tail).hexdigest(),
+    }
+
+
+def build_catalog(reader: Any) -> Dict[str, Any]:
+    """Return the catalog payload for an open :class:`SwmmOutput`."""
+
+    return {
+        "catalog_version": CATALOG_VERSION,
+        "version": reader.version,
+        "flow_units": reader.flow_units,
+        "n_periods": reader.n_periods,
+        "start_date": reader.start_date.isoformat(),
+        "report_step": int(reader.report_step.total_seconds()),
+        "offsets": {
+            "ids": reader.ids_offset,
+            "properties": reader.properties_offset,
+            "results": reader.results_offset,
+            "period_bytes": reader.period_bytes,
+        },
+        "ids": {t: list(names) for t, names in reader.names.items()},
+        "variables": {t: list(vs) for t, vs in reader.variables.items()},
+    }
+
+
+def load_catalog(outfile: str) -> Optional[Dict[str, Any]]:
+    """Return a valid stored catalog for ``outfile`` or ``None``."""
+
+    if not _settings["enabled"]:
+        return None
+    try:
+        signature = file_signature(outfile)
+    except OSError:
+        return None
+    for path in catalog_paths(outfile):
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        if (
+            data.get("catalog_version") == CATALOG_VERSION
+            and all(data.get(k) == v for k, v in signature.items())
+        ):
+            return data
+    return None
+
+
+def write_catalog(outfile: str, catalog: Dict[str, Any]) -> Optional[str]:
+    """Persist ``catalog`` for ``outfile``; return the path written, if any."""
+
+    if not _settings["enabled"]:
+        return None
+    payload = dict(catalog)
+    payload.update(file_signature(outfile))
+    for path in catalog_paths(outfile):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(payload, fh, separators=(",", ":"))
+            os.replace(tmp, path)
+            return path
+        except OSError as e:
+            logging.debug(f"Could not write catalog {path}: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+    return None
@@ -245,14 +245,26 @@ def completion_art():
 # --- IMPORTS FROM LOGIC.PY ---
 from .logic import (
     combine_across_files,
-    discover_ids,
+    discover_all,
+    export_files,
+    events_table_path,
+    export_events,
+    export_summary,
     FilenameTemplateError,
-    list_possible_params,
     output_subdir_name,
+    parse_interval,
+    parse_thresholds,
+    parse_time_bound,
     plan_elements,
     process_elements,
+    RESAMPLE_AGGS,
+    resample_spec,
+    SegmentStore,
     resolve_output_subdirs,
+    series_keys,
+    summary_table_path,
 )
+from .swmm_out import pool_stats
 
 APP_ORG = "HH-Tools"
 APP_NAME = "Timeseries Extractor"
@@ -314,6 +326,43 @@ class SelectionState:
     time_format: str = "%m/%d/%Y %H:%M"
     float_format: str = "%.6f"
     pptx_path: str = ""
+    # Time window (blank = whole simulation)
+    start: str = ""
+    end: str = ""
+    # Decimation (1 = every period; report_every overrides stride)
+    stride: int = 1
+    report_every: str = ""
+    # On-read aggregation into fixed intervals (blank = off)
+    resample: str = ""
+    agg: str = "mean"
+    # Number of .out files exported at once (process pool when > 1)
+    jobs: int = 1
+    # Threads per file for reading and element chunks
+    threads: int = 1
+    # Value precision held in memory ("float64" | "float32")
+    dtype: str = "float64"
+    # One statistics table instead of time series (thresholds in output units)
+    summary: bool = False
+    # One table per file of runs above the thresholds
+    events: bool = False
+    thresholds: Dict[str, float] = field(default_factory=dict)
+
+
+def report_paths(st: SelectionState) -> Tuple[str, Dict[str, str]]:
+    """Return the summary table path ("" when off) and events table per file."""
+    summary_path = ""
+    if st.summary:
+        summary_path = summary_table_path(st.output_dir or os.getcwd(), st.prefix, st.suffix)
+    event_paths: Dict[str, str] = {}
+    if st.events:
+        subdir_map = resolve_output_subdirs(st.files, st.output_dir)
+        for outfile in st.files:
+            out_dir = os.path.join(
+                st.output_dir or os.path.dirname(outfile),
+                subdir_map.get(outfile, output_subdir_name(outfile)),
+            )
+            event_paths[outfile] = events_table_path(out_dir, st.prefix, st.suffix)
+    return summary_path, event_paths
 
 
 class FileList(QtWidgets.QListWidget):
@@ -499,26 +548,28 @@ class DiscoverWorker(QtCore.QThread):
         self.inc_re = re.compile(inc) if inc else None
         self.exc_re = re.compile(exc) if exc else None
         self.union = union
+        # Params per type of the first file, filled in by run()
+        self.params: Dict[str, List[str]] = {}
 
     def run(self):
         try:
             per_file: Dict[str, Dict[str, List[str]]] = {}
-            total = len(self.files) * len(TYPES)
-            done = 0
-            for f in self.files:
+            total = len(self.files)
+            for done, f in enumerate(self.files, 1):
+                found, params = discover_all(f)
+                if done == 1:
+                    self.params = params
                 per_file[f] = {}
                 for t in TYPES:
-                    ids = discover_ids(f, t)
                     flt = []
-                    for i in ids:
+                    for i in found.get(t, []):
                         if self.inc_re and not self.inc_re.search(i):
                             continue
                         if self.exc_re and self.exc_re.search(i):
                             continue
                         flt.append(i)
                     per_file[f][t] = flt
-                    done += 1
-                    self.progress.emit(done, total)
+                self.progress.emit(done, total)
             result: Dict[str, List[str]] = {}
             for t in TYPES:
                 if self.union:
@@ -543,6 +594,95 @@ class Worker(QtCore.QThread):
         self.plan_only = plan_only
         self._cancel = False
 
+    def _export_options(self, outfile: str, subdir_map: Dict[str, str]) -> Dict[str, object]:
+        """Return the ``export_outfile`` options for one input file."""
+        return dict(
+            out_format=self.state.out_format,
+            combine_mode=self.state.combine_mode,
+            outdir_root=self.state.output_dir or os.path.dirname(outfile),
+            out_subdir=subdir_map.get(outfile, output_subdir_name(outfile)),
+            time_format=self.state.time_format,
+            float_format=self.state.float_format,
+            prefix=self.state.prefix,
+            suffix=self.state.suffix,
+            dat_template=self.state.dat_template,
+            tsf_template_sep=self.state.tsf_template_sep,
+            tsf_template_com=self.state.tsf_template_com,
+            param_short=self.state.param_short,
+            label_map=self.state.label_map,
+            param_dimension=self.state.param_dimension,
+            assume_units=self.state.assume_units,
+            to_units=self.state.to_units,
+            unit_overrides=self.state.unit_overrides,
+            show_progress=False,
+            start=self.state.start,
+            end=self.state.end,
+            stride=self.state.stride,
+            report_every=self.state.report_every,
+            threads=self.state.threads,
+            dtype=self.state.dtype,
+            resample=self.state.resample,
+            agg=self.state.agg,
+        )
+
+    def _selected_keys(self) -> List[tuple]:
+        return [
+            k
+            for t in TYPES
+            if self.state.ids_by_type.get(t) and self.state.params_by_type.get(t)
+            for k in series_keys(t, self.state.ids_by_type[t], self.state.params_by_type[t])
+        ]
+
+    def _write_reports(self) -> List[str]:
+        """Write the summary and/or events tables for every selected series."""
+        keys = self._selected_keys()
+        summary_path, event_paths = report_paths(self.state)
+        options = dict(
+            time_format=self.state.time_format,
+            float_format=self.state.float_format,
+            start=self.state.start,
+            end=self.state.end,
+            stride=self.state.stride,
+            report_every=self.state.report_every,
+            param_dimension=self.state.param_dimension,
+            assume_units=self.state.assume_units,
+            to_units=self.state.to_units,
+            unit_overrides=self.state.unit_overrides,
+        )
+
+        def file_done(verb):
+            def cb(done, total, ctx):
+                self.msg.emit(f"{verb} {Path(ctx['outfile']).name or ctx['outfile']}")
+                self.progress.emit(done, total, {"file": ctx["outfile"]})
+                if self._cancel:
+                    raise RuntimeError("Canceled by user")
+            return cb
+
+        written: List[str] = []
+        if summary_path:
+            failures = export_summary(
+                [(outfile, keys) for outfile in self.state.files],
+                summary_path,
+                thresholds=self.state.thresholds,
+                progress_callback=file_done("Summarized"),
+                **options,
+            )
+            if failures:
+                self.msg.emit(f"{len(failures)} series could not be summarized")
+            self.msg.emit(f"Wrote summary table -> {summary_path}")
+            written.append(summary_path)
+        if event_paths:
+            tables, failures = export_events(
+                [(outfile, keys, event_paths[outfile]) for outfile in self.state.files],
+                self.state.thresholds,
+                progress_callback=file_done("Checked events in"),
+                **options,
+            )
+            if failures:
+                self.msg.emit(f"{len(failures)} series could not be checked for events")
+            written.extend(tables)
+        return written
+
     def cancel(self):
         self._cancel = True
 
@@ -550,6 +690,7 @@ class Worker(QtCore.QThread):
         try:
             written: List[str] = []
             planned: List[str] = []
+            segments: Optional[SegmentStore] = None
 
             file_count = len(self.state.files)
             action_text = "Planning outputs" if self.plan_only else "Starting extraction"
@@ -561,6 +702,15 @@ class Worker(QtCore.QThread):
                 files_label = f"{file_count} files"
             self.msg.emit(f"{action_text} for {files_label}…")
 
+            if self.state.summary or self.state.events:
+                if self.plan_only:
+                    summary_path, event_paths = report_paths(self.state)
+                    paths = ([summary_path] if summary_path else []) + list(event_paths.values())
+                else:
+                    paths = self._write_reports()
+                self.finished_ok.emit(paths)
+                return
+
             # Compute total series count for progress
             total = 0
             for f in self.state.files:
@@ -583,14 +733,12 @@ class Worker(QtCore.QThread):
 
             subdir_map = resolve_output_subdirs(self.state.files, self.state.output_dir)
 
-            for outfile in self.state.files:
-                outdir_root = self.state.output_dir or os.path.dirname(outfile)
-                subdir = subdir_map.get(outfile, output_subdir_name(outfile))
-                file_label = Path(outfile).name or outfile
-                per_file_action = "Planning" if self.plan_only else "Processing"
-                self.msg.emit(f"{per_file_action} {file_label}…")
-
-                if self.plan_only:
+            if self.plan_only:
+                for outfile in self.state.files:
+                    outdir_root = self.state.output_dir or os.path.dirname(outfile)
+                    subdir = subdir_map.get(outfile, output_subdir_name(outfile))
+                    file_label = Path(outfile).name or outfile
+                    self.msg.emit(f"Planning {file_label}…")
                     planned_for_file: List[str] = []
                     for t in TYPES:
                         ids = self.state.ids_by_type.get(t, [])
@@ -612,6 +760,8 @@ class Worker(QtCore.QThread):
                             self.state.tsf_template_com,
                             self.state.param_short,
                             out_subdir=subdir,
+                            start=self.state.start,
+                            end=self.state.end,
                         )
                         planned += planned_paths
                         planned_for_file.extend(planned_paths)
@@ -623,64 +773,76 @@ class Worker(QtCore.QThread):
                         self.msg.emit(
                             f"Finished planning {file_label} (no matching selections)"
                         )
-                else:
-                    written_for_file: List[str] = []
-                    failures_for_file: List[Tuple[str, str, str, str, str]] = []
-                    for t in TYPES:
-                        ids = self.state.ids_by_type.get(t, [])
-                        params = self.state.params_by_type.get(t, [])
-                        if not ids or not params:
-                            continue
-                        paths, failures = process_elements(
-                            outfile,
-                            t,
-                            ids,
-                            params,
-                            self.state.out_format,
-                            self.state.combine_mode,
-                            outdir_root,
-                            out_subdir=subdir,
-                            time_format=self.state.time_format,
-                            float_format=self.state.float_format,
-                            prefix=self.state.prefix,
-                            suffix=self.state.suffix,
-                            dat_template=self.state.dat_template,
-                            tsf_template_sep=self.state.tsf_template_sep,
-                            tsf_template_com=self.state.tsf_template_com,
-                            param_short=self.state.param_short,
-                            label_map=self.state.label_map,
-                            param_dimension=self.state.param_dimension,
-                            assume_units=self.state.assume_units,
-                            to_units=self.state.to_units,
-                            unit_overrides=self.state.unit_overrides,
-                            show_progress=False,
-                            ppt=None,
-                            progress_callback=cb,
-                        )
-                        written.extend(paths)
-                        written_for_file.extend(paths)
-                        failures_for_file.extend(failures)
-                    count = len(written_for_file)
+            else:
+                tasks = [
+                    (
+                        outfile,
+                        [
+                            (t, self.state.ids_by_type.get(t, []), self.state.params_by_type.get(t, []))
+                            for t in TYPES
+                            if self.state.ids_by_type.get(t) and self.state.params_by_type.get(t)
+                        ],
+                        self._export_options(outfile, subdir_map),
+                    )
+                    for outfile in self.state.files
+                ]
+
+                def file_done(outfile, new_files, failures):
+                    file_label = Path(outfile).name or outfile
+                    count = len(new_files)
                     if count:
                         outputs_label = "file" if count == 1 else "files"
                         summary = f"Finished processing {file_label}: {count} {outputs_label}"
                     else:
                         summary = f"Finished processing {file_label}: no files written"
-                    if failures_for_file:
-                        failure_label = "failure" if len(failures_for_file) == 1 else "failures"
-                        summary += f" ({len(failures_for_file)} {failure_label})"
+                    if failures:
+                        failure_label = "failure" if len(failures) == 1 else "failures"
+                        summary += f" ({len(failures)} {failure_label})"
                     self.msg.emit(summary)
 
+                jobs = min(max(1, self.state.jobs), max(1, len(tasks)))
+                if self.state.combine_mode == "across":
+                    segments = SegmentStore()
+                if jobs > 1:
+                    self.msg.emit(f"Processing {len(tasks)} files on {jobs} processes…")
+                    new_files, _ = export_files(
+                        tasks, jobs=jobs, progress_callback=cb, file_callback=file_done,
+                        segments=segments,
+                    )
+                else:
+                    new_files = []
+                    for task in tasks:
+                        self.msg.emit(f"Processing {Path(task[0]).name or task[0]}…")
+                        done_files, _ = export_files(
+                            [task], progress_callback=cb, file_callback=file_done,
+                            segments=segments,
+                        )
+                        new_files.extend(done_files)
+                written = [path for _, path in new_files]
+
             # Post-processing combine
             if not self.plan_only and self.state.combine_mode == "across" and written:
                 self.msg.emit("Combining outputs across files…")
                 combine_across_files(
-                    written,
+                    new_files,
                     self.state.out_format,
                     (self.state.output_dir or os.getcwd()),
+                    start=self.state.start,
+                    end=self.state.end,
+                    dtype=self.state.dtype,
+                    segments=segments,
+                    jobs=self.state.jobs,
+                    float_format=self.state.float_format,
                 )
                 self.msg.emit("Finished combining outputs across files.")
 
+            if not self.plan_only:
+                stats = pool_stats()
+                self.msg.emit(
+                    f"Reader cache: {stats['hits']} hits, {stats['misses']} misses, "
+                    f"{stats['evictions']} evictions"
+                )
+
             self.finished_ok.emit(planned if self.plan_only else written)
         except FilenameTemplateError as e:
             self.failed.emit(str(e))
@@ -940,6 +1102,61 @@ class ExtractorWindow(QtWidgets.QMainWindow):
         self.suffix = QtWidgets.QLineEdit()
         self.suffix.setClearButtonEnabled(True)
         self.suffix.setToolTip("Suffix added to filenames")
+        self.start_edit = QtWidgets.QLineEdit()
+        self.start_edit.setClearButtonEnabled(True)
+        self.start_edit.setPlaceholderText("YYYY-MM-DD HH:MM (optional)")
+        self.start_edit.setToolTip("Only export periods at or after this date/time")
+        self.end_edit = QtWidgets.QLineEdit()
+        self.end_edit.setClearButtonEnabled(True)
+        self.end_edit.setPlaceholderText("YYYY-MM-DD HH:MM (optional)")
+        self.end_edit.setToolTip("Only export periods at or before this date/time")
+        self.stride_spin = QtWidgets.QSpinBox()
+        self.stride_spin.setRange(1, 1000000)
+        self.stride_spin.setValue(1)
+        self.stride_spin.setToolTip("Export only every Nth reporting period (1 = all)")
+        self.report_every_edit = QtWidgets.QLineEdit()
+        self.report_every_edit.setClearButtonEnabled(True)
+        self.report_every_edit.setPlaceholderText("e.g. 1h, 15min (optional)")
+        self.report_every_edit.setToolTip(
+            "Export one period per interval; overrides the stride when set"
+        )
+        self.resample_edit = QtWidgets.QLineEdit()
+        self.resample_edit.setClearButtonEnabled(True)
+        self.resample_edit.setPlaceholderText("e.g. 1h, 1D (optional)")
+        self.resample_edit.setToolTip("Aggregate each series into fixed intervals while reading")
+        self.agg_combo = QtWidgets.QComboBox()
+        self.agg_combo.addItems(list(RESAMPLE_AGGS))
+        self.agg_combo.setToolTip("Aggregation applied to each resample interval")
+        self.jobs_spin = QtWidgets.QSpinBox()
+        self.jobs_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.jobs_spin.setValue(1)
+        self.jobs_spin.setToolTip("Number of .out files to export at once")
+        self.threads_spin = QtWidgets.QSpinBox()
+        self.threads_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.threads_spin.setValue(1)
+        self.threads_spin.setToolTip(
+            "Threads used within each file to read and write element chunks"
+        )
+        self.dtype_combo = QtWidgets.QComboBox()
+        self.dtype_combo.addItem("Double (float64)", "float64")
+        self.dtype_combo.addItem("Single (float32, less memory)", "float32")
+        self.dtype_combo.setToolTip(
+            "Precision of values held in memory; SWMM stores results as float32"
+        )
+        self.summary_check = QtWidgets.QCheckBox("Write summary table instead of time series")
+        self.summary_check.setToolTip(
+            "One row per series: peak, time of peak, min, mean, total volume and hours above threshold"
+        )
+        self.events_check = QtWidgets.QCheckBox("Write event tables instead of time series")
+        self.events_check.setToolTip(
+            "One table per file of runs above the thresholds: start, end, duration and peak"
+        )
+        self.thresholds_edit = QtWidgets.QLineEdit()
+        self.thresholds_edit.setClearButtonEnabled(True)
+        self.thresholds_edit.setPlaceholderText("e.g. Flow_rate=10,Depth_above_invert=2")
+        self.thresholds_edit.setToolTip(
+            "Per-parameter thresholds (output units) for the summary and event tables"
+        )
         self.template = QtWidgets.QLineEdit()
         self.template.setClearButtonEnabled(True)
         self.template.setToolTip("Filename pattern for output files")
@@ -962,6 +1179,37 @@ class ExtractorWindow(QtWidgets.QMainWindow):
         fo.addWidget(QtWidgets.QLabel("Suffix"), r, 2)
         fo.addWidget(self.suffix, r, 3)
         r += 1
+        fo.addWidget(QtWidgets.QLabel("Start"), r, 0)
+        fo.addWidget(self.start_edit, r, 1)
+        fo.addWidget(QtWidgets.QLabel("End"), r, 2)
+        fo.addWidget(self.end_edit, r, 3)
+        r += 1
+        fo.addWidget(QtWidgets.QLabel("Every Nth"), r, 0)
+        fo.addWidget(self.stride_spin, r, 1)
+        fo.addWidget(QtWidgets.QLabel("Report every"), r, 2)
+        fo.addWidget(self.report_every_edit, r, 3)
+        r += 1
+        fo.addWidget(QtWidgets.QLabel("Resample"), r, 0)
+        fo.addWidget(self.resample_edit, r, 1)
+        fo.addWidget(QtWidgets.QLabel("Aggregate"), r, 2)
+        fo.addWidget(self.agg_combo, r, 3)
+        r += 1
+        fo.addWidget(QtWidgets.QLabel("Parallel files"), r, 0)
+        fo.addWidget(self.jobs_spin, r, 1)
+        fo.addWidget(QtWidgets.QLabel("Threads per file"), r, 2)
+        fo.addWidget(self.threads_spin, r, 3)
+        r += 1
+        fo.addWidget(QtWidgets.QLabel("Precision"), r, 0)
+        fo.addWidget(self.dtype_combo, r, 1)
+        r += 1
+        fo.addWidget(QtWidgets.QLabel("Summary"), r, 0)
+        fo.addWidget(self.summary_check, r, 1)
+        fo.addWidget(QtWidgets.QLabel("Thresholds"), r, 2)
+        fo.addWidget(self.thresholds_edit, r, 3)
+        r += 1
+        fo.addWidget(QtWidgets.QLabel("Events"), r, 0)
+        fo.addWidget(self.events_check, r, 1)
+        r += 1
         self.template_group = QtWidgets.QGroupBox("Filename template")
         tpl = QtWidgets.QFormLayout(self.template_group)
         tpl.setFieldGrowthPolicy(QtWidgets.QFormLayout.AllNonFixedFieldsGrow)
@@ -997,6 +1245,8 @@ class ExtractorWindow(QtWidgets.QMainWindow):
             self.output_dir,
             self.prefix,
             self.suffix,
+            self.start_edit,
+            self.end_edit,
             self.template,
         ]:
             if isinstance(w, QtWidgets.QComboBox):
@@ -1057,6 +1307,9 @@ class ExtractorWindow(QtWidgets.QMainWindow):
         self.template.setText(self._current_template_default())
 
     def _plan_output_paths(self, st: SelectionState) -> List[str]:
+        if st.summary or st.events:
+            summary_path, event_paths = report_paths(st)
+            return ([summary_path] if summary_path else []) + list(event_paths.values())
         planned_all: List[str] = []
         for f in st.files:
             outdir_root = st.output_dir or os.path.dirname(f)
@@ -1079,6 +1332,8 @@ class ExtractorWindow(QtWidgets.QMainWindow):
                     st.tsf_template_sep,
                     st.tsf_template_com,
                     st.param_short,
+                    start=st.start,
+                    end=st.end,
                 )
                 planned_all.extend(planned)
         return planned_all
@@ -1231,7 +1486,7 @@ class ExtractorWindow(QtWidgets.QMainWindow):
                 self.id_lists[t].set_items(res.get(t, []))
                 lst = self.param_lists.get(t)
                 if lst and lst.list.count() == 0 and files:
-                    lst.set_items(list_possible_params(files[0], t))
+                    lst.set_items(self.discover_worker.params.get(t, []))
             self._update_id_counts()
             self.discover_progress.setRange(0, 1)
             self.discover_progress.setVisible(False)
@@ -1396,8 +1651,9 @@ class ExtractorWindow(QtWidgets.QMainWindow):
                         display_paths[original] = rel
                         used_relative = True
             for f in files:
+                found, _ = discover_all(f)
                 for t in needed_types:
-                    cache[(f, t)] = set(discover_ids(f, t))
+                    cache[(f, t)] = set(found.get(t, []))
             for f in files:
                 for t, i in pasted:
                     if i not in cache.get((f, t), set()):
@@ -1456,6 +1712,36 @@ class ExtractorWindow(QtWidgets.QMainWindow):
             s = "_" + s
         st.prefix = p
         st.suffix = s
+        st.start = self.start_edit.text().strip()
+        st.end = self.end_edit.text().strip()
+        for label, value in (("start", st.start), ("end", st.end)):
+            try:
+                parse_time_bound(value)
+            except ValueError as e:
+                raise RuntimeError(f"Invalid {label} time: {e}") from e
+        st.stride = self.stride_spin.value()
+        st.jobs = self.jobs_spin.value()
+        st.threads = self.threads_spin.value()
+        st.dtype = self.dtype_combo.currentData()
+        st.report_every = self.report_every_edit.text().strip()
+        try:
+            parse_interval(st.report_every)
+        except ValueError as e:
+            raise RuntimeError(f"Invalid report interval: {e}") from e
+        st.resample = self.resample_edit.text().strip()
+        st.agg = self.agg_combo.currentText()
+        try:
+            resample_spec(st.resample, st.agg)
+        except ValueError as e:
+            raise RuntimeError(f"Invalid resample interval: {e}") from e
+        st.summary = self.summary_check.isChecked()
+        st.events = self.events_check.isChecked()
+        try:
+            st.thresholds = parse_thresholds(self.thresholds_edit.text().strip())
+        except ValueError as e:
+            raise RuntimeError(str(e)) from e
+        if st.events and not st.thresholds:
+            raise RuntimeError("Event tables need at least one threshold, e.g. Depth_above_invert=2")
         st.template = self.template.text().strip()
         st.dat_template = ""
         st.tsf_template_sep = ""
@@ -1482,7 +1768,7 @@ class ExtractorWindow(QtWidgets.QMainWindow):
         except FilenameTemplateError as e:
             QtWidgets.QMessageBox.warning(self, "Invalid template", str(e))
             return
-        if not self._confirm_output_overwrite(planned_all, st.out_format):
+        if not self._confirm_output_overwrite(planned_all, "csv" if st.summary or st.events else st.out_format):
             return
         self.preview_box.setPlainText(
             "\n".join(
@@ -1509,14 +1795,15 @@ class ExtractorWindow(QtWidgets.QMainWindow):
             return
 
         # Param discovery on demand if lists are empty
-        for t in TYPES:
-            lst = self.param_lists[t]
-            if lst.list.count() == 0 and st.files:
-                # discover from first file
-                lst.set_items(list_possible_params(st.files[0], t))
+        empty = [t for t in TYPES if self.param_lists[t].list.count() == 0]
+        if empty and st.files:
+            # discover from first file
+            _, params = discover_all(st.files[0])
+            for t in empty:
+                self.param_lists[t].set_items(params.get(t, []))
 
         planned_all = self._plan_output_paths(st)
-        if not self._confirm_output_overwrite(planned_all, st.out_format):
+        if not self._confirm_output_overwrite(planned_all, "csv" if st.summary or st.events else st.out_format):
             return
 
         self.log.clear()
@@ -11,6 +11,7 @@ SWMM Unified Extractor — v4 (Callbacks + Planning)
 from __future__ import annotations
 
 import argparse
+import ast
 import csv
 import glob
 import hashlib
@@ -19,12 +20,18 @@ import os
 import re
 import sys
 import logging
+import queue
+import threading
 from collections import defaultdict
+from contextlib import contextmanager
+from functools import partial
 from datetime import datetime
-from typing import Dict, List, Tuple, Iterable, Optional, Any, Callable, Set
+from typing import Dict, List, Tuple, Iterable, Iterator, Optional, Any, Callable, Set
 
 from tqdm import tqdm
 
+from .reductions import RESAMPLE_AGGREGATIONS as RESAMPLE_AGGS
+
 # Import swmmtoolbox and its bundled utilities eagerly so that packaging tools
 # (e.g. PyInstaller) can detect the dependency tree.  Failing early if the
 # vendored ``toolbox_utils`` package is missing helps avoid silent extraction
@@ -75,6 +82,92 @@ def parse_kv_map(s: str) -> Dict[str, str]:
 def normalize_unit(u: str) -> str:
     return (u or "").strip().lower()
 
+def parse_time_bound(value: Any):
+    """Return ``value`` as a ``pandas.Timestamp`` or ``None`` when blank."""
+    import pandas as pd
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    try:
+        ts = pd.Timestamp(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid date/time '{value}'") from exc
+    if ts is pd.NaT:
+        raise ValueError(f"Invalid date/time '{value}'")
+    return ts
+
+WINDOW_TOKEN_FORMAT = "%Y%m%d%H%M"
+
+def window_fields(start: Any = None, end: Any = None) -> Dict[str, str]:
+    """Return the ``{start}``/``{end}`` filename template fields for a time window."""
+    start, end = parse_time_bound(start), parse_time_bound(end)
+    return {
+        "start": start.strftime(WINDOW_TOKEN_FORMAT) if start is not None else "",
+        "end": end.strftime(WINDOW_TOKEN_FORMAT) if end is not None else "",
+    }
+
+def parse_interval(value: Any):
+    """Return ``value`` as a positive ``pandas.Timedelta`` or ``None`` when blank."""
+    import pandas as pd
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    try:
+        td = pd.Timedelta(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid interval '{value}'") from exc
+    if td is pd.NaT or td <= pd.Timedelta(0):
+        raise ValueError(f"Invalid interval '{value}'")
+    return td
+
+def resolve_stride(report_step: float, stride: Any = 1, report_every: Any = None) -> int:
+    """Return how many period records to advance per exported row.
+
+    ``report_every`` (a timedelta) wins over ``stride`` and is converted with
+    the file's ``report_step`` in seconds.  Intervals that are not a whole
+    multiple of the report step are rounded to the nearest one with a warning.
+    """
+    every = parse_interval(report_every)
+    if every is None:
+        return max(1, int(stride or 1))
+    seconds = every.total_seconds()
+    if report_step <= 0:
+        return 1
+    ratio = seconds / report_step
+    n = max(1, int(round(ratio)))
+    if abs(ratio - n) > 1e-9:
+        logging.warning(
+            f"Report interval {report_every} is not a multiple of the {report_step:g}s "
+            f"report step; using every {n} period(s)"
+        )
+    return n
+
+def resample_spec(resample: Any = None, agg: Any = None) -> Tuple[Any, str]:
+    """Return ``(interval, agg)`` for on-read resampling; interval is ``None`` when off.
+
+    Only fixed-width intervals (e.g. ``1h``, ``1D``) are supported, in whole
+    seconds; ``agg`` defaults to ``mean``.
+    """
+    every = parse_interval(resample)
+    agg = (agg or "mean").strip().lower()
+    if agg not in RESAMPLE_AGGS:
+        raise ValueError(f"Unsupported aggregation '{agg}' (expected one of {', '.join(RESAMPLE_AGGS)})")
+    if every is not None and (every.total_seconds() < 1 or every.total_seconds() % 1):
+        raise ValueError(f"Resample interval '{resample}' must be a whole number of seconds")
+    return every, agg
+
+VALUE_DTYPES = ("float64", "float32")
+
+def value_dtype(dtype: Any = None):
+    """Return the NumPy dtype used for extracted values (``float64`` by default).
+
+    ``float32`` keeps SWMM's native 4-byte results through unit conversion,
+    combining and writing, halving the memory held per series.
+    """
+    import numpy as np
+    name = str(np.dtype(dtype or "float64"))
+    if name not in VALUE_DTYPES:
+        raise ValueError(f"Unsupported dtype '{dtype}' (expected one of {', '.join(VALUE_DTYPES)})")
+    return np.dtype(name)
+
 INVALID_FS_CHARS = set('<>:"/\\|?*')
 
 
@@ -256,101 +349,384 @@ def convert_series_by_dim(values, dim: str, from_unit: str, to_unit: str):
     import pandas as pd
     if not isinstance(values, pd.Series):
         values = pd.Series(values)
+    converted = convert_values(values.to_numpy(), dim, from_unit, to_unit)
+    if converted is None:
+        return values
+    return pd.Series(converted, index=values.index, name=values.name)
 
+def convert_values(values, dim: str, from_unit: str, to_unit: str):
+    """Array core of :func:`convert_series_by_dim`; ``None`` when nothing converts."""
     if not from_unit or not to_unit or normalize_unit(from_unit) == normalize_unit(to_unit):
-        return values
+        return None
 
     fu = normalize_unit(from_unit)
     tu = normalize_unit(to_unit)
 
     if dim == "flow":
         if fu not in FLOW_TO_CFS or tu not in FLOW_TO_CFS:
-            return values
+            return None
         return values * (FLOW_TO_CFS[fu] / FLOW_TO_CFS[tu])
 
     if dim in ("depth", "head"):
         if fu not in LENGTH_TO_FT or tu not in LENGTH_TO_FT:
-            return values
+            return None
         v_ft = values * LENGTH_TO_FT[fu]
         return v_ft / LENGTH_TO_FT[tu]
 
     if dim == "velocity":
         if fu not in VEL_TO_FTPS or tu not in VEL_TO_FTPS:
-            return values
+            return None
         v_ftps = values * VEL_TO_FTPS[fu]
         return v_ftps / VEL_TO_FTPS[tu]
 
-    return values
+    return None
+
+def unit_route(param: str, param_dimension: Dict[str, str], assume_units: Dict[str, str],
+               to_units: Dict[str, str], unit_overrides: Dict[str, str]) -> Optional[Tuple[str, str, str]]:
+    """Return ``(dim, from_unit, to_unit)`` when ``param`` is converted, else ``None``."""
+    dim = param_dimension.get(param, DEFAULT_PARAM_DIM.get(param, "other"))
+    from_u = unit_overrides.get(param, assume_units.get(dim, ""))
+    to_u   = unit_overrides.get(param, to_units.get(dim, from_u))
+    if from_u and to_u and from_u != to_u and dim in DIMENSIONS and dim != "other":
+        return dim, from_u, to_u
+    return None
+
+_UNIT_TABLES = {"flow": FLOW_TO_CFS, "depth": LENGTH_TO_FT, "head": LENGTH_TO_FT, "velocity": VEL_TO_FTPS}
+
+class UnitPlan:
+    """Unit conversion for one run, resolved once per param.
+
+    Each param is routed to ``(dim, from, to)`` as :func:`apply_units` does
+    and reduced to a ``(multiplier, divisor, unit)`` scale from the
+    conversion tables.  :meth:`apply` then converts a whole value matrix in
+    place with one broadcast multiply and one broadcast divide, performing
+    the same floating-point operations as :func:`convert_series_by_dim`.
+    """
+
+    def __init__(self, param_dimension: Dict[str, str], assume_units: Dict[str, str],
+                 to_units: Dict[str, str], unit_overrides: Dict[str, str]):
+        self.maps = (dict(param_dimension), dict(assume_units), dict(to_units), dict(unit_overrides))
+        self.key = tuple(tuple(sorted(m.items())) for m in self.maps)
+        self._scales: Dict[str, Tuple[float, float, Optional[str]]] = {}
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, UnitPlan) and other.key == self.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def scale(self, param: str) -> Tuple[float, float, Optional[str]]:
+        """Return ``(multiplier, divisor, output unit)``; the unit is ``None`` when not converted."""
+        scale = self._scales.get(param)
+        if scale is None:
+            route = unit_route(param, *self.maps)
+            if route is None:
+                scale = (1.0, 1.0, None)
+            else:
+                dim, from_u, to_u = route
+                fu, tu = normalize_unit(from_u), normalize_unit(to_u)
+                table = _UNIT_TABLES.get(dim, {})
+                if fu == tu or fu not in table or tu not in table:
+                    scale = (1.0, 1.0, to_u)
+                elif dim == "flow":
+                    scale = (table[fu] / table[tu], 1.0, to_u)
+                else:
+                    # via ft / ft/s, as convert_series_by_dim does
+                    scale = (table[fu], table[tu], to_u)
+            self._scales[param] = scale
+        return scale
+
+    def dimension(self, param: str) -> str:
+        """Return the dimension of ``param`` (``"other"`` when unknown)."""
+        return self.maps[0].get(param, DEFAULT_PARAM_DIM.get(param, "other"))
+
+    def unit(self, param: str) -> Optional[str]:
+        """Return the output unit of ``param`` (``None`` when not converted)."""
+        return self.scale(param)[2]
+
+    def factor(self, param: str) -> float:
+        """Return the single linear factor from file units to output units."""
+        mul, div, _ = self.scale(param)
+        return mul / div
+
+    def apply(self, values, params: List[str]) -> None:
+        """Convert ``values`` (one column per entry of ``params``) in place."""
+        import numpy as np
+
+        scales = [self.scale(p) for p in params]
+        if any(mul != 1.0 for mul, _, _ in scales):
+            values *= np.array([mul for mul, _, _ in scales], dtype=values.dtype)
+        if any(div != 1.0 for _, div, _ in scales):
+            values /= np.array([div for _, div, _ in scales], dtype=values.dtype)
 
 # ---------------------------------
-# swmmtoolbox discovery helpers
+# Discovery helpers (native reader, swmmtoolbox fallback)
 # ---------------------------------
 
-def list_possible_params(outfile: str, item_type: str) -> List[str]:
-    """Return params available for ``item_type`` in an ``.out`` file."""
-    require_swmmtoolbox()
-    try:
-        if item_type == "pollutant":
-            # swmmtoolbox does not expose pollutants via listvariables;
-            # they only have one variable: concentration
-            return ["Concentration"]
+@contextmanager
+def swmm_output(outfile: str) -> Iterator[Any]:
+    """Yield the shared native :class:`SwmmOutput` for ``outfile`` or ``None``.
 
-        vars_ = swmmtoolbox.listvariables(outfile)
-    except Exception:
-        return []
+    Readers come from the process-wide LRU pool in :mod:`.swmm_out`, so the
+    header is parsed once per file no matter how many discovery or
+    extraction calls follow.  ``None`` means the native reader could not
+    parse the file and callers should fall back to ``swmmtoolbox``.
+    """
+    from .swmm_out import OUTPUT_POOL, SwmmOutputError
 
-    params = {row[1] for row in vars_ if row and row[0] == item_type}
-    return sorted(params)
+    try:
+        reader = OUTPUT_POOL.acquire(outfile)
+    except (SwmmOutputError, OSError) as e:
+        logging.debug(f"Native reader unavailable for {outfile}: {e}")
+        reader = None
+    try:
+        yield reader
+    finally:
+        if reader is not None:
+            OUTPUT_POOL.release(reader)
 
 
-def discover_ids(outfile: str, item_type: str) -> List[str]:
-    """Return IDs for an ``item_type`` in an ``.out`` file."""
-    require_swmmtoolbox()
-    try:
-        if item_type == "pollutant":
-            # Pollutant names live in the SwmmExtract object
+def file_catalog(outfile: str) -> Optional[Dict[str, Any]]:
+    """Return the catalog index (IDs, variables, timing) for ``outfile``.
+
+    A valid sidecar index is loaded without touching the results; otherwise
+    the header is parsed natively and the index is written for next time.
+    ``None`` means the file can only be read through ``swmmtoolbox``.
+    """
+    from .catalog import build_catalog, load_catalog, write_catalog
+
+    data = load_catalog(outfile)
+    if data is not None:
+        return data
+    with swmm_output(outfile) as reader:
+        if reader is None:
+            return None
+        data = build_catalog(reader)
+    write_catalog(outfile, data)
+    return data
+
+
+def discover_all(outfile: str) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """Return ``(ids, params)`` for every item type of an ``.out`` file.
+
+    Both dicts are keyed by item type and come from a single header parse
+    (or the sidecar catalog).  Pollutant IDs keep file order, everything
+    else is sorted.  Files the native reader cannot parse are opened once
+    through ``swmmtoolbox``; an unreadable file gives empty lists.
+    """
+    from .swmm_out import ITEM_TYPES
+
+    ids: Dict[str, List[str]] = {t: [] for t in ITEM_TYPES}
+    params: Dict[str, List[str]] = {t: [] for t in ITEM_TYPES}
+    # pollutants are not an item type of their own in the .out file;
+    # they only have one variable: concentration
+    params["pollutant"] = ["Concentration"]
+
+    catalog = file_catalog(outfile)
+    if catalog is not None:
+        names = catalog["ids"]
+        variables = catalog["variables"]
+    else:
+        require_swmmtoolbox()
+        try:
             obj = swmmtoolbox.swmmtoolbox.SwmmExtract(outfile)
-            return list(obj.names[3])
+        except Exception:
+            return ids, params
+        names, variables = {}, {}
+        for i, t in enumerate(obj.itemlist):
+            names[t] = list(obj.names[i])
+            if t != "pollutant":
+                n = obj.type_check(t)
+                codes = [obj.varcode[n][j] for j in obj.vars[n]]
+                variables[t] = [c.decode() if isinstance(c, bytes) else str(c) for c in codes]
+
+    for t, found in names.items():
+        # Pollutants keep file order, matching the SwmmExtract name list
+        ids[t] = list(found) if t == "pollutant" else sorted(set(found))
+    for t, found in variables.items():
+        if t != "pollutant":
+            params[t] = sorted(set(found))
+    return ids, params
 
-        catalog = swmmtoolbox.catalog(outfile, item_type)
-    except Exception:
-        return []
 
-    ids = {row[1] for row in catalog if row and len(row) > 1}
-    return sorted(ids)
+def list_possible_params(outfile: str, item_type: str) -> List[str]:
+    """Return params available for ``item_type`` in an ``.out`` file."""
+    return discover_all(outfile)[1].get(item_type, [])
+
+
+def discover_ids(outfile: str, item_type: str) -> List[str]:
+    """Return IDs for an ``item_type`` in an ``.out`` file."""
+    return discover_all(outfile)[0].get(item_type, [])
 
 # ----------------------------
 # Export helpers (TSF / DAT)
 # ----------------------------
 
-def _write_with_headers(df, filename: str, header_lines: List[str], time_format: str, float_format: str, sep: str = "\t") -> None:
+WRITE_CHUNK_ROWS = 65536
+
+_FAST_TIME_FORMAT = re.compile(r"^(?:[ -$&-~]|%[YmdHMS%])*$")  # ASCII literals only
+_DIRECTIVE_WIDTH = {"Y": 4, "m": 2, "d": 2, "H": 2, "M": 2, "S": 2}
+_DIRECTIVE_FIELD = {"Y": "year", "m": "month", "d": "day", "H": "hour", "M": "minute", "S": "second"}
+
+
+def format_timestamps(index, time_format: str):
+    """Return ``index`` rendered with ``time_format`` as an object array of str.
+
+    Formats built only from ``%Y %m %d %H %M %S`` and ASCII literals are
+    written digit by digit into a fixed-width byte matrix; anything else goes
+    through ``DatetimeIndex.strftime``.  Either way the text matches
+    ``Timestamp.strftime`` exactly.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.DatetimeIndex(pd.to_datetime(index))
+    if not len(index):
+        return np.empty(0, dtype=object)
+    if (
+        not _FAST_TIME_FORMAT.match(time_format)
+        or index.hasnans
+        or index.tz is not None
+        or not 1000 <= index.year.min() <= index.year.max() <= 9999
+    ):
+        return np.asarray(index.strftime(time_format), dtype=object)
+
+    pieces: List[Tuple[str, str]] = re.findall(r"([^%]*)(?:%(.)|$)", time_format)
+    width = sum(len(lit) + _DIRECTIVE_WIDTH.get(d, len(d)) for lit, d in pieces)
+    buf = np.empty((len(index), width), dtype=np.uint8)
+    pos = 0
+    for literal, directive in pieces:
+        if directive == "%":
+            literal += "%"
+        if literal:
+            buf[:, pos:pos + len(literal)] = np.frombuffer(literal.encode("ascii"), dtype=np.uint8)
+            pos += len(literal)
+        if directive in _DIRECTIVE_WIDTH:
+            values = getattr(index, _DIRECTIVE_FIELD[directive]).to_numpy().astype(np.int64)
+            w = _DIRECTIVE_WIDTH[directive]
+            for k in range(w):
+                buf[:, pos + w - 1 - k] = 48 + (values // 10 ** k) % 10
+            pos += w
+    if not width:
+        return np.full(len(index), "", dtype=object)
+    return buf.view(f"S{width}")[:, 0].astype(f"U{width}").astype(object)
+
+
+class TimestampCache:
+    """Formatted time columns reused by every writer that shares an index.
+
+    Entries are keyed by ``(source, time_format)`` and only served while the
+    index being written equals the one they were formatted from.  At most
+    ``max_entries`` columns are kept; the least recently used goes first.
+    """
+
+    def __init__(self, max_entries: int = 4):
+        self.max_entries = max(1, int(max_entries))
+        self._entries: Dict[Tuple[Any, str], Tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, source: Any, index, time_format: str):
+        key = (source, time_format)
+        with self._lock:
+            hit = self._entries.pop(key, None)
+            if hit is None or not (hit[0] is index or hit[0].equals(index)):
+                hit = (index, format_timestamps(index, time_format))
+            self._entries[key] = hit
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            return hit[1]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _format_cell(v: Any, float_format: str) -> str:
+    if v is None:
+        return ""
+    try:
+        return float_format % float(v)
+    except Exception:
+        return str(v)
+
+
+def format_values(column, float_format: str):
+    """Return ``column`` rendered with ``float_format`` as an object array.
+
+    Numeric columns are formatted in one comprehension; other columns go
+    cell by cell so ``None`` is left blank and text falls back to ``str``.
+    """
+    import numpy as np
     import pandas as pd
+
+    if isinstance(column, np.ndarray) and column.dtype.kind in "fiub":
+        series = column
+    else:
+        series = column if isinstance(column, pd.Series) else pd.Series(column)
+    if series.dtype.kind in "fiub":
+        try:
+            # tolist() widens float32 cells to Python floats one at a time
+            arr = np.asarray(series)
+            values = (arr if arr.dtype.kind == "f" else arr.astype(np.float64)).tolist()
+            return np.array([float_format % v for v in values], dtype=object)
+        except Exception:
+            pass
+    cells = [_format_cell(v, float_format) for v in series.tolist()]
+    out = np.empty(len(cells), dtype=object)
+    out[:] = cells
+    return out
+
+
+def _write_with_headers(df, filename: str, header_lines: List[str], time_format: str,
+                        float_format: str, sep: str = "\t", timestamps: Any = None) -> None:
+    """Write header lines followed by one ``time<sep>value...`` row per index entry."""
+    import pandas as pd
+    index = df.index
+    if len(index) and timestamps is None and not isinstance(index, pd.DatetimeIndex):
+        index = pd.to_datetime(index)
+    _write_columns(filename, header_lines, index, [df.iloc[:, j] for j in range(df.shape[1])],
+                   time_format, float_format, sep, timestamps)
+
+
+def _write_columns(filename: str, header_lines: List[str], index, columns: List[Any],
+                   time_format: str, float_format: str, sep: str = "\t",
+                   timestamps: Any = None) -> None:
+    """Write ``columns`` (arrays on ``index``) below ``header_lines``.
+
+    The time column (or the pre-formatted ``timestamps``) and every value
+    column are formatted once, then rows are joined and written in blocks of
+    :data:`WRITE_CHUNK_ROWS` lines.
+    """
     dirpath = os.path.dirname(filename) or "."
     if dirpath not in {"", "."}:
         os.makedirs(dirpath, exist_ok=True)
     with open(filename, "w", encoding="utf-8", newline="") as f:
         for h in header_lines:
             f.write(h.rstrip("\n") + "\n")
-        # Write data
-        if not isinstance(df.index, pd.DatetimeIndex):
-            df = df.copy()
-            df.index = pd.to_datetime(df.index)
-        for ts, row in df.iterrows():
-            f.write(ts.strftime(time_format))
-            for v in row:
-                if v is None:
-                    f.write(sep)
-                else:
-                    try:
-                        f.write(sep + (float_format % float(v)))
-                    except Exception:
-                        f.write(sep + str(v))
-            f.write("\n")
-
-def file_export_tsf(df, filename: str, header1: str, header2: str, time_format: str, float_format: str) -> None:
-    _write_with_headers(df, filename, [header1, header2], time_format, float_format, sep="\t")
-
-def file_export_dat(df, filename: str, header: str, time_format: str, float_format: str) -> None:
+        if not len(index):
+            return
+        if timestamps is None:
+            timestamps = format_timestamps(index, time_format)
+        _write_rows(f, timestamps, columns, float_format, sep)
+
+def _write_rows(f, timestamps, columns: List[Any], float_format: str, sep: str) -> None:
+    """Append ``time<sep>value...`` rows to the open file ``f``."""
+    import numpy as np
+    formatted = [format_values(col, float_format) for col in columns]
+    for lo in range(0, len(timestamps), WRITE_CHUNK_ROWS):
+        hi = lo + WRITE_CHUNK_ROWS
+        lines = np.asarray(timestamps[lo:hi], dtype=object)
+        for col in formatted:
+            lines = lines + sep + col[lo:hi]
+        f.writelines((lines + "\n").tolist())
+
+def file_export_tsf(df, filename: str, header1: str, header2: str, time_format: str, float_format: str,
+                    timestamps: Any = None) -> None:
+    _write_with_headers(df, filename, [header1, header2], time_format, float_format, sep="\t",
+                        timestamps=timestamps)
+
+def file_export_dat(df, filename: str, header: str, time_format: str, float_format: str,
+                    timestamps: Any = None) -> None:
     import pandas as pd
     if not isinstance(df.index, pd.DatetimeIndex):
         first = df.columns[0]
@@ -359,9 +735,11 @@ def file_export_dat(df, filename: str, header: str, time_format: str, float_form
     header_lines = header.splitlines()
     if not any(line.startswith("Date/Time") for line in header_lines):
         header_lines.append("Date/Time\t" + "\t".join(df.columns))
-    _write_with_headers(df, filename, header_lines, time_format, float_format, sep="\t")
+    _write_with_headers(df, filename, header_lines, time_format, float_format, sep="\t",
+                        timestamps=timestamps)
 
-def file_export_csv(df, filename: str, header: str, time_format: str, float_format: str) -> None:
+def file_export_csv(df, filename: str, header: str, time_format: str, float_format: str,
+                    timestamps: Any = None) -> None:
     import pandas as pd
     if not isinstance(df.index, pd.DatetimeIndex):
         first = df.columns[0]
@@ -370,7 +748,8 @@ def file_export_csv(df, filename: str, header: str, time_format: str, float_form
     header_lines = header.splitlines()
     if not any(line.startswith("Date/Time") for line in header_lines):
         header_lines.append("Date/Time," + ",".join(df.columns))
-    _write_with_headers(df, filename, header_lines, time_format, float_format, sep=",")
+    _write_with_headers(df, filename, header_lines, time_format, float_format, sep=",",
+                        timestamps=timestamps)
 
 _TS_PAT = re.compile(r"^(\d{2}/\d{2}/\d{4} \d{2}:\d{2})([\t, ].*)?$")
 
@@ -388,6 +767,126 @@ def parse_data_lines(file_path: str, skip: int = 0) -> List[Tuple[datetime, str]
             out.append((ts, rest))
     return out
 
+
+READ_CHUNK_BYTES = 8 << 20
+
+# Byte offsets of the digits and separators in "%m/%d/%Y %H:%M"
+_STAMP_DIGITS = [0, 1, 3, 4, 6, 7, 8, 9, 11, 12, 14, 15]
+_STAMP_SEPARATORS = {2: b"/", 5: b"/", 10: b" ", 13: b":"}
+_STAMP_END = b"\t, \n\r\0"
+
+
+def _parse_stamps(lines: List[bytes]):
+    """Return ``(matched, datetime64[m])`` for lines starting with a ``%m/%d/%Y %H:%M`` stamp.
+
+    Lines are read as fixed-width byte rows and the fields computed with
+    integer arithmetic; ``matched`` flags the lines :data:`_TS_PAT` accepts.
+    A matched stamp that is not a real date raises ``ValueError`` as
+    ``strptime`` would.
+    """
+    import numpy as np
+
+    head = np.array(lines, dtype="S17").view(np.uint8).reshape(len(lines), 17)
+    digits = head[:, _STAMP_DIGITS].astype(np.int64) - ord("0")
+    matched = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    for col, sep in _STAMP_SEPARATORS.items():
+        matched &= head[:, col] == ord(sep)
+    matched &= np.isin(head[:, 16], np.frombuffer(_STAMP_END, dtype=np.uint8))
+    d = digits[matched]
+    month = d[:, 0] * 10 + d[:, 1]
+    day = d[:, 2] * 10 + d[:, 3]
+    year = d[:, 4] * 1000 + d[:, 5] * 100 + d[:, 6] * 10 + d[:, 7]
+    hour = d[:, 8] * 10 + d[:, 9]
+    minute = d[:, 10] * 10 + d[:, 11]
+    months = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+    month_days = (months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")
+    bad = (
+        (year < 1) | (month < 1) | (month > 12) | (day < 1)
+        | (day > month_days.astype(np.int64)) | (hour > 23) | (minute > 59)
+    )
+    if bad.any():
+        line = lines[int(np.flatnonzero(matched)[np.argmax(bad)])]
+        raise ValueError(f"time data {line[:16].decode(errors='replace')!r} is not a valid date")
+    stamps = months.astype("datetime64[D]") + (day - 1) + (hour * 60 + minute).astype("timedelta64[m]")
+    return matched, stamps.astype("datetime64[m]")
+
+
+def _parse_value_rows(rests: List[bytes], delimiter: Optional[str]):
+    """Return the value fields of ``rests`` as a float64 matrix (``NaN`` where missing or not numeric)."""
+    import io
+    import numpy as np
+    import pandas as pd
+
+    if delimiter in ("\t", ","):
+        sep = delimiter
+        width = max((r.count(delimiter.encode()) + 1 for r in rests if r), default=0)
+    else:
+        rests = [r.replace(b",", b" ").replace(b"\t", b" ") for r in rests]
+        sep = r"\s+"
+        width = max((len(r.split()) for r in rests), default=0)
+    if not width:
+        return np.empty((len(rests), 0))
+    data = b"\n".join(rests)
+
+    def read(dtype: Any):
+        return pd.read_csv(io.BytesIO(data), sep=sep, header=None, names=list(range(width)),
+                           skip_blank_lines=False, dtype=dtype)
+
+    try:
+        frame = read(np.float64)
+    except ValueError:
+        # Text cells: convert column by column, leaving them NaN
+        frame = read(object).apply(pd.to_numeric, errors="coerce")
+    # Blank trailing rows leave no line to parse
+    return frame.reindex(range(len(rests))).to_numpy(dtype=np.float64)
+
+
+def read_timeseries_file(file_path: str, *, skip: int = 0, dtype: Any = None):
+    """Return a TSF/DAT/CSV file written by this tool as a ``DataFrame``.
+
+    The index holds the ``%m/%d/%Y %H:%M`` stamps and there is one column per
+    header label (extra values get ``<label>_<n>`` names, missing ones are
+    ``NaN``); ``df.attrs`` carries the header ``ids`` and ``label``.  Lines
+    are read in blocks of :data:`READ_CHUNK_BYTES`, stamps are decoded
+    arithmetically and values parsed by the pandas C reader, so the result
+    matches :func:`parse_data_lines` followed by ``float`` on every cell.
+    The first ``skip`` lines are ignored; values are held as ``dtype``.
+    """
+    import numpy as np
+    import pandas as pd
+
+    ids, label, columns, delimiter = read_header_metadata(file_path)
+    stamps: List[Any] = []
+    rests: List[bytes] = []
+    with open(file_path, "rb") as f:
+        for _ in range(skip):
+            f.readline()
+        while True:
+            lines = f.readlines(READ_CHUNK_BYTES)
+            if not lines:
+                break
+            matched, chunk_stamps = _parse_stamps(lines)
+            stamps.append(chunk_stamps)
+            rests.extend(
+                line[16:].lstrip(b"\t, ").strip() for line, ok in zip(lines, matched.tolist()) if ok
+            )
+
+    values = _parse_value_rows(rests, delimiter)
+    width = max(len(columns), values.shape[1])
+    base_name = label or "value"
+    names = list(columns)
+    if not names:
+        names = [base_name if width == 1 else f"{base_name}_{i}" for i in range(1, width + 1)]
+    while len(names) < width:
+        names.append(f"{base_name}_{len(names) + 1}")
+    if values.shape[1] < width:
+        values = np.hstack([values, np.full((len(values), width - values.shape[1]), np.nan)])
+
+    index = pd.DatetimeIndex(np.concatenate(stamps).astype("datetime64[ns]") if stamps else [])
+    df = pd.DataFrame(values.astype(value_dtype(dtype), copy=False), index=index, columns=names)
+    df.attrs.update(ids=ids, label=label)
+    return df
+
 def read_ids_and_label_from_header(file_path: str) -> Tuple[List[str], str]:
     ids: List[str] = []
     label = ""
@@ -445,9 +944,29 @@ def read_header_metadata(
 # Core extraction + callbacks
 # ----------------------------
 
-def extract_series(outfile: str, item_type: str, elem_id: str, param: str):
-    """Return a pandas DataFrame(time,value) for a single series."""
+def extract_series(outfile: str, item_type: str, elem_id: str, param: str, *,
+                   start: Any = None, end: Any = None,
+                   stride: int = 1, report_every: Any = None, dtype: Any = None):
+    """Return a pandas DataFrame(time,value) for a single series.
+
+    The file is read through the shared native reader; ``swmmtoolbox`` is
+    used only when the native reader cannot parse it.  ``start``/``end``
+    limit the result to periods reported within that window (inclusive), and
+    ``stride``/``report_every`` keep only every Nth period (see
+    :func:`resolve_stride`).  Values are ``float64`` unless ``dtype`` is
+    ``"float32"`` (see :func:`value_dtype`).
+    """
     import pandas as pd, traceback
+
+    start, end = parse_time_bound(start), parse_time_bound(end)
+    every = parse_interval(report_every)
+    dtype = value_dtype(dtype)
+    with swmm_output(outfile) as reader:
+        if reader is not None:
+            periods = _sampled_periods(reader, start, end, stride, every)
+            values = reader.values(item_type, elem_id, param)[periods].astype(dtype)
+            return pd.DataFrame({"value": values}, index=time_index(reader, periods))
+
     # SWMM toolbox expects a label like: type,id,param  (id empty for system)
     label = f"{item_type},{elem_id},{param}"
     require_swmmtoolbox()
@@ -459,16 +978,304 @@ def extract_series(outfile: str, item_type: str, elem_id: str, param: str):
             fh.write(traceback.format_exc())
         raise
     if isinstance(series, pd.Series):
-        return series.to_frame(name="value")
+        df = series.to_frame(name="value")
     elif isinstance(series, pd.DataFrame) and "value" in series.columns:
-        return series[["value"]]
+        df = series[["value"]]
     else:
         # Normalize
         df = pd.DataFrame(series)
         if "value" not in df.columns and df.shape[1] >= 1:
             df.columns = ["value"] + list(df.columns[1:])
             df = df[["value"]]
+    if start is not None or end is not None:
+        df = df.loc[start:end]
+    df = _sample_frame(df, stride, every)
+    if df["value"].dtype != dtype and df["value"].dtype.kind == "f":
+        df = df.astype({"value": dtype})
+    return df
+
+
+def time_index(reader: Any, periods: slice):
+    """Return the ``DatetimeIndex`` of ``periods``, built once per open file.
+
+    The stamps come from the header's start, step and count (see
+    :meth:`SwmmOutput.time_axis`), and every series read over the same
+    periods shares the same immutable index object, so aligning them is free.
+    """
+    import pandas as pd
+
+    key = ("index", *periods.indices(reader.n_periods))
+    index = reader.derived.get(key)
+    if index is None:
+        index = pd.DatetimeIndex(reader.times(periods).astype("datetime64[ns]"))
+        reader.derived[key] = index
+    return index
+
+
+def _sampled_periods(reader: Any, start: Any, end: Any, stride: int, every: Any) -> slice:
+    """Return the native reader's period slice for a window and stride."""
+    periods = reader.period_range(start, end)
+    n = resolve_stride(reader.report_step.total_seconds(), stride, every)
+    align = int(every.total_seconds()) if every is not None else None
+    return reader.sample(periods, n, align=align)
+
+
+def _sample_frame(df, stride: int, every: Any):
+    """Thin a ``swmmtoolbox`` frame the way :func:`_sampled_periods` does."""
+    if every is None and (stride or 1) <= 1:
         return df
+    step = 0.0
+    if len(df.index) > 1:
+        step = (df.index[1] - df.index[0]).total_seconds()
+    n = resolve_stride(step, stride, every)
+    return df.iloc[::n] if n > 1 else df
+
+SeriesKey = Tuple[str, str, str]  # (item_type, element_id, param)
+
+
+def series_keys(item_type: str, element_ids: Iterable[str], params: Iterable[str]) -> List[SeriesKey]:
+    """Return the ``(type, id, param)`` keys for an element × param selection.
+
+    System series have the single pseudo-ID ``SYSTEM``, used only when the
+    selection names any system ID (as :func:`selection_total` counts them).
+    """
+    element_ids = list(element_ids)
+    if item_type == "system" and element_ids:
+        element_ids = ["SYSTEM"]
+    params = list(params)
+    return [(item_type, elem_id, p) for elem_id in element_ids for p in params]
+
+
+class TimeSeries:
+    """One series inside the export pipeline: values on a shared time axis.
+
+    ``values`` is a NumPy array (often a column view of an
+    :class:`ExtractedBlock`) and ``index`` the file's shared
+    ``DatetimeIndex``; ``unit`` is the output unit once converted.  :meth:`frame` builds
+    a DataFrame only where one is handed to callers.
+    """
+
+    __slots__ = ("values", "index", "item_type", "elem_id", "param", "unit")
+
+    def __init__(self, values, index, item_type: str, elem_id: str, param: str,
+                 unit: Optional[str] = None):
+        self.values = values
+        self.index = index
+        self.item_type = item_type
+        self.elem_id = elem_id
+        self.param = param
+        self.unit = unit
+
+    def frame(self, label: str = "value"):
+        """Return the series as a one-column ``DataFrame``."""
+        import pandas as pd
+        return pd.DataFrame({label: self.values}, index=self.index)
+
+
+class ExtractedBlock:
+    """Series from one ``.out`` file gathered in a single pass.
+
+    ``values`` holds one column per requested key on a shared ``index``.
+    Keys that could not be extracted are listed in ``errors`` instead.
+    ``window`` is ``(start, end)``, ``sampling`` is ``(stride,
+    report_every)`` and ``resampling`` is ``(interval, agg)`` as requested.
+    ``units`` is the :class:`UnitPlan` once :meth:`convert` has run.
+    """
+
+    def __init__(self, outfile: str, index, values, keys: List[SeriesKey],
+                 errors: Dict[SeriesKey, str], window: Tuple[Any, Any] = (None, None),
+                 sampling: Tuple[int, Any] = (1, None),
+                 resampling: Tuple[Any, str] = (None, "mean")):
+        self.outfile = outfile
+        self.index = index
+        self.values = values
+        self.columns: Dict[SeriesKey, int] = {k: j for j, k in enumerate(keys)}
+        self.errors = errors
+        self.window = window
+        self.sampling = sampling
+        self.resampling = resampling
+        self.units: Optional[UnitPlan] = None
+        self.time_cache = TimestampCache()
+        self._convert_lock = threading.Lock()
+
+    def timestamps(self, index, time_format: str):
+        """Return ``index`` formatted with ``time_format``, formatted once per block."""
+        return self.time_cache.get(self.outfile, index, time_format)
+
+    def covers(self, keys: Iterable[SeriesKey], window: Tuple[Any, Any] = (None, None),
+               sampling: Tuple[int, Any] = (1, None), dtype: Any = None,
+               resampling: Tuple[Any, str] = (None, "mean"), units: Optional[UnitPlan] = None) -> bool:
+        """Return True when every key was requested over the same window, stride, resampling and dtype.
+
+        A block already converted only covers requests for the same ``units``.
+        """
+        return (
+            self.window == window
+            and self.sampling == sampling
+            and self.resampling == resampling
+            and (self.units is None or self.units == units)
+            and self.values.dtype == value_dtype(dtype)
+            and all(k in self for k in keys)
+        )
+
+    def __contains__(self, key: SeriesKey) -> bool:
+        return key in self.columns or key in self.errors
+
+    def series(self, item_type: str, elem_id: str, param: str) -> TimeSeries:
+        """Return the series for a key as a :class:`TimeSeries` column view.
+
+        Raises ``ValueError`` with the original message when the key failed
+        and ``KeyError`` when it was never requested.
+        """
+        key = (item_type, elem_id, param)
+        if key in self.errors:
+            raise ValueError(self.errors[key])
+        unit = self.units.unit(param) if self.units is not None else None
+        return TimeSeries(self.values[:, self.columns[key]], self.index, *key, unit)
+
+    def convert(self, plan: UnitPlan) -> None:
+        """Convert every column to ``plan``'s output units in place (once per block).
+
+        Safe to call from the threads sharing a block: only the first call converts.
+        """
+        with self._convert_lock:
+            if self.units is not None:
+                if self.units == plan:
+                    return
+                raise ValueError("Block values are already converted with other units")
+            params = [""] * self.values.shape[1]
+            for (_, _, param), j in self.columns.items():
+                params[j] = param
+            plan.apply(self.values, params)
+            self.units = plan
+
+    def add_derived(self, derived: Iterable["DerivedSeries"]) -> None:
+        """Append a ``(derived, name, Value)`` column per :class:`DerivedSeries`.
+
+        Expressions see the block's values as they are (converted when
+        :meth:`convert` ran first, resampled when the block was).  A derived
+        series whose operand failed, or whose evaluation raised, is recorded
+        in ``errors``.
+        """
+        import numpy as np
+
+        added: List[Any] = []
+        for d in derived:
+            key = (DERIVED_TYPE, d.name, DERIVED_PARAM)
+            if key in self:
+                continue
+            missing = [k for k in d.operands if k not in self.columns]
+            if missing:
+                item_type, elem_id, param = missing[0]
+                reason = self.errors.get(missing[0], "not extracted")
+                self.errors[key] = f"{item_type}:{elem_id}:{param}: {reason}"
+                continue
+            try:
+                added.append(d.evaluate([self.values[:, self.columns[k]] for k in d.operands]))
+            except Exception as e:
+                self.errors[key] = str(e)
+                continue
+            self.columns[key] = self.values.shape[1] + len(added) - 1
+        if added:
+            # Keep the block's dtype so later requests still match it (see covers)
+            added_values = np.stack(added, axis=1).astype(self.values.dtype, copy=False)
+            self.values = np.concatenate([self.values, added_values], axis=1)
+
+    def frame(self, item_type: str, elem_id: str, param: str):
+        """Return the series for a key as a ``DataFrame(value)`` (see :meth:`series`)."""
+        return self.series(item_type, elem_id, param).frame()
+
+
+def extract_batch(outfile: str, keys: Iterable[SeriesKey], *,
+                  start: Any = None, end: Any = None,
+                  stride: int = 1, report_every: Any = None,
+                  threads: int = 1, dtype: Any = None,
+                  resample: Any = None, agg: Any = None) -> ExtractedBlock:
+    """Extract many series from ``outfile`` into one preallocated matrix.
+
+    With the native reader every period record is visited once regardless of
+    how many series are requested, a ``start``/``end`` window seeks straight
+    to the periods it covers, and ``stride``/``report_every`` skip the
+    records in between kept periods.  ``threads`` > 1 gathers period ranges
+    concurrently from the shared memory map.  ``dtype="float32"`` keeps the
+    file's native precision instead of widening to ``float64``.  With
+    ``resample`` (e.g. ``"1D"``) the records are streamed block by block into
+    ``agg`` bins (see :func:`resample_spec`), so only the aggregated matrix
+    is kept.  When the file can only be read through ``swmmtoolbox`` each
+    key is extracted separately and stacked on the union of their indexes.
+    """
+    import numpy as np
+    import pandas as pd
+    from .reductions import ResampleAccumulator
+
+    keys = list(dict.fromkeys(keys))
+    errors: Dict[SeriesKey, str] = {}
+    window = (parse_time_bound(start), parse_time_bound(end))
+    sampling = (max(1, int(stride or 1)), parse_interval(report_every))
+    resampling = resample_spec(resample, agg)
+    dtype = value_dtype(dtype)
+
+    def resampler(n_series: int) -> ResampleAccumulator:
+        return ResampleAccumulator(n_series, int(resampling[0].total_seconds()), resampling[1])
+
+    def frame_index(times) -> Any:
+        return pd.DatetimeIndex(np.asarray(times).astype("datetime64[ns]"))
+
+    with swmm_output(outfile) as reader:
+        if reader is not None:
+            found: List[SeriesKey] = []
+            cols: List[int] = []
+            for key in keys:
+                try:
+                    cols.append(reader.column(*key))
+                except ValueError as e:
+                    errors[key] = str(e)
+                    continue
+                found.append(key)
+            periods = _sampled_periods(reader, window[0], window[1], *sampling)
+            if resampling[0] is None:
+                values = reader.read_columns(cols, periods=periods, dtype=dtype, threads=threads)
+                index = time_index(reader, periods)
+            else:
+                acc = resampler(len(cols))
+                for records, chunk in reader.iter_columns(cols, periods=periods, dtype=dtype):
+                    acc.update(reader.times(records), chunk)
+                times, values = acc.result(dtype)
+                index = frame_index(times)
+            return ExtractedBlock(outfile, index, values, found, errors,
+                                  window, sampling, resampling)
+
+    frames: List[Any] = []
+    found = []
+    for key in keys:
+        try:
+            df = extract_series(outfile, *key, start=window[0], end=window[1],
+                                stride=sampling[0], report_every=sampling[1], dtype=dtype)
+        except Exception as e:
+            errors[key] = str(e)
+            continue
+        frames.append(df["value"])
+        found.append(key)
+    if not frames:
+        return ExtractedBlock(outfile, pd.DatetimeIndex([]), np.empty((0, 0), dtype=dtype), [],
+                              errors, window, sampling, resampling)
+    index = frames[0].index
+    if all(s.index.equals(index) for s in frames[1:]):
+        values = np.empty((len(index), len(frames)), dtype=dtype)
+        for j, s in enumerate(frames):
+            values[:, j] = s.to_numpy(dtype=dtype)
+    else:
+        # Differing time axes: align on their union, as an outer join would
+        joined = pd.concat(frames, axis=1, join="outer", sort=True)
+        index = joined.index
+        values = joined.to_numpy(dtype=dtype)
+    if resampling[0] is not None:
+        acc = resampler(len(frames))
+        acc.update(index.values, values)
+        times, values = acc.result(dtype)
+        index = frame_index(times)
+    return ExtractedBlock(outfile, index, values, found, errors, window, sampling, resampling)
+
 
 def pretty_label(param: str, label_map: Dict[str, str], param_short: Dict[str, str]) -> Tuple[str, str]:
     """Return (column_label, short_token) for param based on maps."""
@@ -477,15 +1284,42 @@ def pretty_label(param: str, label_map: Dict[str, str], param_short: Dict[str, s
 def apply_units(df, param: str, param_dimension: Dict[str, str], assume_units: Dict[str, str],
                 to_units: Dict[str, str], unit_overrides: Dict[str, str]) -> Tuple[Any, Optional[str]]:
     """Convert df['value'] to desired units if mappings provided. Returns (df, output_unit or None)."""
-    dim = param_dimension.get(param, DEFAULT_PARAM_DIM.get(param, "other"))
-    from_u = unit_overrides.get(param, assume_units.get(dim, ""))
-    to_u   = unit_overrides.get(param, to_units.get(dim, from_u))
-    if from_u and to_u and from_u != to_u and dim in DIMENSIONS and dim != "other":
-        df = df.copy()
-        df["value"] = convert_series_by_dim(df["value"], dim, from_u, to_u)
-        return df, to_u
+    route = unit_route(param, param_dimension, assume_units, to_units, unit_overrides)
+    if route is not None:
+        import pandas as pd
+        # One new column instead of copy-then-assign; keeps the input dtype
+        converted = convert_series_by_dim(df["value"], *route)
+        return pd.DataFrame({"value": converted}, index=df.index), route[2]
     return df, None
 
+def align_series(series: List[TimeSeries]) -> Tuple[Any, List[Any]]:
+    """Return a common index and one value array per series on it.
+
+    Series on the same index (one time axis per file) are passed through
+    as-is; otherwise they are aligned with one multi-way outer concat, which
+    matches chaining outer joins.
+    """
+    index = series[0].index
+    if all(s.index is index or s.index.equals(index) for s in series[1:]):
+        return index, [s.values for s in series]
+    import pandas as pd
+    joined = pd.concat([pd.Series(s.values, index=s.index) for s in series],
+                       axis=1, join="outer", sort=True)
+    return joined.index, [joined.iloc[:, j].to_numpy() for j in range(joined.shape[1])]
+
+def stack_columns(frames: List[Tuple[Any, str]]):
+    """Return one DataFrame with a column per ``(DataFrame(value), label)`` pair (see :func:`align_series`)."""
+    import numpy as np
+    import pandas as pd
+
+    index, columns = align_series(
+        [TimeSeries(df["value"].to_numpy(), df.index, "", "", "") for df, _ in frames]
+    )
+    labels = [lab for _, lab in frames]
+    if len({c.dtype for c in columns}) == 1:
+        return pd.DataFrame(np.column_stack(columns), index=index, columns=labels)
+    return pd.DataFrame(dict(zip(labels, columns)), index=index)
+
 def add_plot_slide(ppt: Any, df, title: str) -> None:
     try:
         if ppt is None:
@@ -521,9 +1355,12 @@ def plan_elements(outfile: str,
                   tsf_template_sep: str,
                   tsf_template_com: str,
                   param_short: Dict[str,str],
-                  out_subdir: Optional[str] = None) -> List[str]:
+                  out_subdir: Optional[str] = None,
+                  start: Any = None,
+                  end: Any = None) -> List[str]:
     """Return the filenames that would be written for this selection (no IO)."""
     planned: List[str] = []
+    window = window_fields(start, end)
     subdir = out_subdir or output_subdir_name(outfile)
     out_dir = os.path.join(outdir_root, subdir)
     if item_type == "system":
@@ -539,6 +1376,7 @@ def plan_elements(outfile: str,
                         "type": item_type,
                         "id": sanitize_id(elem_id),
                         "suffix": suffix,
+                        **window,
                     },
                 )
                 planned.append(os.path.join(out_dir, fname))
@@ -555,6 +1393,7 @@ def plan_elements(outfile: str,
                     suffix=suffix,
                     type=item_type,
                     param=combined_short,
+                    **window,
                 )
                 planned.append(os.path.join(out_dir, fname))
         else:
@@ -570,6 +1409,7 @@ def plan_elements(outfile: str,
                             "param": p,
                             "short": param_short.get(p, p),
                             "suffix": suffix,
+                            **window,
                         },
                     )
                     planned.append(os.path.join(out_dir, fname))
@@ -578,10 +1418,142 @@ def plan_elements(outfile: str,
                     short = param_short.get(p, p)
                     fname = build_output_name(pattern, out_format, prefix=prefix, short=short,
                                               id=sanitize_id(elem_id), suffix=suffix,
-                                              type=item_type, param=p)
+                                              type=item_type, param=p, **window)
                     planned.append(os.path.join(out_dir, fname))
     return planned
 
+class WriterPipeline:
+    """Run file writes on a small thread pool fed through a bounded queue.
+
+    :meth:`submit` blocks once ``max_pending`` writes are queued, which caps
+    the frames held in memory while extraction runs ahead.  :meth:`close`
+    waits for the writers and returns the written paths in submission order
+    plus one ``(context, error)`` pair per failed write.
+    """
+
+    def __init__(self, workers: int, max_pending: Optional[int] = None):
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending or 2 * workers)
+        self._results: Dict[int, Tuple[Optional[str], Any, Optional[str]]] = {}
+        self._lock = threading.Lock()
+        self._count = 0
+        self._threads = [
+            threading.Thread(target=self._run, name=f"writer-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for t in self._threads:
+            t.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            seq, fpath, write, context = item
+            try:
+                write()
+                result = (fpath, context, None)
+            except Exception as e:
+                result = (None, context, str(e))
+            with self._lock:
+                self._results[seq] = result
+
+    def submit(self, fpath: str, write: Callable[[], None], context: Any = None) -> None:
+        """Queue ``write`` (which creates ``fpath``); blocks while the queue is full."""
+        self._queue.put((self._count, fpath, write, context))
+        self._count += 1
+
+    def close(self) -> Tuple[List[str], List[Tuple[Any, str]]]:
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+        written: List[str] = []
+        errors: List[Tuple[Any, str]] = []
+        for seq in sorted(self._results):
+            fpath, context, error = self._results[seq]
+            if error is None:
+                written.append(fpath)
+            else:
+                errors.append((context, error))
+        return written, errors
+
+
+class SegmentStore:
+    """Series kept from a run for ``--combine across``, keyed by output path.
+
+    Each written per-file series is recorded as ``(id, label, times,
+    values)`` so :func:`combine_across_files` can merge it without reading
+    the text back.  With ``spill_dir`` the arrays are saved there as ``.npy``
+    files instead of being held in memory and memory-mapped again when
+    combined; :meth:`clear` removes them.
+    """
+
+    def __init__(self, spill_dir: Optional[str] = None):
+        self.spill_dir = spill_dir
+        self.segments: Dict[str, Tuple[str, str, Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, path: str, elem_id: str, label: str, index, values) -> None:
+        """Record the series written to ``path`` (``values`` on ``index``)."""
+        import numpy as np
+
+        times = np.asarray(index.values, dtype="datetime64[ns]")
+        values = np.array(values)
+        if self.spill_dir:
+            import tempfile
+
+            os.makedirs(self.spill_dir, exist_ok=True)
+            fd, spill = tempfile.mkstemp(suffix=".times.npy", prefix="segment-", dir=self.spill_dir)
+            with os.fdopen(fd, "wb") as fh:
+                np.save(fh, times)
+            np.save(_spilled_values_path(spill), values)
+            segment: Tuple[str, str, Any, Any] = (elem_id, label, spill, None)
+        else:
+            segment = (elem_id, label, times, values)
+        with self._lock:
+            self.segments[path] = segment
+
+    def update(self, segments: Dict[str, Tuple[str, str, Any, Any]]) -> None:
+        """Add segments recorded by another store (e.g. in a worker process)."""
+        with self._lock:
+            self.segments.update(segments)
+
+    def get(self, path: str) -> Optional[Tuple[str, str]]:
+        """Return ``(id, label)`` of the segment written to ``path``, if any."""
+        segment = self.segments.get(path)
+        return None if segment is None else segment[:2]
+
+    def arrays(self, path: str) -> Tuple[Any, Any]:
+        """Return the ``(times, values)`` recorded for ``path``."""
+        return segment_arrays(self.segments[path])
+
+    def clear(self) -> None:
+        """Forget every segment and delete spilled arrays."""
+        with self._lock:
+            for _, _, times, values in self.segments.values():
+                if values is None:
+                    for spilled in (times, _spilled_values_path(times)):
+                        try:
+                            os.remove(spilled)
+                        except OSError:
+                            pass
+            self.segments.clear()
+
+
+def _spilled_values_path(times_path: str) -> str:
+    return times_path[: -len(".times.npy")] + ".values.npy"
+
+
+def segment_arrays(segment: Tuple[str, str, Any, Any]) -> Tuple[Any, Any]:
+    """Return ``(times, values)`` of a :class:`SegmentStore` entry (memory-mapped when spilled)."""
+    import numpy as np
+
+    _, _, times, values = segment
+    if values is None:
+        return np.load(times, mmap_mode="r"), np.load(_spilled_values_path(times), mmap_mode="r")
+    return times, values
+
+
 def process_elements(
     outfile: str,
     item_type: str,
@@ -610,9 +1582,33 @@ def process_elements(
     show_progress: bool = True,
     ppt: Any | None = None,
     progress_callback: Optional[Callable[[int, int, Dict[str, Any]], None]] = None,
+    block: Optional[ExtractedBlock] = None,
+    start: Any = None,
+    end: Any = None,
+    stride: int = 1,
+    report_every: Any = None,
+    writer_threads: int = 0,
+    dtype: Any = None,
+    resample: Any = None,
+    agg: Any = None,
+    segments: Optional[SegmentStore] = None,
 ) -> Tuple[List[str], List[Tuple[str, str, str, str, str]]]:
     """Process a set of elements and write their time series to files.
 
+    ``block`` may carry series already extracted from ``outfile`` with
+    :func:`extract_batch` (e.g. for every type in one pass); any keys it
+    lacks are extracted here in a single batch.  ``start``/``end`` limit the
+    export to that time window and fill the ``{start}``/``{end}`` template
+    fields; ``stride``/``report_every`` export only every Nth period and
+    ``resample``/``agg`` export ``agg`` values per interval instead.
+
+    With ``writer_threads`` > 0 files are written by a :class:`WriterPipeline`
+    so extracting the next element overlaps writing the previous one; failed
+    writes are then reported in the failures list instead of raising.
+    ``dtype="float32"`` keeps values in single precision up to formatting.
+    Per-param files are also recorded in ``segments`` (when given) for
+    :func:`combine_across_files`.
+
     Returns:
         Tuple of (file paths written, failures list).  Each failure entry
         contains ``(outfile, item_type, element_id, param, error)``.
@@ -636,246 +1632,1061 @@ def process_elements(
     pbar = tqdm(total=total, desc=f"{item_type} elements", unit="series", disable=not show_progress)
     done = 0
 
-    for elem_id in element_ids:
-        frames: List[Tuple[Any, str, str]] = []  # (df, label, param)
-        for p in params:
-            try:
-                df = extract_series(outfile, item_type, ("SYSTEM" if item_type == "system" else elem_id), p)
-            except Exception as e:  # pragma: no cover - defensive
-                logging.error(
-                    f"Failed to extract {item_type} '{elem_id}' param '{p}': {e}"
-                )
-                failures.append((outfile, item_type, elem_id, p, str(e)))
-                done += 1
-                if progress_callback:
-                    progress_callback(
-                        done,
-                        total,
-                        {"file": outfile, "type": item_type, "id": elem_id, "param": p},
+    window = window_fields(start, end)
+    keys = series_keys(item_type, element_ids, params)
+    bounds = (parse_time_bound(start), parse_time_bound(end))
+    sampling = (max(1, int(stride or 1)), parse_interval(report_every))
+    resampling = resample_spec(resample, agg)
+    units = UnitPlan(param_dimension, assume_units, to_units, unit_overrides)
+    if block is None or not block.covers(keys, bounds, sampling, dtype, resampling, units):
+        block = extract_batch(outfile, keys, start=bounds[0], end=bounds[1],
+                              stride=sampling[0], report_every=sampling[1], dtype=dtype,
+                              resample=resampling[0], agg=resampling[1])
+    block.convert(units)
+
+    pipeline = WriterPipeline(writer_threads) if writer_threads > 0 else None
+    pending_keeps: Dict[str, Callable[[], None]] = {}
+
+    def emit(fpath: str, write: Callable[[], None], elem_id: str, param: str,
+             keep: Optional[Callable[[], None]] = None) -> None:
+        # ``keep`` records the segment for --combine across once the write succeeded
+        if pipeline is None:
+            write()
+            written.append(fpath)
+            if keep is not None:
+                keep()
+        else:
+            pipeline.submit(fpath, write, (elem_id, param))
+            if keep is not None:
+                pending_keeps[fpath] = keep
+
+    try:
+        for elem_id in element_ids:
+            frames: List[Tuple[TimeSeries, str]] = []  # (series, label)
+            for p in params:
+                try:
+                    ts = block.series(item_type, ("SYSTEM" if item_type == "system" else elem_id), p)
+                except Exception as e:  # pragma: no cover - defensive
+                    logging.error(
+                        f"Failed to extract {item_type} '{elem_id}' param '{p}': {e}"
                     )
-                pbar.update(1)
-                continue
+                    failures.append((outfile, item_type, elem_id, p, str(e)))
+                    done += 1
+                    if progress_callback:
+                        progress_callback(
+                            done,
+                            total,
+                            {"file": outfile, "type": item_type, "id": elem_id, "param": p},
+                        )
+                    pbar.update(1)
+                    continue
 
-            df, out_u = apply_units(df, p, param_dimension, assume_units, to_units, unit_overrides)
-            col_label, short = pretty_label(p, label_map, param_short)
-            if out_u:
-                col_label = f"{col_label} ({out_u})"
-            frames.append((df, col_label, p))
+                col_label, short = pretty_label(p, label_map, param_short)
+                if ts.unit:
+                    col_label = f"{col_label} ({ts.unit})"
+                frames.append((ts, col_label))
 
-            done += 1
-            if progress_callback:
-                progress_callback(done, total, {"file": outfile, "type": item_type, "id": elem_id, "param": p})
-            pbar.update(1)
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total, {"file": outfile, "type": item_type, "id": elem_id, "param": p})
+                pbar.update(1)
 
-        if not frames:
-            continue
+            if not frames:
+                continue
 
-        if combine_mode == "com":
-            # Single file with multiple param columns
-            if out_format == "tsf":
-                left = frames[0][0].rename(columns={"value": frames[0][1]})
-                for df, lab, _ in frames[1:]:
-                    left = left.join(df.rename(columns={"value": lab}), how="outer")
-                fname = render_filename_template(
-                    tsf_template_com,
-                    "{prefix}{type}{id}{suffix}.tsf",
-                    {
-                        "prefix": prefix,
-                        "type": item_type,
-                        "id": sanitize_id(elem_id),
-                        "suffix": suffix,
-                    },
-                )
-                fpath = os.path.join(out_dir, fname)
-                header2 = "Date/Time\t" + "\t".join([lab for _, lab, _ in frames])
-                file_export_tsf(left, fpath, f"IDs:\t{elem_id}", header2, time_format, float_format)
-                written.append(fpath)
-            else:
-                left = frames[0][0].rename(columns={"value": frames[0][1]})
-                for df, lab, _ in frames[1:]:
-                    left = left.join(df.rename(columns={"value": lab}), how="outer")
-                combined_short = "".join(param_short.get(p, p) for _, _, p in frames)
-                pattern = dat_template or "{prefix}{type}{id}{suffix}"
-                fname = build_output_name(
-                    pattern,
-                    out_format,
-                    prefix=prefix,
-                    short=combined_short,
-                    id=sanitize_id(elem_id),
-                    suffix=suffix,
-                    type=item_type,
-                    param=combined_short,
-                )
-                fpath = os.path.join(out_dir, fname)
-                sep = "," if out_format == "csv" else "\t"
-                header = (
-                    f"IDs:{sep}{elem_id}\n" +
-                    "Date/Time" + sep + sep.join(param_short.get(p, p) for _, _, p in frames)
-                )
-                if out_format == "csv":
-                    file_export_csv(left, fpath, header, time_format, float_format)
-                else:
-                    file_export_dat(left, fpath, header, time_format, float_format)
-                written.append(fpath)
-        else:
-            # separate files per param
-            for df, lab, p in frames:
+            sep = "," if out_format == "csv" else "\t"
+            if combine_mode == "com":
+                # Single file with multiple param columns
+                index, columns = align_series([ts for ts, _ in frames])
+                timestamps = block.timestamps(index, time_format)
+                joined = ", ".join(ts.param for ts, _ in frames)
                 if out_format == "tsf":
                     fname = render_filename_template(
-                        tsf_template_sep,
-                        "{prefix}{type}{id}{param}{suffix}.tsf",
+                        tsf_template_com,
+                        "{prefix}{type}{id}{suffix}.tsf",
                         {
                             "prefix": prefix,
                             "type": item_type,
                             "id": sanitize_id(elem_id),
-                            "param": p,
-                            "short": param_short.get(p, p),
                             "suffix": suffix,
+                            **window,
                         },
                     )
-                    fpath = os.path.join(out_dir, fname)
-                    file_export_tsf(df.rename(columns={"value": lab}), fpath,
-                                    f"IDs:\t{elem_id}", f"Date/Time\t{lab}", time_format, float_format)
-                    written.append(fpath)
+                    header_lines = [f"IDs:\t{elem_id}", "Date/Time\t" + "\t".join([lab for _, lab in frames])]
                 else:
-                    pattern = dat_template or "{prefix}{short}{id}{suffix}"
-                    fname = build_output_name(pattern, out_format, prefix=prefix,
-                                               short=param_short.get(p, p),
-                                               id=sanitize_id(elem_id), suffix=suffix,
-                                               type=item_type, param=p)
-                    fpath = os.path.join(out_dir, fname)
-                    param_sep = ',' if out_format == 'csv' else '\t'
-                    header = f"IDs:{param_sep}{elem_id}\n" \
-                             f"Date/Time{param_sep}{param_short.get(p, p)}"
-                    if out_format == "csv":
-                        file_export_csv(df.rename(columns={"value": lab}), fpath,
-                                        header, time_format, float_format)
+                    combined_short = "".join(param_short.get(ts.param, ts.param) for ts, _ in frames)
+                    pattern = dat_template or "{prefix}{type}{id}{suffix}"
+                    fname = build_output_name(
+                        pattern,
+                        out_format,
+                        prefix=prefix,
+                        short=combined_short,
+                        id=sanitize_id(elem_id),
+                        suffix=suffix,
+                        type=item_type,
+                        param=combined_short,
+                        **window,
+                    )
+                    header_lines = [
+                        f"IDs:{sep}{elem_id}",
+                        "Date/Time" + sep + sep.join(param_short.get(ts.param, ts.param) for ts, _ in frames),
+                    ]
+                fpath = os.path.join(out_dir, fname)
+                emit(fpath, partial(_write_columns, fpath, header_lines, index, columns,
+                                    time_format, float_format, sep, timestamps),
+                     elem_id, joined)
+            else:
+                # separate files per param
+                for ts, lab in frames:
+                    p = ts.param
+                    if out_format == "tsf":
+                        fname = render_filename_template(
+                            tsf_template_sep,
+                            "{prefix}{type}{id}{param}{suffix}.tsf",
+                            {
+                                "prefix": prefix,
+                                "type": item_type,
+                                "id": sanitize_id(elem_id),
+                                "param": p,
+                                "short": param_short.get(p, p),
+                                "suffix": suffix,
+                                **window,
+                            },
+                        )
+                        label = lab
+                        header_lines = [f"IDs:\t{elem_id}", f"Date/Time\t{label}"]
                     else:
-                        file_export_dat(df.rename(columns={"value": lab}), fpath,
-                                        header, time_format, float_format)
-                    written.append(fpath)
+                        pattern = dat_template or "{prefix}{short}{id}{suffix}"
+                        fname = build_output_name(pattern, out_format, prefix=prefix,
+                                                   short=param_short.get(p, p),
+                                                   id=sanitize_id(elem_id), suffix=suffix,
+                                                   type=item_type, param=p, **window)
+                        label = param_short.get(p, p)
+                        header_lines = [f"IDs:{sep}{elem_id}", f"Date/Time{sep}{label}"]
+                    fpath = os.path.join(out_dir, fname)
+                    keep = None
+                    if segments is not None:
+                        # Stripped like read_header_metadata reads the file back
+                        keep = partial(segments.add, fpath, elem_id.strip(), label.strip(),
+                                       ts.index, ts.values)
+                    emit(fpath, partial(_write_columns, fpath, header_lines, ts.index, [ts.values],
+                                        time_format, float_format, sep,
+                                        block.timestamps(ts.index, time_format)),
+                         elem_id, p, keep)
+
+            if ppt is not None:
+                for ts, lab in frames:
+                    add_plot_slide(ppt, ts.frame(lab), f"{item_type}:{elem_id} {lab}")
+    finally:
+        if pipeline is not None:
+            done_paths, write_errors = pipeline.close()
+            written.extend(done_paths)
+            for fpath in done_paths:
+                keep = pending_keeps.pop(fpath, None)
+                if keep is not None:
+                    keep()
+            for (elem_id, param), err in write_errors:
+                logging.error(f"Failed to write {item_type} '{elem_id}' param '{param}': {err}")
+                failures.append((outfile, item_type, elem_id, param, err))
+        pbar.close()
+    return written, failures
 
-        for df, lab, _ in frames:
-            add_plot_slide(ppt, df.rename(columns={"value": lab}), f"{item_type}:{elem_id} {lab}")
+# ----------------------------
+# Derived series (--derive)
+# ----------------------------
 
-    pbar.close()
-    return written, failures
+DERIVED_TYPE = "derived"
+DERIVED_PARAM = "Value"
 
-def combine_across_files(
-    new_files: List[Tuple[str, str]],
-    out_format: str,
-    output_dir: str,
-    prefix: str = "",
-    suffix: str = "",
-    dat_template: str = "",
-    tsf_template_sep: str = "",
-) -> None:
-    """Combine output files across elements by shared IDs, labels, and types.
+_OPERAND_PAT = re.compile(r"\b(node|link|subcatchment|system|pollutant):([^:\s]*):(\w+)")
+_DERIVE_FUNCS = ("abs", "sqrt", "exp", "log", "log10", "minimum", "maximum")
+_DERIVE_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd,
+)
 
-    ``new_files`` should contain ``(item_type, path)`` pairs.  Only files with
-    matching ``item_type`` **and** ID/label combinations are merged.  The
-    resulting time series are concatenated vertically and sorted
-    chronologically to mimic a continuous simulation spanning multiple ``.out``
-    files.  Output naming respects user templates when provided.
+
+class DerivedSeries:
+    """A ``name=expression`` series computed from other series of the same file.
+
+    Operands are written ``type:id:param`` (e.g. ``link:C1:Flow_rate``;
+    pollutant concentrations are node/link params such as ``node:J1:TSS``)
+    and combined with numbers, ``+ - * / **``, parentheses and the NumPy
+    functions in ``_DERIVE_FUNCS``.  The expression is checked against a
+    node whitelist and compiled once; :meth:`evaluate` runs it on whole
+    value columns.
     """
 
-    import pandas as pd
+    def __init__(self, name: str, expression: str):
+        self.name = name
+        self.expression = expression
+        self.operands: List[SeriesKey] = []
 
-    # Buckets keyed by (type, id, label)
-    buckets: Dict[Tuple[str, str, str], List[str]] = defaultdict(list)
-    metadata_cache: Dict[str, Tuple[List[str], str, List[str], Optional[str]]] = {}
+        def operand(m: "re.Match[str]") -> str:
+            item_type, elem_id, param = m.groups()
+            key = (item_type, "SYSTEM" if item_type == "system" else elem_id, param)
+            if key not in self.operands:
+                self.operands.append(key)
+            return f"_s{self.operands.index(key)}"
 
-    for item_type, p in new_files:
+        source = _OPERAND_PAT.sub(operand, expression)
         try:
-            ids, label, columns, delimiter = read_header_metadata(p)
-            metadata_cache[p] = (ids, label, columns, delimiter)
-            for i in ids:
-                buckets[(item_type, i, label)].append(p)
-        except Exception as e:
-            logging.warning(f"Skipping combine for {p}: {e}")
+            tree = ast.parse(source.strip(), mode="eval")
+        except SyntaxError:
+            raise ValueError(f"Invalid expression for '{name}': {expression}") from None
+        names = {f"_s{i}" for i in range(len(self.operands))}
+        for node in ast.walk(tree):
+            if not isinstance(node, _DERIVE_NODES):
+                raise ValueError(f"Unsupported syntax in '{name}': {type(node).__name__}")
+            if isinstance(node, ast.Call) and (
+                not isinstance(node.func, ast.Name) or node.func.id not in _DERIVE_FUNCS or node.keywords
+            ):
+                raise ValueError(f"Unsupported function in '{name}': {ast.unparse(node.func)}")
+            if isinstance(node, ast.Name) and node.id not in names and node.id not in _DERIVE_FUNCS:
+                raise ValueError(f"Unknown name '{node.id}' in '{name}' (operands are type:id:param)")
+            if isinstance(node, ast.Constant) and (
+                isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+            ):
+                raise ValueError(f"Unsupported constant in '{name}': {node.value!r}")
+        if not self.operands:
+            raise ValueError(f"Expression for '{name}' does not reference any series")
+        self.code = compile(tree, f"<derive {name}>", "eval")
+
+    def __reduce__(self):
+        # Code objects do not pickle; recompile in process-pool workers
+        return DerivedSeries, (self.name, self.expression)
+
+    def evaluate(self, columns: List[Any]):
+        """Return the expression over ``columns`` (one per operand) as a new float64 array."""
+        import numpy as np
+
+        scope: Dict[str, Any] = {f: getattr(np, f) for f in _DERIVE_FUNCS}
+        # Evaluate in float64 so float32 blocks do not lose precision mid-expression
+        scope.update((f"_s{i}", np.asarray(col, dtype=np.float64)) for i, col in enumerate(columns))
+        with np.errstate(all="ignore"):
+            result = eval(self.code, {"__builtins__": {}}, scope)
+        return np.array(np.broadcast_to(result, (len(columns[0]),)), dtype=np.float64)
+
+
+def parse_derive(s: str) -> List[DerivedSeries]:
+    """Parse ``'name=expr;name2=expr2'`` into compiled :class:`DerivedSeries`."""
+    out: List[DerivedSeries] = []
+    for part in (s or "").split(";"):
+        part = part.strip()
+        if not part:
+            continue
+        if "=" not in part:
+            raise ValueError(f"Expected name=expression, got '{part}'")
+        name, expression = (x.strip() for x in part.split("=", 1))
+        if not name or any(d.name == name for d in out):
+            raise ValueError(f"Derived series need unique names, got '{part}'")
+        out.append(DerivedSeries(name, expression))
+    return out
+
+
+def derived_keys(derived: Iterable[DerivedSeries]) -> List[SeriesKey]:
+    """Return the operand keys ``derived`` needs, in first-use order."""
+    keys: List[SeriesKey] = []
+    for d in derived:
+        keys.extend(k for k in d.operands if k not in keys)
+    return keys
+
+
+def derived_selection(derived: List[DerivedSeries]) -> List[Selection]:
+    """Return the selection that exports ``derived`` as ``derived`` elements."""
+    return [(DERIVED_TYPE, [d.name for d in derived], [DERIVED_PARAM])] if derived else []
 
-    for (item_type, elem_id, label), paths in buckets.items():
-        frames = []
-        for fp in paths:
+
+# ----------------------------------------
+# Per-file export (serial or process pool)
+# ----------------------------------------
+
+Selection = Tuple[str, List[str], List[str]]  # (item_type, element_ids, params)
+Failure = Tuple[str, str, str, str, str]
+
+
+def selection_total(selections: Iterable[Selection]) -> int:
+    """Return how many series (progress steps) ``selections`` will produce."""
+    total = 0
+    for item_type, element_ids, params in selections:
+        if item_type == "system" and element_ids:
+            element_ids = ["SYSTEM"]
+        total += len(element_ids) * len(params)
+    return total
+
+
+def selection_chunks(selections: Iterable[Selection], threads: int) -> List[Selection]:
+    """Split each selection into at most ``threads`` contiguous ID ranges.
+
+    Chunks keep type order and ID order, so concatenating their results
+    reproduces the serial output order.
+    """
+    chunks: List[Selection] = []
+    for item_type, element_ids, params in selections:
+        element_ids = list(element_ids)
+        if not element_ids or not params:
+            continue
+        size = len(element_ids) if item_type == "system" else -(-len(element_ids) // max(1, threads))
+        for lo in range(0, len(element_ids), size):
+            chunks.append((item_type, element_ids[lo:lo + size], params))
+    return chunks
+
+
+def export_outfile(
+    outfile: str,
+    selections: List[Selection],
+    *,
+    start: Any = None,
+    end: Any = None,
+    stride: int = 1,
+    report_every: Any = None,
+    threads: int = 1,
+    dtype: Any = None,
+    resample: Any = None,
+    agg: Any = None,
+    derive: Optional[List[DerivedSeries]] = None,
+    segments: Optional[SegmentStore] = None,
+    progress_callback: Optional[Callable[[int, int, Dict[str, Any]], None]] = None,
+    ppt: Any | None = None,
+    **options: Any,
+) -> Tuple[List[Tuple[str, str]], List[Failure]]:
+    """Export every ``(type, ids, params)`` selection of one ``.out`` file.
+
+    All series are extracted in one pass with :func:`extract_batch`, then each
+    selection goes through :func:`process_elements`; ``options`` are passed on
+    to it (format, combine mode, output root/subdir, naming and units).
+    The block is converted to the requested units once, up front;
+    ``derive`` series are evaluated over it and exported by
+    a :func:`derived_selection` entry of ``selections``.  Per-param series
+    are recorded in ``segments`` for :func:`combine_across_files`.
+    With ``threads`` > 1 the read is split across threads and the selections
+    are cut into type/ID-range chunks (:func:`selection_chunks`) processed on
+    a thread pool; progress is then counted per file and results are
+    reassembled in chunk order.  Returns ``(item_type, path)`` pairs for the
+    files written plus failures.
+    """
+    threads = 1 if ppt is not None else max(1, int(threads or 1))
+    keys = [
+        k
+        for item_type, ids, params in selections
+        if item_type != DERIVED_TYPE
+        for k in series_keys(item_type, ids, params)
+    ]
+    keys += [k for k in derived_keys(derive or []) if k not in keys]
+    block = extract_batch(
+        outfile,
+        keys,
+        start=start,
+        end=end,
+        stride=stride,
+        report_every=report_every,
+        threads=threads,
+        dtype=dtype,
+        resample=resample,
+        agg=agg,
+    )
+    # Convert once here, before chunks share the block across threads
+    block.convert(UnitPlan(*(options.get(m) or {} for m in (
+        "param_dimension", "assume_units", "to_units", "unit_overrides"))))
+    if derive:
+        block.add_derived(derive)
+
+    def run(chunk: Selection, callback) -> Tuple[List[Tuple[str, str]], List[Failure]]:
+        item_type, element_ids, params = chunk
+        written, failed = process_elements(
+            outfile=outfile,
+            item_type=item_type,
+            element_ids=element_ids,
+            params=params,
+            ppt=ppt,
+            progress_callback=callback,
+            block=block,
+            start=start,
+            end=end,
+            stride=stride,
+            report_every=report_every,
+            dtype=dtype,
+            resample=resample,
+            agg=agg,
+            segments=segments,
+            **options,
+        )
+        return [(item_type, f) for f in written], failed
+
+    chunks = selection_chunks(selections, threads)
+    if threads == 1 or len(chunks) <= 1:
+        results = [run(chunk, progress_callback) for chunk in chunks]
+    else:
+        lock = threading.Lock()
+        total = selection_total(selections)
+        done = 0
+
+        def counted(_done: int, _total: int, ctx: Dict[str, Any]) -> None:
+            nonlocal done
+            with lock:
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total, ctx)
+
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            futures = [pool.submit(run, chunk, counted) for chunk in chunks]
+            results = [fut.result() for fut in futures]
+
+    new_files: List[Tuple[str, str]] = []
+    failures: List[Failure] = []
+    for written, failed in results:
+        new_files.extend(written)
+        failures.extend(failed)
+    return new_files, failures
+
+
+_WORKER_PROGRESS: Any = None
+_WORKER_CANCEL: Any = None
+
+
+def _init_export_worker(progress_queue: Any, cancel_event: Any, pool_limits: Dict[str, int],
+                        catalog: Dict[str, Any]) -> None:
+    global _WORKER_PROGRESS, _WORKER_CANCEL
+    from .catalog import configure_catalog
+    from .swmm_out import configure_pool
+
+    # A canceled run stops reading progress; don't block worker exit on it
+    progress_queue.cancel_join_thread()
+    _WORKER_PROGRESS = progress_queue
+    _WORKER_CANCEL = cancel_event
+    configure_pool(**pool_limits)
+    configure_catalog(**catalog)
+
+
+def _export_outfile_job(outfile: str, selections: List[Selection], options: Dict[str, Any],
+                        keep_segments: bool, spill_dir: Optional[str]):
+    def cb(done: int, total: int, ctx: Dict[str, Any]) -> None:
+        if _WORKER_CANCEL.is_set():
+            raise RuntimeError("Canceled")
+        _WORKER_PROGRESS.put((done, total, ctx))
+
+    # Segments travel back with the result (only paths when spilled)
+    segments = SegmentStore(spill_dir) if keep_segments else None
+    new_files, failures = export_outfile(outfile, selections, progress_callback=cb,
+                                         segments=segments, **options)
+    return new_files, failures, (segments.segments if segments is not None else {})
+
+
+def export_files(
+    tasks: List[Tuple[str, List[Selection], Dict[str, Any]]],
+    *,
+    jobs: int = 1,
+    progress_callback: Optional[Callable[[int, int, Dict[str, Any]], None]] = None,
+    file_callback: Optional[Callable[[str, List[Tuple[str, str]], List[Failure]], None]] = None,
+    ppt: Any | None = None,
+    segments: Optional[SegmentStore] = None,
+) -> Tuple[List[Tuple[str, str]], List[Failure]]:
+    """Run :func:`export_outfile` for each ``(outfile, selections, options)`` task.
+
+    With ``jobs`` > 1 files are exported on a process pool.  Progress events
+    from the workers are relayed to ``progress_callback`` in this thread,
+    ``file_callback`` fires as each file finishes, and written paths and
+    failures are merged in task order so the result matches a serial run.
+    If either callback raises (e.g. to cancel), running workers are told to
+    stop after their current series and are waited for before it propagates.
+    Slides need a shared presentation, so ``ppt`` forces a serial run.
+    Series kept for ``--combine across`` are collected into ``segments``.
+    """
+    results: List[Tuple[List[Tuple[str, str]], List[Failure]]] = []
+    if jobs <= 1 or len(tasks) <= 1 or ppt is not None:
+        if jobs > 1 and ppt is not None:
+            logging.warning("PowerPoint output needs a serial run; ignoring --jobs")
+        for outfile, selections, options in tasks:
+            new_files, failures = export_outfile(
+                outfile, selections, progress_callback=progress_callback, ppt=ppt,
+                segments=segments, **options
+            )
+            if file_callback:
+                file_callback(outfile, new_files, failures)
+            results.append((new_files, failures))
+    else:
+        results = _export_files_parallel(tasks, jobs, progress_callback, file_callback, segments)
+
+    merged_files: List[Tuple[str, str]] = []
+    merged_failures: List[Failure] = []
+    for new_files, failures in results:
+        merged_files.extend(new_files)
+        merged_failures.extend(failures)
+    return merged_files, merged_failures
+
+
+def _export_files_parallel(tasks, jobs, progress_callback, file_callback, segments=None):
+    import multiprocessing
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from .catalog import catalog_settings
+    from .swmm_out import OUTPUT_POOL
+
+    progress_queue = multiprocessing.Queue()
+    cancel_event = multiprocessing.Event()
+    expected = sum(selection_total(selections) for _, selections, _ in tasks)
+    received = 0
+
+    def drain(block_until_all: bool = False) -> None:
+        nonlocal received
+        while received < expected:
             try:
-                ids, header_label, columns, delimiter = metadata_cache.get(
-                    fp, ([], label, [], None)
-                )
+                event = progress_queue.get(timeout=5 if block_until_all else 0)
+            except queue.Empty:
+                return
+            received += 1
+            if progress_callback and not cancel_event.is_set():
+                progress_callback(*event)
+
+    results: List[Any] = [None] * len(tasks)
+    futures: Dict[Any, int] = {}
+    pool = ProcessPoolExecutor(
+        max_workers=min(jobs, len(tasks)),
+        initializer=_init_export_worker,
+        initargs=(
+            progress_queue,
+            cancel_event,
+            {"max_handles": OUTPUT_POOL.max_handles, "max_bytes": OUTPUT_POOL.max_bytes},
+            catalog_settings(),
+        ),
+    )
+    try:
+        futures = {
+            pool.submit(_export_outfile_job, outfile, selections, options,
+                        segments is not None, segments.spill_dir if segments is not None else None): i
+            for i, (outfile, selections, options) in enumerate(tasks)
+        }
+        pending = set(futures)
+        while pending:
+            finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            drain()
+            for fut in sorted(finished, key=futures.get):
+                i = futures[fut]
+                new_files, failures, kept = fut.result()
+                results[i] = (new_files, failures)
+                if segments is not None:
+                    segments.update(kept)
+                if file_callback:
+                    file_callback(tasks[i][0], *results[i])
+        drain(block_until_all=True)
+    except BaseException:
+        # Stop running files between series and wait, so nothing is still
+        # writing once the caller sees the error
+        cancel_event.set()
+        for fut in futures:
+            fut.cancel()
+        running = {fut for fut in futures if not fut.done()}
+        while running:
+            _, running = wait(running, timeout=0.1)
+            drain()
+        pool.shutdown(wait=True)
+        raise
+    pool.shutdown()
+    return results
 
-                # guess skip lines: TSF=2, DAT/CSV=1
-                skip = 2 if out_format == "tsf" else 1
 
-                rows = parse_data_lines(fp, skip=skip)
-                if not rows:
-                    continue
+# ----------------------------
+# Summary statistics + events
+# ----------------------------
+
+SUMMARY_COLUMNS = [
+    "File", "Type", "ID", "Param", "Unit", "Peak", "Time of peak", "Min", "Mean",
+    "Total volume", "Hours above threshold", "Threshold",
+]
+
+
+EVENT_COLUMNS = [
+    "Type", "ID", "Param", "Unit", "Threshold", "Start", "End", "Periods",
+    "Duration (hours)", "Peak", "Time of peak",
+]
+
+
+def summary_table_path(output_dir: str, prefix: str = "", suffix: str = "") -> str:
+    """Return the path of the summary table written into ``output_dir``."""
+    return os.path.join(output_dir, f"{prefix}summary{suffix}.csv")
+
+
+def events_table_path(output_dir: str, prefix: str = "", suffix: str = "") -> str:
+    """Return the path of a file's events table inside its output folder."""
+    return os.path.join(output_dir, f"{prefix}events{suffix}.csv")
 
-                def split_values(rest: str) -> List[str]:
-                    cleaned = rest.strip()
-                    if not cleaned:
-                        return []
-                    if delimiter in ("\t", ","):
-                        return next(csv.reader([cleaned], delimiter=delimiter))
-                    return [p for p in re.split(r"[\t, ]+", cleaned) if p]
-
-                value_rows: List[Tuple[datetime, List[str]]] = []
-                max_len = len(columns)
-                for ts, rest in rows:
-                    values = split_values(rest)
-                    max_len = max(max_len, len(values))
-                    value_rows.append((ts, values))
-
-                if max_len == 0:
+
+def parse_thresholds(s: str) -> Dict[str, float]:
+    """Parse ``param=value,...`` into per-param thresholds."""
+    thresholds: Dict[str, float] = {}
+    for param, value in parse_kv_map(s).items():
+        try:
+            thresholds[param] = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid threshold for '{param}': '{value}'") from None
+    return thresholds
+
+
+def _reduce_file(
+    outfile: str,
+    keys: List[SeriesKey],
+    make_accumulator: Callable[[int, Any], Any],
+    *,
+    thresholds: Dict[str, float],
+    maps: Tuple[Dict[str, str], ...],
+    start: Any = None,
+    end: Any = None,
+    stride: int = 1,
+    report_every: Any = None,
+) -> Tuple[List[SeriesKey], Any, Dict[str, Tuple[float, Optional[str]]], float, List[Failure]]:
+    """Stream ``keys`` of ``outfile`` through one accumulator from ``reductions``.
+
+    ``make_accumulator(n_series, limits)`` receives the per-series
+    thresholds converted from output units back to the file's units, so the
+    raw blocks never need converting.  With the native reader the selected
+    columns are fed block by block; otherwise one :func:`extract_batch`
+    matrix is fed at once.  Returns the keys found, the fed accumulator, the
+    ``(factor, unit)`` of each param, the seconds each kept period stands for
+    and failures.
+    """
+    import numpy as np
+
+    window = (parse_time_bound(start), parse_time_bound(end))
+    sampling = (max(1, int(stride or 1)), parse_interval(report_every))
+    failures: List[Failure] = []
+    units: Dict[str, Tuple[float, Optional[str]]] = {}
+    plan = UnitPlan(*maps)
+
+    def accumulator(found: List[SeriesKey]) -> Any:
+        for _, _, p in found:
+            if p not in units:
+                units[p] = (plan.factor(p), plan.unit(p))
+        limits = np.array([thresholds.get(p, np.nan) / units[p][0] for _, _, p in found],
+                          dtype=np.float64)
+        return make_accumulator(len(found), limits)
+
+    with swmm_output(outfile) as reader:
+        if reader is not None:
+            found: List[SeriesKey] = []
+            cols: List[int] = []
+            for key in keys:
+                try:
+                    cols.append(reader.column(*key))
+                except ValueError as e:
+                    failures.append((outfile, *key, str(e)))
                     continue
+                found.append(key)
+            periods = _sampled_periods(reader, window[0], window[1], *sampling)
+            acc = accumulator(found)
+            for records, block in reader.iter_columns(cols, periods=periods):
+                acc.update(reader.times(records), block)
+            return found, acc, units, reader.report_step.total_seconds() * periods.step, failures
+
+    block = extract_batch(outfile, keys, start=window[0], end=window[1],
+                          stride=sampling[0], report_every=sampling[1])
+    found = [k for k in keys if k in block.columns]
+    failures.extend((outfile, *k, err) for k, err in block.errors.items())
+    acc = accumulator(found)
+    acc.update(block.index.values, block.values)
+    index = block.index
+    step = (index[1] - index[0]).total_seconds() if len(index) > 1 else 0.0
+    return found, acc, units, step, failures
+
+
+def summarize_file(
+    outfile: str,
+    keys: Iterable[SeriesKey],
+    *,
+    start: Any = None,
+    end: Any = None,
+    stride: int = 1,
+    report_every: Any = None,
+    thresholds: Optional[Dict[str, float]] = None,
+    param_dimension: Optional[Dict[str, str]] = None,
+    assume_units: Optional[Dict[str, str]] = None,
+    to_units: Optional[Dict[str, str]] = None,
+    unit_overrides: Optional[Dict[str, str]] = None,
+) -> Tuple[List[Dict[str, Any]], List[Failure]]:
+    """Return one summary row per key of ``outfile`` plus failures.
+
+    The native reader streams the selected columns block by block through a
+    :class:`~extracttimeseries.reductions.SummaryAccumulator`, so every
+    series is reduced in one vectorized pass without being materialized.
+    Values are reported in the units :func:`apply_units` would write;
+    ``thresholds`` (param → value) are given in those output units.  Volume
+    is the sum of value × period length in seconds and is only reported for
+    flow params (see ``--param-dimension``); it is blank for the others.
+    """
+    import numpy as np
+    from .reductions import SummaryAccumulator
+
+    thresholds = thresholds or {}
+    maps = (param_dimension or {}, assume_units or {}, to_units or {}, unit_overrides or {})
+    plan = UnitPlan(*maps)
+    found, acc, units, step, failures = _reduce_file(
+        outfile,
+        list(dict.fromkeys(keys)),
+        SummaryAccumulator,
+        thresholds=thresholds,
+        maps=maps,
+        start=start,
+        end=end,
+        stride=stride,
+        report_every=report_every,
+    )
+    stats = acc.result(step)
+
+    rows: List[Dict[str, Any]] = []
+    for j, (item_type, elem_id, param) in enumerate(found):
+        factor, unit = units[param]
+        rows.append({
+            "File": outfile,
+            "Type": item_type,
+            "ID": elem_id,
+            "Param": param,
+            "Unit": unit or "",
+            "Peak": stats["peak"][j] * factor,
+            "Time of peak": stats["peak_time"][j],
+            "Min": stats["min"][j] * factor,
+            "Mean": stats["mean"][j] * factor,
+            "Total volume": (stats["volume"][j] * factor
+                             if plan.dimension(param) == "flow" else np.nan),
+            "Hours above threshold": stats["seconds_above"][j] / 3600.0,
+            "Threshold": thresholds.get(param, np.nan),
+        })
+    return rows, failures
+
+
+def detect_events(
+    outfile: str,
+    keys: Iterable[SeriesKey],
+    thresholds: Dict[str, float],
+    *,
+    start: Any = None,
+    end: Any = None,
+    stride: int = 1,
+    report_every: Any = None,
+    param_dimension: Optional[Dict[str, str]] = None,
+    assume_units: Optional[Dict[str, str]] = None,
+    to_units: Optional[Dict[str, str]] = None,
+    unit_overrides: Optional[Dict[str, str]] = None,
+) -> Tuple[List[Dict[str, Any]], List[Failure]]:
+    """Return one row per run of periods above threshold plus failures.
+
+    Only keys whose param has a threshold (in output units) are read.  All
+    of them are scanned together, block by block, with an
+    :class:`~extracttimeseries.reductions.EventAccumulator`, so the file is
+    read once however many elements are checked.  Rows are ordered by key
+    then start; ``Start``/``End`` are the first/last periods above.
+    """
+    from .reductions import EventAccumulator
+
+    keys = [k for k in dict.fromkeys(keys) if k[2] in thresholds]
+    found, acc, units, step, failures = _reduce_file(
+        outfile,
+        keys,
+        EventAccumulator,
+        thresholds=thresholds,
+        maps=(param_dimension or {}, assume_units or {}, to_units or {}, unit_overrides or {}),
+        start=start,
+        end=end,
+        stride=stride,
+        report_every=report_every,
+    )
+    events = acc.result()
+
+    rows: List[Dict[str, Any]] = []
+    for j, begin, finish, periods, peak, peak_time in zip(
+        events["series"], events["start"], events["end"], events["periods"],
+        events["peak"], events["peak_time"],
+    ):
+        item_type, elem_id, param = found[j]
+        factor, unit = units[param]
+        rows.append({
+            "Type": item_type,
+            "ID": elem_id,
+            "Param": param,
+            "Unit": unit or "",
+            "Threshold": thresholds[param],
+            "Start": begin,
+            "End": finish,
+            "Periods": int(periods),
+            "Duration (hours)": periods * step / 3600.0,
+            "Peak": peak * factor,
+            "Time of peak": peak_time,
+        })
+    return rows, failures
+
+
+def write_table(rows: List[Dict[str, Any]], filename: str, columns: List[str],
+                time_format: str, float_format: str) -> None:
+    """Write ``rows`` as a CSV table of ``columns`` (missing numbers left blank)."""
+    import numpy as np
+    import pandas as pd
 
-                base_name = header_label or label or "value"
-                col_names: List[str] = list(columns)
-                if not col_names:
-                    col_names = [
-                        base_name if max_len == 1 else f"{base_name}_{i}"
-                        for i in range(1, max_len + 1)
-                    ]
-                else:
-                    while len(col_names) < max_len:
-                        col_names.append(f"{base_name}_{len(col_names) + 1}")
+    def cell(v: Any) -> str:
+        if isinstance(v, np.datetime64):
+            return "" if np.isnat(v) else pd.Timestamp(v).strftime(time_format)
+        if isinstance(v, (float, np.floating)):
+            return "" if np.isnan(v) else float_format % v
+        return str(v)
 
-                idx: List[datetime] = []
-                parsed_rows: List[List[float]] = []
-                for ts, values in value_rows:
-                    padded = values + [""] * (max_len - len(values))
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([cell(row[c]) for c in columns])
 
-                    def to_float(v: str) -> float:
-                        try:
-                            return float(v)
-                        except Exception:
-                            return float("nan")
 
-                    parsed_rows.append([to_float(v) for v in padded])
-                    idx.append(ts)
+def export_summary(
+    tasks: List[Tuple[str, List[SeriesKey]]],
+    filename: str,
+    *,
+    time_format: str = "%m/%d/%Y %H:%M",
+    float_format: str = "%.6f",
+    progress_callback: Optional[Callable[[int, int, Dict[str, Any]], None]] = None,
+    **options: Any,
+) -> List[Failure]:
+    """Summarize each ``(outfile, keys)`` task into one table at ``filename``.
+
+    ``options`` are passed to :func:`summarize_file`; ``progress_callback``
+    fires once per file.  Returns the series that could not be summarized.
+    """
+    rows: List[Dict[str, Any]] = []
+    failures: List[Failure] = []
+    for done, (outfile, keys) in enumerate(tasks, 1):
+        file_rows, file_failures = summarize_file(outfile, keys, **options)
+        rows.extend(file_rows)
+        failures.extend(file_failures)
+        if progress_callback:
+            progress_callback(done, len(tasks), {"outfile": outfile})
+    write_table(rows, filename, SUMMARY_COLUMNS, time_format, float_format)
+    logging.info(f"Wrote summary table ({len(rows)} series) -> {filename}")
+    return failures
+
+
+def export_events(
+    tasks: List[Tuple[str, List[SeriesKey], str]],
+    thresholds: Dict[str, float],
+    *,
+    time_format: str = "%m/%d/%Y %H:%M",
+    float_format: str = "%.6f",
+    progress_callback: Optional[Callable[[int, int, Dict[str, Any]], None]] = None,
+    **options: Any,
+) -> Tuple[List[str], List[Failure]]:
+    """Write one events table per ``(outfile, keys, filename)`` task.
+
+    ``options`` are passed to :func:`detect_events`; ``progress_callback``
+    fires once per file.  Returns the tables written and the series that
+    could not be checked.
+    """
+    written: List[str] = []
+    failures: List[Failure] = []
+    for done, (outfile, keys, filename) in enumerate(tasks, 1):
+        rows, file_failures = detect_events(outfile, keys, thresholds, **options)
+        write_table(rows, filename, EVENT_COLUMNS, time_format, float_format)
+        logging.info(f"Wrote {len(rows)} events -> {filename}")
+        written.append(filename)
+        failures.extend(file_failures)
+        if progress_callback:
+            progress_callback(done, len(tasks), {"outfile": outfile})
+    return written, failures
 
-                frames.append(pd.DataFrame(parsed_rows, index=idx, columns=col_names))
+
+MergeSource = Tuple[List[str], Any, Any]  # (columns, times, values)
+
+
+def merge_segments(sources: List[MergeSource], columns: List[str], dtype: Any = None,
+                   chunk_rows: int = WRITE_CHUNK_ROWS) -> Iterator[Tuple[Any, Any]]:
+    """Yield ``(times, values)`` blocks of ``sources`` merged chronologically.
+
+    Each source is a run already sorted by time, listed in priority order:
+    where a stamp repeats, the earliest source keeps it and the rest are
+    dropped.  Runs are swept in start order.  A run that starts after every
+    earlier run has ended is appended as is, in slices, so memory-mapped
+    values are only read a block at a time.  Only runs that overlap are
+    loaded together and interleaved with one stable sort.  ``values`` has
+    one column per entry of ``columns`` (``NaN`` where a source lacks it)
+    and blocks hold at most ``chunk_rows`` rows.
+    """
+    import numpy as np
+
+    dtype = value_dtype(dtype)
+
+    def aligned(cols: List[str], values: Any) -> Any:
+        values = values.reshape(len(values), -1)
+        if cols == columns:
+            return values if values.dtype == dtype else values.astype(dtype)
+        out = np.full((len(values), len(columns)), np.nan, dtype=dtype)
+        for j, c in enumerate(cols):
+            out[:, columns.index(c)] = values[:, j]
+        return out
+
+    def emit(times: Any, values: Any, cols: List[str]) -> Iterator[Tuple[Any, Any]]:
+        for lo in range(0, len(times), chunk_rows):
+            hi = lo + chunk_rows
+            yield times[lo:hi], aligned(cols, values[lo:hi])
+
+    def merged(cluster: List[int]) -> Iterator[Tuple[Any, Any]]:
+        if len(cluster) == 1:
+            cols, times, values = sources[cluster[0]]
+            if len(times) > 1 and not (times[1:] > times[:-1]).all():
+                keep = np.concatenate(([True], times[1:] != times[:-1]))
+                times, values = times[keep], values[keep]
+            yield from emit(times, values, cols)
+            return
+        times = np.concatenate([sources[i][1] for i in cluster])
+        values = np.concatenate([aligned(sources[i][0], sources[i][2]) for i in cluster])
+        rank = np.repeat(cluster, [len(sources[i][1]) for i in cluster])
+        order = np.lexsort((rank, times))
+        times = times[order]
+        keep = np.concatenate(([True], times[1:] != times[:-1]))
+        yield from emit(times[keep], values[order[keep]], columns)
+
+    cluster: List[int] = []
+    cluster_end = None
+    for i in sorted((i for i, src in enumerate(sources) if len(src[1])), key=lambda i: (sources[i][1][0], i)):
+        first, last = sources[i][1][0], sources[i][1][-1]
+        if cluster and first > cluster_end:
+            yield from merged(cluster)
+            cluster = []
+        cluster.append(i)
+        cluster_end = last if cluster_end is None or len(cluster) == 1 else max(cluster_end, last)
+    if cluster:
+        yield from merged(cluster)
+
+
+CombineBucket = Tuple[str, str, List[Tuple[str, Any]]]  # (id, label, [(path, kept segment or None)])
+COMBINE_FLOAT_FORMAT = "%.6f"
+
+
+def _combine_bucket(buckets: List[CombineBucket], out_path: str, out_format: str,
+                    dtype: Any, float_format: str = "%.6f",
+                    time_cache: Optional[TimestampCache] = None) -> List[str]:
+    """Merge each bucket into ``out_path`` in turn; return the read warnings.
+
+    Buckets sharing an output name are passed together, in bucket order, so
+    the last non-empty one wins exactly as in a serial run.  Kept segments
+    are rounded to ``float_format`` first so they match the per-file text.
+    Merged blocks are stamped through ``time_cache`` keyed by block number,
+    so buckets combined one after another from the same files (and hence
+    the same union of time axes) format each block once.
+    """
+    import numpy as np
+    import pandas as pd
+
+    warnings: List[str] = []
+    time_cache = time_cache if time_cache is not None else TimestampCache()
+    for elem_id, label, items in buckets:
+        sources: List[MergeSource] = []
+        for fp, kept in items:
+            if kept is not None:
+                times, values = segment_arrays(kept)
+                if len(times):
+                    if float_format != COMBINE_FLOAT_FORMAT:
+                        # Same values a read-back of the per-file text would give
+                        values = np.asarray(format_values(values, float_format), dtype=np.float64)
+                    # Text outputs carry minute stamps; combine on the same resolution
+                    sources.append(([label], times.astype("datetime64[m]").astype("datetime64[ns]"), values))
+                continue
+            try:
+                # guess skip lines: TSF=2, DAT/CSV=1
+                skip = 2 if out_format == "tsf" else 1
+                df = read_timeseries_file(fp, skip=skip, dtype=dtype)
+                if not len(df) or not df.shape[1]:
+                    continue
+                times, values = df.index.values, df.to_numpy()
+                if len(times) > 1 and (times[1:] < times[:-1]).any():
+                    order = np.argsort(times, kind="stable")
+                    times, values = times[order], values[order]
+                sources.append((list(df.columns), times, values))
             except Exception as e:
-                logging.warning(f"Combine read fail {fp}: {e}")
-        if not frames:
+                warnings.append(f"Combine read fail {fp}: {e}")
+        if not sources:
             continue
 
-        # Concatenate and sort chronologically.  Guard against an empty
-        # ``frames`` list which would cause ``pd.concat`` to raise a
-        # ``ValueError`` ("No objects to concatenate").  This scenario can occur
-        # when the input files exist but contain no data rows.  Rather than
-        # raising an exception and halting the GUI/CLI run, simply skip these
-        # buckets.
-        try:
-            left = pd.concat(frames).sort_index()
-        except ValueError as e:  # pragma: no cover - defensive
-            logging.warning(
-                f"Combine concat fail for {item_type} '{elem_id}' label '{label}' from {paths}: {e}"
-            )
-            continue
-        left = left[~left.index.duplicated(keep="first")]
+        # Column union in first-seen order, as an outer concat would give
+        union: List[str] = []
+        for cols, _, _ in sources:
+            union.extend(c for c in cols if c not in union)
+
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        sep = "," if out_format == "csv" else "\t"
+        ids_header = f"IDs,{elem_id}" if out_format == "csv" else f"IDs:\t{elem_id}"
+        # Stream the merged series out block by block
+        with open(out_path, "w", encoding="utf-8", newline="") as f:
+            f.write(f"{ids_header}\nDate/Time{sep}{sep.join(union)}\n")
+            for block_no, (times, values) in enumerate(merge_segments(sources, union, dtype)):
+                timestamps = time_cache.get(("combine", block_no), pd.DatetimeIndex(times), "%m/%d/%Y %H:%M")
+                _write_rows(f, timestamps, [values[:, j] for j in range(values.shape[1])],
+                            COMBINE_FLOAT_FORMAT, sep)
+    return warnings
+
+
+def _combine_bucket_jobs(tasks: List[Tuple[List[CombineBucket], str, str, Any, str]]) -> List[str]:
+    # One bounded cache per batch: neighbouring buckets share stamps, and
+    # nothing outlives the batch
+    time_cache = TimestampCache()
+    warnings: List[str] = []
+    for task in tasks:
+        warnings.extend(_combine_bucket(*task, time_cache=time_cache))
+    return warnings
+
+
+def combine_across_files(
+    new_files: List[Tuple[str, str]],
+    out_format: str,
+    output_dir: str,
+    prefix: str = "",
+    suffix: str = "",
+    dat_template: str = "",
+    tsf_template_sep: str = "",
+    start: Any = None,
+    end: Any = None,
+    dtype: Any = None,
+    segments: Optional[SegmentStore] = None,
+    jobs: int = 1,
+    float_format: str = "%.6f",
+) -> None:
+    """Combine output files across elements by shared IDs, labels, and types.
 
-        out_dir = os.path.join(output_dir, "combined")
-        os.makedirs(out_dir, exist_ok=True)
+    ``new_files`` should contain ``(item_type, path)`` pairs.  Only files with
+    matching ``item_type`` **and** ID/label combinations are merged.  The
+    resulting time series are merged chronologically (:func:`merge_segments`,
+    first file wins on repeated stamps) and streamed out block by block to
+    mimic a continuous simulation spanning multiple ``.out`` files.  Output
+    naming respects user templates when provided.  Values are held as
+    ``dtype`` (see :func:`value_dtype`) while combining and always written
+    with ``%.6f``, whatever precision the inputs were written with.
+    ``float_format`` is the format this run wrote its per-file outputs
+    with; series kept in ``segments`` are rounded to it so the combined
+    file matches one built by reading those outputs back.
+
+    Paths recorded in ``segments`` by the same run are merged from memory
+    (or its spill files); only other files are read back and parsed.  With
+    ``jobs`` > 1 buckets are combined on a process pool in batches of
+    neighbouring buckets; files that could not be combined are reported in
+    one warning either way.  The time column is formatted once per batch
+    for buckets that share a time axis (see :func:`_combine_bucket`).
+    """
+    window = window_fields(start, end)
+    dtype = value_dtype(dtype)
+    warnings: List[str] = []
 
+    # Buckets keyed by (type, id, label)
+    buckets: Dict[Tuple[str, str, str], List[Tuple[str, Any]]] = defaultdict(list)
+    for item_type, p in new_files:
+        kept = segments.segments.get(p) if segments is not None else None
+        if kept is not None:
+            buckets[(item_type, kept[0], kept[1])].append((p, kept))
+            continue
+        try:
+            ids, label, _, _ = read_header_metadata(p)
+            for i in ids:
+                buckets[(item_type, i, label)].append((p, None))
+        except Exception as e:
+            warnings.append(f"Skipping combine for {p}: {e}")
+
+    # One task per output name, keeping buckets that collide in order
+    out_dir = os.path.join(output_dir, "combined")
+    tasks: Dict[str, List[CombineBucket]] = {}
+    for (item_type, elem_id, label), items in buckets.items():
         short = collapse_label_token(label)
         if out_format == "tsf":
             pattern = tsf_template_sep or "{prefix}{type}{id}{param}{suffix}"
@@ -890,37 +2701,28 @@ def combine_across_files(
             suffix=suffix,
             type=item_type,
             param=short,
+            **window,
         )
-        out_path = os.path.join(out_dir, fname)
-
-        tab_columns = "\t".join(left.columns)
-        csv_columns = ",".join(left.columns)
+        tasks.setdefault(os.path.join(out_dir, fname), []).append((elem_id, label, items))
 
-        if out_format == "tsf":
-            file_export_tsf(
-                left,
-                out_path,
-                f"IDs:\t{elem_id}",
-                f"Date/Time\t{tab_columns}",
-                "%m/%d/%Y %H:%M",
-                "%.6f",
-            )
-        elif out_format == "csv":
-            file_export_csv(
-                left,
-                out_path,
-                f"IDs,{elem_id}\nDate/Time,{csv_columns}",
-                "%m/%d/%Y %H:%M",
-                "%.6f",
-            )
-        else:
-            file_export_dat(
-                left,
-                out_path,
-                f"IDs:\t{elem_id}\nDate/Time\t{tab_columns}",
-                "%m/%d/%Y %H:%M",
-                "%.6f",
-            )
+    jobs = min(max(1, int(jobs or 1)), len(tasks))
+    args = [(group, out_path, out_format, dtype, float_format) for out_path, group in tasks.items()]
+    if jobs <= 1:
+        results = [_combine_bucket_jobs(args)]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        size = max(1, len(args) // (jobs * 4))
+        batches = [args[lo:lo + size] for lo in range(0, len(args), size)]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_combine_bucket_jobs, batches))
+    for task_warnings in results:
+        warnings.extend(task_warnings)
+
+    if warnings:
+        lines = ["Some files could not be combined:"]
+        lines.extend(f"- {w}" for w in dict.fromkeys(warnings))
+        logging.warning("\n".join(lines))
 
 def args_to_preset(args: argparse.Namespace) -> Dict[str, Any]:
     return {
@@ -952,6 +2754,22 @@ def args_to_preset(args: argparse.Namespace) -> Dict[str, Any]:
         "param_dimension": args.param_dimension,
         "time_format": args.time_format,
         "float_format": args.float_format,
+        "start": args.start,
+        "end": args.end,
+        "stride": args.stride,
+        "report_every": args.report_every,
+        "writer_threads": args.writer_threads,
+        "jobs": args.jobs,
+        "combine_jobs": args.combine_jobs,
+        "threads": args.threads,
+        "dtype": args.dtype,
+        "resample": args.resample,
+        "agg": args.agg,
+        "summary": args.summary,
+        "events": args.events,
+        "thresholds": args.thresholds,
+        "derive": args.derive,
+        "spill_dir": args.spill_dir,
         "raw": args.raw,
     }
 
@@ -990,6 +2808,8 @@ def build_parser() -> argparse.ArgumentParser:
     # Output format/mode
     p.add_argument("--out-format", choices=["tsf", "dat", "csv"], default="tsf")
     p.add_argument("--combine", choices=["sep","com","across"], default="sep")
+    p.add_argument("--spill-dir", default="",
+                   help="With --combine across, keep per-file series in this directory instead of memory")
     p.add_argument("--output-dir", default="", help="Directory to write output files (defaults to input location)")
     p.add_argument("--pptx", default="", help="Path to PowerPoint file for generated plots")
 
@@ -1033,6 +2853,31 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--time-format", default="%m/%d/%Y %H:%M")
     p.add_argument("--float-format", default="%.6f")
 
+    # Time window
+    p.add_argument("--start", default="", help="Only export periods at or after this date/time (e.g. '2024-06-01 00:00')")
+    p.add_argument("--end", default="", help="Only export periods at or before this date/time")
+    p.add_argument("--stride", type=int, default=None,
+                   help="Export only every Nth reporting period (default 1 = all)")
+    p.add_argument("--report-every", default="",
+                   help="Export one period per interval, e.g. '1h' or '15min' (overrides --stride)")
+    p.add_argument("--resample", default="",
+                   help="Aggregate each series into fixed intervals while reading, e.g. '1h' or '1D'")
+    p.add_argument("--agg", choices=list(RESAMPLE_AGGS), default=None,
+                   help="Aggregation used with --resample (default mean)")
+
+    # Summary / events
+    p.add_argument("--summary", action="store_true", default=None,
+                   help="Write one table of peak/min/mean/volume per series instead of time series files")
+    p.add_argument("--thresholds", default="",
+                   help="Comma list param=value (output units) for --summary and --events")
+    p.add_argument("--events", action="store_true", default=None,
+                   help="Write one table per file of runs above --thresholds instead of time series files")
+
+    # Derived series
+    p.add_argument("--derive", default="",
+                   help="Semicolon list name=EXPR of computed series, e.g. "
+                        "'load=node:J1:TSS*link:C1:Flow_rate' (exported as type 'derived')")
+
     # Presets
     p.add_argument("--load-preset", default="", help="JSON preset file")
     p.add_argument("--save-preset", default="", help="Write effective preset to JSON")
@@ -1044,6 +2889,31 @@ def build_parser() -> argparse.ArgumentParser:
     # Discovery
     p.add_argument("--list-params", default="", help="TYPE[,TYPE...] -> list available parameters")
     p.add_argument("--list-ids", default="", help="TYPE[,TYPE...] -> list available element IDs")
+
+    # Reader cache
+    p.add_argument("--max-open-files", type=int, default=16,
+                   help="Maximum .out files kept open in the shared reader cache")
+    p.add_argument("--cache-mb", type=int, default=8192,
+                   help="Maximum combined size (MB) of .out files kept mapped in the reader cache")
+    p.add_argument("--catalog-dir", default="",
+                   help="Directory for .out catalog indexes (defaults to next to each .out file)")
+    p.add_argument("--no-catalog", action="store_true",
+                   help="Do not read or write persistent .out catalog indexes")
+
+    # Precision
+    p.add_argument("--dtype", choices=list(VALUE_DTYPES), default=None,
+                   help="Value precision kept in memory; float32 halves memory use (default float64)")
+
+    # Parallelism
+    p.add_argument("--jobs", type=int, default=None,
+                   help="Export up to N .out files at once on a process pool (default 1)")
+    p.add_argument("--combine-jobs", type=int, default=None,
+                   help="With --combine across, combine up to N series at once (default --jobs)")
+    p.add_argument("--threads", type=int, default=None,
+                   help="Threads per .out file for reading and element chunks (default 1)")
+    p.add_argument("--writer-threads", type=int, default=None,
+                   help="Write output files on N background threads while extraction continues (default 0 = inline)")
+
     p.add_argument("--quiet", action="store_true", help="Suppress non-error output")
     p.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
     return p
@@ -1059,6 +2929,11 @@ def main(argv: Optional[List[str]] = None) -> None:
         level = logging.ERROR
     logging.basicConfig(level=level, format="%(message)s")
 
+    from .swmm_out import configure_pool, pool_stats
+    configure_pool(max_handles=args.max_open_files, max_bytes=args.cache_mb * 1024 * 1024)
+    from .catalog import configure_catalog
+    configure_catalog(enabled=not args.no_catalog, cache_dir=args.catalog_dir or None)
+
     # Expand globs
     filelist: List[str] = []
     for patt in args.files:
@@ -1105,12 +2980,41 @@ def main(argv: Optional[List[str]] = None) -> None:
                 args.output_dir,
             )
 
+    try:
+        start = parse_time_bound(args.start)
+        end = parse_time_bound(args.end)
+        report_every = parse_interval(args.report_every)
+        resample_spec(args.resample, args.agg)
+    except ValueError as e:
+        logging.error(str(e))
+        sys.exit(2)
+    stride = args.stride or 1
+    if stride < 1:
+        logging.error("--stride must be at least 1")
+        sys.exit(2)
+    try:
+        thresholds = parse_thresholds(args.thresholds)
+    except ValueError as e:
+        logging.error(str(e))
+        sys.exit(2)
+    if args.events and not thresholds:
+        logging.error("--events needs --thresholds (e.g. 'Depth_above_invert=2')")
+        sys.exit(2)
+    try:
+        derived = parse_derive(args.derive)
+    except ValueError as e:
+        logging.error(str(e))
+        sys.exit(2)
+    if derived and (args.summary or args.events):
+        logging.warning("--derive is not applied to --summary/--events tables")
+
     subdir_map = resolve_output_subdirs(filelist, args.output_dir)
 
     if args.list_ids:
         targets = [s.strip() for s in args.list_ids.split(",") if s.strip()]
+        found, _ = discover_all(filelist[0])
         for t in targets:
-            ids = discover_ids(filelist[0], t)
+            ids = found.get(t, [])
             logging.info(f"[{t}] IDs:")
             for i_ in ids:
                 logging.info(f"  - {i_}")
@@ -1119,8 +3023,9 @@ def main(argv: Optional[List[str]] = None) -> None:
     # Discovery path
     if args.list_params:
         targets = [s.strip() for s in args.list_params.split(",") if s.strip()]
+        _, found = discover_all(filelist[0])
         for t in targets:
-            params = list_possible_params(filelist[0], t)
+            params = found.get(t, [])
             logging.info(f"[{t}] parameters:")
             for p_ in params:
                 logging.info(f"  - {p_}")
@@ -1151,10 +3056,111 @@ def main(argv: Optional[List[str]] = None) -> None:
     unit_overrides = parse_kv_map(args.unit_overrides)
     param_dimension = parse_kv_map(args.param_dimension)
 
+    jobs = max(1, args.jobs or 1)
+
+    def file_options(outfile: str, combine_mode: str) -> Dict[str, Any]:
+        """Return the :func:`export_outfile` options for one input file."""
+        return dict(
+            out_format=args.out_format,
+            combine_mode=combine_mode,
+            outdir_root=args.output_dir or os.path.dirname(outfile),
+            out_subdir=subdir_map.get(outfile, output_subdir_name(outfile)),
+            time_format=args.time_format,
+            float_format=args.float_format,
+            prefix=args.prefix,
+            suffix=args.suffix,
+            dat_template=args.dat_template,
+            tsf_template_sep=args.tsf_template_sep,
+            tsf_template_com=args.tsf_template_com,
+            param_short=param_short,
+            label_map=label_map,
+            param_dimension=param_dimension,
+            assume_units=assume_units,
+            to_units=to_units,
+            unit_overrides=unit_overrides,
+            show_progress=False,
+            start=start,
+            end=end,
+            stride=stride,
+            report_every=report_every,
+            writer_threads=args.writer_threads or 0,
+            threads=args.threads or 1,
+            dtype=args.dtype,
+            resample=args.resample,
+            agg=args.agg,
+            derive=derived,
+        )
+
+    def write_reports(tasks: List[Tuple[str, List[SeriesKey]]]) -> None:
+        """Write the ``--summary``/``--events`` tables for ``(outfile, keys)`` tasks."""
+        options = dict(
+            time_format=args.time_format,
+            float_format=args.float_format,
+            start=start,
+            end=end,
+            stride=stride,
+            report_every=report_every,
+            param_dimension=param_dimension,
+            assume_units=assume_units,
+            to_units=to_units,
+            unit_overrides=unit_overrides,
+        )
+        failures: List[Failure] = []
+        if args.summary:
+            filename = summary_table_path(args.output_dir or os.getcwd(), args.prefix, args.suffix)
+            pbar = tqdm(total=len(tasks), unit="file", disable=args.quiet, desc="summary")
+            failures += export_summary(
+                tasks, filename, thresholds=thresholds,
+                progress_callback=lambda done, tot, ctx: pbar.update(1), **options
+            )
+            pbar.close()
+        if args.events:
+            event_tasks = [
+                (
+                    outfile,
+                    keys,
+                    events_table_path(
+                        os.path.join(
+                            args.output_dir or os.path.dirname(outfile),
+                            subdir_map.get(outfile, output_subdir_name(outfile)),
+                        ),
+                        args.prefix,
+                        args.suffix,
+                    ),
+                )
+                for outfile, keys in tasks
+            ]
+            pbar = tqdm(total=len(tasks), unit="file", disable=args.quiet, desc="events")
+            _, event_failures = export_events(
+                event_tasks, thresholds,
+                progress_callback=lambda done, tot, ctx: pbar.update(1), **options
+            )
+            seen = set(failures)
+            failures += [f for f in event_failures if f not in seen]
+            pbar.close()
+        if failures:
+            lines = ["The following elements could not be checked:"]
+            for f, t, i, p, err in failures:
+                lines.append(f"- {os.path.basename(f)} [{t}] {i} ({p}): {err}")
+            logging.warning("\n".join(lines))
+        logging.info("Done.")
+
     # Handle raw → bypass selection
     if args.raw.strip():
-        new_files: List[Tuple[str, str]] = []
-        all_failures: List[Tuple[str, str, str, str, str]] = []
+        labels = [s.strip() for s in args.raw.split(",") if s.strip()]
+        raw_keys: List[SeriesKey] = []
+        for label in labels:
+            try:
+                itype, elem_id, param = [part.strip() for part in label.split(",")]
+            except Exception:
+                logging.error(f"Bad raw label: {label}")
+                continue
+            raw_keys.append((itype, elem_id, param))
+
+        if args.summary or args.events:
+            write_reports([(outfile, raw_keys) for outfile in filelist])
+            return
+
         ppt = None
         if args.pptx:
             try:
@@ -1163,50 +3169,24 @@ def main(argv: Optional[List[str]] = None) -> None:
             except Exception as e:
                 logging.warning(f"PPTX disabled: {e}")
 
-        labels = [s.strip() for s in args.raw.split(",") if s.strip()]
-        total = len(filelist) * len(labels)
+        total = len(filelist) * (len(labels) + len(derived))
         pbar = tqdm(total=total, unit="series", disable=args.quiet, desc="extract")
 
         def cb(done, tot, ctx):
             pbar.update(1)
 
-        for outfile in filelist:
-            outdir_root = args.output_dir or os.path.dirname(outfile)
-            subdir = subdir_map.get(outfile, output_subdir_name(outfile))
-            for label in labels:
-                try:
-                    itype, elem_id, param = [part.strip() for part in label.split(",")]
-                except Exception:
-                    logging.error(f"Bad raw label: {label}")
-                    continue
-                written, failures = process_elements(
-                    outfile=outfile,
-                    item_type=itype,
-                    element_ids=[elem_id],
-                    params=[param],
-                    out_format=args.out_format,
-                    combine_mode="sep",
-                    outdir_root=outdir_root,
-                    out_subdir=subdir,
-                    time_format=args.time_format,
-                    float_format=args.float_format,
-                    prefix=args.prefix,
-                    suffix=args.suffix,
-                    dat_template=args.dat_template,
-                    tsf_template_sep=args.tsf_template_sep,
-                    tsf_template_com=args.tsf_template_com,
-                    param_short=param_short,
-                    label_map=label_map,
-                    param_dimension=param_dimension,
-                    assume_units=assume_units,
-                    to_units=to_units,
-                    unit_overrides=unit_overrides,
-                    show_progress=False,
-                    ppt=ppt,
-                    progress_callback=cb,
-                )
-                new_files.extend((itype, f) for f in written)
-                all_failures.extend(failures)
+        # One pass over each file for every raw label
+        raw_selections: List[Selection] = [
+            (itype, [elem_id], [param]) for itype, elem_id, param in raw_keys
+        ] + derived_selection(derived)
+        segments = SegmentStore(args.spill_dir or None) if args.combine == "across" else None
+        new_files, all_failures = export_files(
+            [(outfile, raw_selections, file_options(outfile, "sep")) for outfile in filelist],
+            jobs=jobs,
+            progress_callback=cb,
+            ppt=ppt,
+            segments=segments,
+        )
 
         pbar.close()
 
@@ -1219,7 +3199,15 @@ def main(argv: Optional[List[str]] = None) -> None:
                 suffix=args.suffix,
                 dat_template=args.dat_template,
                 tsf_template_sep=args.tsf_template_sep,
+                start=start,
+                end=end,
+                dtype=args.dtype,
+                segments=segments,
+                jobs=args.combine_jobs or jobs,
+                float_format=args.float_format,
             )
+        if segments is not None:
+            segments.clear()
         if ppt and args.pptx:
             try:
                 ppt.save(args.pptx)
@@ -1231,12 +3219,11 @@ def main(argv: Optional[List[str]] = None) -> None:
             for f, t, i, p, err in all_failures:
                 lines.append(f"- {os.path.basename(f)} [{t}] {i} ({p}): {err}")
             logging.warning("\n".join(lines))
+        logging.debug(f"Reader cache: {pool_stats()}")
         logging.info("Done.")
         return
 
     # Expanded selection path
-    new_files: List[Tuple[str, str]] = []
-    all_failures: List[Tuple[str, str, str, str, str]] = []
     ppt = None
     if args.pptx:
         try:
@@ -1251,11 +3238,12 @@ def main(argv: Optional[List[str]] = None) -> None:
     for outfile in filelist:
         ids_by_type: Dict[str, List[str]] = {}
         if args.all or not args.ids.strip():
+            found, _ = discover_all(outfile)
+            inc = re.compile(args.include) if args.include else None
+            exc = re.compile(args.exclude) if args.exclude else None
             for t in active_types:
-                present = discover_ids(outfile, t)
+                present = found.get(t, [])
                 flt = []
-                inc = re.compile(args.include) if args.include else None
-                exc = re.compile(args.exclude) if args.exclude else None
                 for i in present:
                     if inc and not inc.search(i):
                         continue
@@ -1282,6 +3270,23 @@ def main(argv: Optional[List[str]] = None) -> None:
             if item_type == "system" and element_ids:
                 element_ids = ["SYSTEM"]
             total += (len(element_ids) or 0) * (len(params) or 0)
+        total += len(derived)
+
+    if args.summary or args.events:
+        write_reports([
+            (
+                outfile,
+                [
+                    k
+                    for item_type in active_types
+                    if ids_by_type.get(item_type)
+                    for k in series_keys(item_type, ids_by_type[item_type],
+                                         params_by_type.get(item_type, []))
+                ],
+            )
+            for outfile, ids_by_type in per_file_ids
+        ])
+        return
 
     total = max(total, 1)
     pbar = tqdm(total=total, unit="series", disable=args.quiet, desc="extract")
@@ -1289,44 +3294,25 @@ def main(argv: Optional[List[str]] = None) -> None:
     def cb(done, tot, ctx):
         pbar.update(1)
 
-    for outfile, ids_by_type in per_file_ids:
-        outdir_root = args.output_dir or os.path.dirname(outfile)
-        subdir = subdir_map.get(outfile, output_subdir_name(outfile))
-        for item_type in active_types:
-            element_ids = ids_by_type.get(item_type, [])
-            if not element_ids:
-                continue
-            params = params_by_type.get(item_type, [])
-            if not params:
-                continue
-            written, failures = process_elements(
-                outfile=outfile,
-                item_type=item_type,
-                element_ids=element_ids,
-                params=params,
-                out_format=args.out_format,
-                combine_mode=args.combine,
-                outdir_root=outdir_root,
-                out_subdir=subdir,
-                time_format=args.time_format,
-                float_format=args.float_format,
-                prefix=args.prefix,
-                suffix=args.suffix,
-                dat_template=args.dat_template,
-                tsf_template_sep=args.tsf_template_sep,
-                tsf_template_com=args.tsf_template_com,
-                param_short=param_short,
-                label_map=label_map,
-                param_dimension=param_dimension,
-                assume_units=assume_units,
-                to_units=to_units,
-                unit_overrides=unit_overrides,
-                show_progress=False,
-                ppt=ppt,
-                progress_callback=cb,
+    # Extract every selected series of every type in one pass per file
+    segments = SegmentStore(args.spill_dir or None) if args.combine == "across" else None
+    new_files, all_failures = export_files(
+        [
+            (
+                outfile,
+                [
+                    (item_type, ids_by_type.get(item_type, []), params_by_type.get(item_type, []))
+                    for item_type in active_types
+                ] + derived_selection(derived),
+                file_options(outfile, args.combine),
             )
-            new_files.extend((item_type, f) for f in written)
-            all_failures.extend(failures)
+            for outfile, ids_by_type in per_file_ids
+        ],
+        jobs=jobs,
+        progress_callback=cb,
+        ppt=ppt,
+        segments=segments,
+    )
 
     pbar.close()
 
@@ -1339,7 +3325,15 @@ def main(argv: Optional[List[str]] = None) -> None:
             suffix=args.suffix,
             dat_template=args.dat_template,
             tsf_template_sep=args.tsf_template_sep,
+            start=start,
+            end=end,
+            dtype=args.dtype,
+            segments=segments,
+            jobs=args.combine_jobs or jobs,
+            float_format=args.float_format,
         )
+    if segments is not None:
+        segments.clear()
 
     if ppt and args.pptx:
         try:
@@ -1354,6 +3348,7 @@ def main(argv: Optional[List[str]] = None) -> None:
             lines.append(f"- {os.path.basename(f)} [{t}] {i} ({p}): {err}")
         logging.warning("\n".join(lines))
 
+    logging.debug(f"Reader cache: {pool_stats()}")
     logging.info("Done.")
 
 if __name__ == "__main__":
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming reductions over SWMM period blocks
+--------------------------------------------
+- Accumulators are fed ``(times, block)`` pairs, where ``block`` is a
+  ``(periods, series)`` matrix from :meth:`SwmmOutput.iter_columns`
+- Every series is reduced at once with vectorized NumPy operations, so full
+  series are never materialized
+- Summary statistics (:class:`SummaryAccumulator`), fixed-interval
+  resampling (:class:`ResampleAccumulator`) and threshold exceedance events
+  (:class:`EventAccumulator`)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class SummaryAccumulator:
+    """Peak, time of peak, minimum, mean, volume and time above threshold.
+
+    ``thresholds`` holds one value per series (``NaN`` = no threshold).
+    Volume is the sum of value × period length (e.g. cfs × s = ft³ for flow).
+    """
+
+    def __init__(self, n_series: int, thresholds: Optional[np.ndarray] = None):
+        self.count = 0
+        self.peak = np.full(n_series, -np.inf)
+        self.peak_time = np.full(n_series, np.datetime64("NaT"), dtype="datetime64[s]")
+        self.minimum = np.full(n_series, np.inf)
+        self.total = np.zeros(n_series)
+        self.above = np.zeros(n_series, dtype=np.int64)
+        if thresholds is None:
+            thresholds = np.full(n_series, np.nan)
+        self.thresholds = np.asarray(thresholds, dtype=np.float64)
+
+    def update(self, times: np.ndarray, block: np.ndarray) -> None:
+        if not len(block):
+            return
+        cols = np.arange(block.shape[1])
+        at = block.argmax(axis=0)
+        block_peak = block[at, cols]
+        # Strictly greater keeps the first occurrence of a repeated peak
+        better = block_peak > self.peak
+        self.peak[better] = block_peak[better]
+        self.peak_time[better] = times[at[better]]
+        np.minimum(self.minimum, block.min(axis=0), out=self.minimum)
+        self.total += block.sum(axis=0, dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            self.above += (block > self.thresholds).sum(axis=0)
+        self.count += len(block)
+
+    def result(self, step_seconds: float) -> Dict[str, np.ndarray]:
+        """Return the statistics; each period counts for ``step_seconds``."""
+
+        empty = self.count == 0
+        nan = np.full(len(self.total), np.nan)
+        return {
+            "peak": nan if empty else self.peak,
+            "peak_time": self.peak_time,
+            "min": nan if empty else self.minimum,
+            "mean": nan if empty else self.total / self.count,
+            "volume": self.total * step_seconds,
+            "seconds_above": np.where(
+                np.isnan(self.thresholds), np.nan, self.above * step_seconds
+            ),
+        }
+
+
+RESAMPLE_AGGREGATIONS = ("mean", "max", "min", "sum")
+
+
+class ResampleAccumulator:
+    """Aggregate period blocks into fixed-width time bins.
+
+    Bins are closed and labelled on the left and counted from midnight of the
+    first period (pandas' ``resample`` defaults), so ``86400`` seconds gives
+    calendar days.  Only bins that contain at least one period are returned.
+    A bin split across two blocks is merged with the partial result carried
+    over from the previous block.
+    """
+
+    def __init__(self, n_series: int, freq_seconds: int, agg: str = "mean"):
+        if agg not in RESAMPLE_AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation '{agg}' (expected one of {', '.join(RESAMPLE_AGGREGATIONS)})")
+        if freq_seconds <= 0:
+            raise ValueError("Resample interval must be positive")
+        self.n_series = n_series
+        self.freq = np.timedelta64(int(freq_seconds), "s")
+        self.agg = agg
+        self.origin: Optional[np.datetime64] = None
+        self._bins: List[np.ndarray] = []
+        self._values: List[np.ndarray] = []
+        self._counts: List[np.ndarray] = []
+
+    def update(self, times: np.ndarray, block: np.ndarray) -> None:
+        if not len(block):
+            return
+        times = np.asarray(times).astype("datetime64[s]")
+        if self.origin is None:
+            self.origin = times[0].astype("datetime64[D]").astype("datetime64[s]")
+        bins = (times - self.origin) // self.freq
+        starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+        counts = np.diff(np.r_[starts, len(bins)])
+        if self.agg in ("mean", "sum"):
+            values = np.add.reduceat(block, starts, axis=0, dtype=np.float64)
+        elif self.agg == "max":
+            values = np.maximum.reduceat(block, starts, axis=0)
+        else:
+            values = np.minimum.reduceat(block, starts, axis=0)
+        bins = bins[starts]
+        if self._bins and self._bins[-1][-1] == bins[0]:
+            # First bin continues the last one of the previous block
+            last = self._values[-1]
+            if self.agg in ("mean", "sum"):
+                last[-1] += values[0]
+            elif self.agg == "max":
+                np.maximum(last[-1], values[0], out=last[-1])
+            else:
+                np.minimum(last[-1], values[0], out=last[-1])
+            self._counts[-1][-1] += counts[0]
+            bins, values, counts = bins[1:], values[1:], counts[1:]
+        if len(bins):
+            self._bins.append(bins)
+            self._values.append(values)
+            self._counts.append(counts)
+
+    def result(self, dtype: Any = np.float64) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(bin_start_times, values)`` with one row per non-empty bin."""
+
+        if not self._bins:
+            return np.empty(0, dtype="datetime64[s]"), np.empty((0, self.n_series), dtype=dtype)
+        bins = np.concatenate(self._bins)
+        values = np.concatenate(self._values)
+        if self.agg == "mean":
+            values = values / np.concatenate(self._counts)[:, None]
+        return self.origin + bins * self.freq, values.astype(dtype, copy=False)
+
+
+class EventAccumulator:
+    """Runs of consecutive periods above a per-series threshold.
+
+    Runs are found for the whole block at once from the edges of the
+    ``value > threshold`` mask; a run touching the end of a block stays open
+    and is continued by the next block.  Series with a ``NaN`` threshold
+    never have events.  Call :meth:`result` after the last block.
+    """
+
+    def __init__(self, n_series: int, thresholds: np.ndarray):
+        self.thresholds = np.asarray(thresholds, dtype=np.float64)
+        self.open = np.zeros(n_series, dtype=bool)
+        self.open_start = np.full(n_series, np.datetime64("NaT"), dtype="datetime64[s]")
+        self.open_count = np.zeros(n_series, dtype=np.int64)
+        self.open_peak = np.full(n_series, -np.inf)
+        self.open_peak_time = np.full(n_series, np.datetime64("NaT"), dtype="datetime64[s]")
+        self.last_time = np.datetime64("NaT", "s")
+        self._events: List[Tuple[np.ndarray, ...]] = []
+
+    def _emit(self, cols, start, end, count, peak, peak_time) -> None:
+        if len(cols):
+            self._events.append((cols, start, end, count, peak, peak_time))
+
+    def _close(self, cols: np.ndarray) -> None:
+        end = np.full(len(cols), self.last_time)
+        self._emit(cols, self.open_start[cols], end, self.open_count[cols],
+                   self.open_peak[cols], self.open_peak_time[cols])
+        self.open[cols] = False
+
+    def update(self, times: np.ndarray, block: np.ndarray) -> None:
+        if not len(block):
+            return
+        times = np.asarray(times).astype("datetime64[s]")
+        n, m = block.shape
+        with np.errstate(invalid="ignore"):
+            above = (block > self.thresholds).T  # (series, periods)
+        self._close(np.flatnonzero(self.open & ~above[:, 0]))
+
+        edges = np.zeros((m, n + 2), dtype=np.int8)
+        edges[:, 1:-1] = above
+        edges = np.diff(edges, axis=1)
+        cols, first = np.nonzero(edges == 1)
+        _, stop = np.nonzero(edges == -1)  # exclusive; pairs up with the starts
+        if len(cols):
+            # Peak of each run: values outside runs are -inf, so a reduceat
+            # from one run start to the next only sees its own run
+            flat = np.where(above, block.T, -np.inf).ravel()
+            run_starts = cols * n + first
+            peak = np.maximum.reduceat(flat, run_starts)
+            inside = np.flatnonzero(above.ravel())
+            run_of = np.searchsorted(run_starts, inside, side="right") - 1
+            at_peak = flat[inside] == peak[run_of]
+            _, first_hit = np.unique(run_of[at_peak], return_index=True)
+            peak_time = times[inside[at_peak][first_hit] - cols * n]
+            start, end = times[first], times[stop - 1]
+            count = (stop - first).astype(np.int64)
+
+            cont = (first == 0) & self.open[cols]
+            if cont.any():
+                c = cols[cont]
+                start[cont] = self.open_start[c]
+                count[cont] += self.open_count[c]
+                earlier = self.open_peak[c] >= peak[cont]
+                peak[cont] = np.where(earlier, self.open_peak[c], peak[cont])
+                peak_time[cont] = np.where(earlier, self.open_peak_time[c], peak_time[cont])
+                self.open[c] = False
+
+            done = stop < n
+            self._emit(cols[done], start[done], end[done], count[done], peak[done], peak_time[done])
+            still = ~done
+            c = cols[still]
+            self.open[c] = True
+            self.open_start[c] = start[still]
+            self.open_count[c] = count[still]
+            self.open_peak[c] = peak[still]
+            self.open_peak_time[c] = peak_time[still]
+        self.last_time = times[-1]
+
+    def result(self) -> Dict[str, np.ndarray]:
+        """Close open runs and return events ordered by series then start.
+
+        Keys: ``series`` (column index), ``start``/``end`` (first/last period
+        above), ``periods``, ``peak`` and ``peak_time``.
+        """
+
+        self._close(np.flatnonzero(self.open))
+        names = ("series", "start", "end", "periods", "peak", "peak_time")
+        if not self._events:
+            dtypes = (np.intp, "datetime64[s]", "datetime64[s]", np.int64, np.float64, "datetime64[s]")
+            return {k: np.empty(0, dtype=d) for k, d in zip(names, dtypes)}
+        merged = [np.concatenate(parts) for parts in zip(*self._events)]
+        order = np.lexsort((merged[1], merged[0]))
+        return {k: v[order] for k, v in zip(names, merged)}
@@ -0,0 +1,686 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Native reader for SWMM 5 binary ``.out`` files
+----------------------------------------------
+- Memory-maps the file and parses the opening/closing records once
+- Serves any (type, id, param) series as a strided NumPy view
+- Mirrors swmmtoolbox naming so IDs/params match its catalog output
+- Shares open readers process-wide through an LRU pool
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SWMM_MAGIC = 516114522
+RECORD_SIZE = 4
+# Bytes of period records gathered per step by :meth:`SwmmOutput.read_columns`.
+CHUNK_BYTES = 64 * 1024 * 1024
+
+# Order matches swmmtoolbox ``SwmmExtract.itemlist`` (type numbers 0..4).
+ITEM_TYPES = ("subcatchment", "node", "link", "pollutant", "system")
+
+# Variable names per type number, identical to swmmtoolbox's VARCODE tables
+# so params discovered here can be passed straight through either reader.
+VARCODE = {
+    0: {
+        0: "Rainfall",
+        1: "Snow_depth",
+        2: "Evaporation_loss",
+        3: "Infiltration_loss",
+        4: "Runoff_rate",
+        5: "Groundwater_outflow",
+        6: "Groundwater_elevation",
+        7: "Soil_moisture",
+    },
+    1: {
+        0: "Depth_above_invert",
+        1: "Hydraulic_head",
+        2: "Volume_stored_ponded",
+        3: "Lateral_inflow",
+        4: "Total_inflow",
+        5: "Flow_lost_flooding",
+    },
+    2: {
+        0: "Flow_rate",
+        1: "Flow_depth",
+        2: "Flow_velocity",
+        3: "Froude_number",
+        4: "Capacity",
+    },
+    4: {
+        0: "Air_temperature",
+        1: "Rainfall",
+        2: "Snow_depth",
+        3: "Evaporation_infiltration",
+        4: "Runoff",
+        5: "Dry_weather_inflow",
+        6: "Groundwater_inflow",
+        7: "RDII_inflow",
+        8: "User_direct_inflow",
+        9: "Total_lateral_inflow",
+        10: "Flow_lost_to_flooding",
+        11: "Flow_leaving_outfalls",
+        12: "Volume_stored_water",
+        13: "Evaporation_rate",
+        14: "Potential_PET",
+    },
+}
+
+# Files written before SWMM 5.1.10 lack the infiltration/soil moisture
+# subcatchment variables and the PET system variable.
+VARCODE_OLD = {
+    0: {
+        0: "Rainfall",
+        1: "Snow_depth",
+        2: "Evaporation_loss",
+        3: "Runoff_rate",
+        4: "Groundwater_outflow",
+        5: "Groundwater_elevation",
+    },
+    1: dict(VARCODE[1]),
+    2: dict(VARCODE[2]),
+    4: {k: v for k, v in VARCODE[4].items() if k != 14},
+}
+
+_EPOCH = np.datetime64("1899-12-30T00:00:00", "s")
+
+
+class SwmmOutputError(ValueError):
+    """Raised when a file is not a readable SWMM binary output file."""
+
+
+_UNCHECKED = object()
+
+
+def swmm_dates_to_datetime64(days: np.ndarray) -> np.ndarray:
+    """Convert SWMM's fractional day stamps to ``datetime64[s]``.
+
+    Applies the same truncation and one-second drift correction as
+    ``swmmtoolbox.extract`` so both readers produce identical indexes.
+    """
+
+    days = np.asarray(days, dtype=np.float64)
+    whole = np.trunc(days)
+    seconds = ((days - whole) * 86400).astype(np.int64)
+    extra = seconds % 10
+    seconds = seconds - (extra == 1) + (extra == 9)
+    total = whole.astype(np.int64) * 86400 + seconds
+    return _EPOCH + total.astype("timedelta64[s]")
+
+
+class SwmmOutput:
+    """Memory-mapped view over a SWMM 5 binary output file.
+
+    The header is parsed once on construction.  Series are served as strided
+    ``float32`` views into the mapping, so reading one series only touches the
+    pages that hold its values.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = open(path, "rb")
+        try:
+            try:
+                self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:  # empty file
+                raise SwmmOutputError(f"{path}: empty file") from exc
+            try:
+                self._parse()
+            except struct.error as exc:
+                raise SwmmOutputError(f"{path}: truncated SWMM output ({exc})") from exc
+        except BaseException:
+            self.close()
+            raise
+
+    # -- lifecycle -------------------------------------------------------
+
+    def close(self) -> None:
+        """Stop serving reads and release the mapping and file handle.
+
+        While views returned by :meth:`values` are still alive the mapping
+        cannot be unmapped; it is then kept (``closed`` stays False) and a
+        later call retries.
+        """
+        self._closing = True
+        self._results = None
+        self._dates = None
+        mm = getattr(self, "_mm", None)
+        if mm is not None:
+            try:
+                mm.close()
+            except BufferError:  # views still exported
+                return
+            self._mm = None
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    @property
+    def closing(self) -> bool:
+        """True once :meth:`close` was called, even if the mapping is still pinned."""
+        return getattr(self, "_closing", False)
+
+    @property
+    def closed(self) -> bool:
+        """True once the mapping and file handle are actually released."""
+        return self._fh is None
+
+    def __enter__(self) -> "SwmmOutput":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- header parsing --------------------------------------------------
+
+    def _parse(self) -> None:
+        mm = self._mm
+        size = len(mm)
+        if size < 14 * RECORD_SIZE:
+            raise SwmmOutputError(f"{self.path}: file too small for a SWMM output")
+
+        (
+            self.ids_offset,
+            self.properties_offset,
+            self.results_offset,
+            self.n_periods,
+            errcode,
+            magic2,
+        ) = struct.unpack_from("<6i", mm, size - 6 * RECORD_SIZE)
+        (
+            magic1,
+            self.version,
+            self.flow_units,
+            n_sub,
+            n_node,
+            n_link,
+            n_poll,
+        ) = struct.unpack_from("<7i", mm, 0)
+
+        if magic1 != SWMM_MAGIC:
+            raise SwmmOutputError(f"{self.path}: bad magic number at beginning")
+        if magic2 != SWMM_MAGIC:
+            raise SwmmOutputError(f"{self.path}: bad magic number at end")
+        if errcode != 0:
+            raise SwmmOutputError(
+                f"{self.path}: error code {errcode} indicates a problem with the run"
+            )
+        if self.n_periods <= 0:
+            raise SwmmOutputError(f"{self.path}: zero time periods in output")
+
+        counts = [n_sub, n_node, n_link, n_poll]
+        pos = self.ids_offset
+        names: Dict[int, List[str]] = {}
+        for typenum, count in enumerate(counts):
+            collected: List[str] = []
+            for _ in range(count):
+                (length,) = struct.unpack_from("<i", mm, pos)
+                pos += RECORD_SIZE
+                raw = mm[pos:pos + length]
+                pos += length
+                collected.append(raw.decode("ascii", "replace"))
+            names[typenum] = collected
+        self.pollutant_units = struct.unpack_from(f"<{n_poll}i", mm, pos)
+
+        pos = self.properties_offset
+        for typenum, count in enumerate(counts[:3]):
+            (nprop,) = struct.unpack_from("<i", mm, pos)
+            pos += RECORD_SIZE * (1 + nprop + count * nprop)
+
+        codes: Dict[int, tuple] = {}
+        for typenum in (0, 1, 2, 4):
+            (nvars,) = struct.unpack_from("<i", mm, pos)
+            codes[typenum] = struct.unpack_from(f"<{nvars}i", mm, pos + RECORD_SIZE)
+            pos += RECORD_SIZE * (1 + nvars)
+
+        (start_days,) = struct.unpack_from("<d", mm, pos)
+        (step,) = struct.unpack_from("<i", mm, pos + 8)
+
+        varcode = VARCODE_OLD if self.version < 5100 else VARCODE
+        variables: Dict[int, List[str]] = {}
+        for typenum, type_codes in codes.items():
+            lookup = dict(varcode[typenum])
+            if typenum != 4:
+                base = len(varcode[typenum])
+                lookup.update({base + i: p for i, p in enumerate(names[3])})
+            variables[typenum] = [lookup.get(c, str(c)) for c in type_codes]
+        names[4] = list(variables[4])
+
+        self.counts = {ITEM_TYPES[i]: c for i, c in enumerate(counts)}
+        self.counts["system"] = 1
+        self.names = {ITEM_TYPES[i]: names[i] for i in range(5)}
+        self.variables = {ITEM_TYPES[i]: variables[i] for i in (0, 1, 2, 4)}
+        self.variables["pollutant"] = []
+
+        self.start_date = datetime(1899, 12, 30) + timedelta(days=start_days)
+        self.report_step = timedelta(seconds=step)
+
+        # Each period: an 8-byte date followed by float32 values for every
+        # subcatchment, node, link and system variable, in that order.
+        self._type_base = {}
+        base = 2
+        for typenum in (0, 1, 2):
+            self._type_base[ITEM_TYPES[typenum]] = base
+            base += counts[typenum] * len(codes[typenum])
+        self._type_base["system"] = base
+        base += len(codes[4])
+        self.period_floats = base
+        self.period_bytes = base * RECORD_SIZE
+
+        end = self.results_offset + self.n_periods * self.period_bytes
+        if end > size:
+            raise SwmmOutputError(f"{self.path}: results section is truncated")
+
+        self._name_index = {
+            t: {n: i for i, n in enumerate(self.names[t])} for t in ITEM_TYPES[:3]
+        }
+        self._var_index = {
+            t: {v: i for i, v in enumerate(vs)} for t, vs in self.variables.items()
+        }
+        # frombuffer holds a buffer export on the mapping, so it cannot be
+        # unmapped (see close) while any view derived from it is alive
+        raw = np.frombuffer(mm, dtype=np.uint8, count=end - self.results_offset,
+                            offset=self.results_offset)
+        self._results: Optional[np.ndarray] = np.ndarray(
+            shape=(self.n_periods, self.period_floats),
+            dtype="<f4",
+            buffer=raw,
+        )
+        self._dates: Optional[np.ndarray] = np.ndarray(
+            shape=(self.n_periods,),
+            dtype="<f8",
+            buffer=raw,
+            strides=(self.period_bytes,),
+        )
+        self._axis: Any = _UNCHECKED
+        # Per-file objects derived by callers (e.g. shared time indexes)
+        self.derived: Dict[Any, Any] = {}
+
+    # -- catalog ---------------------------------------------------------
+
+    def ids(self, item_type: str) -> List[str]:
+        """Return element names for ``item_type`` in file order."""
+
+        if item_type not in self.names:
+            raise ValueError(f'Type "{item_type}" must be one of {list(ITEM_TYPES)}')
+        return list(self.names[item_type])
+
+    def params(self, item_type: str) -> List[str]:
+        """Return the variable names reported for ``item_type``."""
+
+        if item_type not in self.variables:
+            raise ValueError(f'Type "{item_type}" must be one of {list(ITEM_TYPES)}')
+        return list(self.variables[item_type])
+
+    def column(self, item_type: str, elem_id: str, param: str) -> int:
+        """Return the float offset of a series within each period record."""
+
+        if item_type == "pollutant":
+            raise ValueError(
+                "Pollutant results are stored per subcatchment, node or link; "
+                "request them as e.g. 'node,<id>,<pollutant>'"
+            )
+        variables = self._var_index.get(item_type)
+        if variables is None:
+            raise ValueError(f'Type "{item_type}" must be one of {list(ITEM_TYPES)}')
+
+        var = variables.get(str(param))
+        if var is None:
+            try:
+                var = int(param)
+            except (TypeError, ValueError):
+                var = -1
+            if not 0 <= var < len(self.variables[item_type]):
+                raise ValueError(f'{param} was not found in "{item_type}" variables.')
+
+        if item_type == "system":
+            return self._type_base["system"] + var
+
+        idx = self._name_index[item_type].get(str(elem_id))
+        if idx is None:
+            raise ValueError(f'{elem_id} was not found in "{item_type}" list.')
+        nvars = len(self.variables[item_type])
+        return self._type_base[item_type] + idx * nvars + var
+
+    # -- data access -----------------------------------------------------
+
+    @property
+    def results(self) -> np.ndarray:
+        """``(n_periods, period_floats)`` float32 view over the results."""
+
+        if self._results is None:
+            raise ValueError(f"{self.path}: reader is closed")
+        return self._results
+
+    def values(self, item_type: str, elem_id: str, param: str) -> np.ndarray:
+        """Return a strided read-only ``float32`` view of one series."""
+
+        return self.results[:, self.column(item_type, elem_id, param)]
+
+    def read_columns(
+        self,
+        columns: Sequence[int],
+        *,
+        periods: slice = slice(None),
+        dtype: Any = np.float64,
+        out: Optional[np.ndarray] = None,
+        chunk_bytes: int = CHUNK_BYTES,
+        threads: int = 1,
+    ) -> np.ndarray:
+        """Gather many series in one sequential pass over the period records.
+
+        ``columns`` are offsets from :meth:`column` and ``periods`` selects
+        the period records to visit (see :meth:`period_range` and
+        :meth:`sample`).  Periods are
+        visited in blocks of roughly ``chunk_bytes`` so each block of the
+        file is read once no matter how many series are requested.  With
+        ``threads`` > 1 the periods are split into contiguous ranges gathered
+        concurrently from the shared map (NumPy copies release the GIL).
+        Returns (or fills) a ``(periods, len(columns))`` matrix.
+        """
+
+        first, stop, stride = periods.indices(self.n_periods)
+        if stride < 1:
+            raise ValueError("periods must be an increasing slice")
+        count = len(range(first, stop, stride))
+        cols = np.asarray(columns, dtype=np.intp)
+        if out is None:
+            out = np.empty((count, len(cols)), dtype=dtype)
+        if not len(cols) or not count:
+            return out
+        results = self.results
+        # Records skipped by a stride are never touched, so the block size
+        # counts only the records actually visited.
+        rows = max(1, chunk_bytes // self.period_bytes)
+
+        def gather(begin: int, stop: int) -> None:
+            for i in range(begin, stop, rows):
+                j = min(i + rows, stop)
+                lo = first + i * stride
+                hi = first + (j - 1) * stride + 1
+                out[i:j] = results[lo:hi:stride, cols]
+
+        threads = min(max(1, int(threads)), count)
+        if threads == 1:
+            gather(0, count)
+            return out
+        edges = np.linspace(0, count, threads + 1).astype(int)
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for fut in [pool.submit(gather, a, b) for a, b in zip(edges[:-1], edges[1:])]:
+                fut.result()
+        return out
+
+    def iter_columns(
+        self,
+        columns: Sequence[int],
+        *,
+        periods: slice = slice(None),
+        dtype: Any = np.float64,
+        chunk_bytes: int = CHUNK_BYTES,
+    ) -> Iterator[Tuple[slice, np.ndarray]]:
+        """Yield ``(period_slice, block)`` pairs covering ``periods`` in order.
+
+        The same single pass as :meth:`read_columns`, but only one block of
+        roughly ``chunk_bytes`` is held at a time, for streaming reductions.
+        ``period_slice`` selects the block's records (e.g. for :meth:`times`).
+        """
+
+        first, stop, stride = periods.indices(self.n_periods)
+        if stride < 1:
+            raise ValueError("periods must be an increasing slice")
+        count = len(range(first, stop, stride))
+        cols = np.asarray(columns, dtype=np.intp)
+        results = self.results
+        rows = max(1, chunk_bytes // self.period_bytes)
+        for i in range(0, count, rows):
+            j = min(i + rows, count)
+            block = slice(first + i * stride, first + (j - 1) * stride + 1, stride)
+            yield block, results[block, cols].astype(dtype, copy=False)
+
+    def raw_dates(self) -> np.ndarray:
+        """Return the per-period SWMM day stamps as a strided view."""
+
+        if self._dates is None:
+            raise ValueError(f"{self.path}: reader is closed")
+        return self._dates
+
+    def time_axis(self) -> Optional[Tuple[np.datetime64, np.timedelta64]]:
+        """Return ``(first_stamp, step)`` when the period stamps are regular.
+
+        Period ``k`` of a regular file is stamped ``start + (k + 1) * step``
+        from the header alone.  The arithmetic axis is checked once against
+        every stored stamp; ``None`` means the stamps differ and
+        :meth:`times` reads them from the file instead.
+        """
+
+        if self._axis is _UNCHECKED:
+            step = np.timedelta64(int(self.report_step.total_seconds()), "s")
+            # The header date is a fractional day; round it to whole seconds
+            start = np.datetime64(self.start_date, "ms") + np.timedelta64(500, "ms")
+            first = start.astype("datetime64[s]") + step
+            axis = (first, step)
+            if step <= np.timedelta64(0, "s") or not np.array_equal(
+                first + np.arange(self.n_periods) * step,
+                swmm_dates_to_datetime64(self.raw_dates()),
+            ):
+                axis = None
+            self._axis = axis
+        return self._axis
+
+    def times(self, periods: slice = slice(None)) -> np.ndarray:
+        """Return reporting times of ``periods`` as ``datetime64[s]``.
+
+        Regular files (see :meth:`time_axis`) compute the stamps from the
+        header instead of reading one per period record.
+        """
+
+        axis = self.time_axis()
+        if axis is None:
+            return swmm_dates_to_datetime64(self.raw_dates()[periods])
+        return axis[0] + np.arange(*periods.indices(self.n_periods)) * axis[1]
+
+    def _time_at(self, period: int) -> np.datetime64:
+        return swmm_dates_to_datetime64(self.raw_dates()[period:period + 1])[0]
+
+    def period_range(self, start: Any = None, end: Any = None) -> slice:
+        """Return the slice of periods reported within ``[start, end]``.
+
+        The position is computed from the header's start date and report
+        step, then confirmed against the stored period stamps, so only a few
+        period records are touched.  Files with irregular stamps fall back to
+        a binary search over the stored stamps.
+        """
+
+        lo = 0 if start is None else self._first_at_or_after(np.datetime64(start, "s"))
+        hi = self.n_periods if end is None else self._first_at_or_after(
+            np.datetime64(end, "s") + np.timedelta64(1, "s")
+        )
+        return slice(lo, max(lo, hi))
+
+    def sample(self, periods: slice, stride: int = 1, align: Optional[int] = None) -> slice:
+        """Return ``periods`` thinned to every ``stride``-th period record.
+
+        With ``align`` (seconds) the first kept record is the first one
+        stamped on a whole multiple of ``align`` past midnight, so hourly
+        samples of 5-minute results land on the hour.  Only the stamps of the
+        first ``stride`` records are inspected.
+        """
+
+        lo, hi, _ = periods.indices(self.n_periods)
+        stride = max(1, int(stride))
+        if align and stride > 1:
+            for k in range(lo, min(hi, lo + stride)):
+                if int(self._time_at(k).astype(np.int64)) % int(align) == 0:
+                    lo = k
+                    break
+        return slice(lo, max(lo, hi), stride)
+
+    def _first_at_or_after(self, when: np.datetime64) -> int:
+        n = self.n_periods
+        step = int(self.report_step.total_seconds())
+        if step > 0:
+            header_start = np.datetime64(self.start_date, "s")
+            # Period k is stamped one report step after period k - 1; the
+            # first stamp is one step after the header start date.
+            offset = (when - header_start).astype(np.int64)
+            guess = min(max(-(-offset // step) - 1, 0), n)
+            if (guess == n or self._time_at(guess) >= when) and (
+                guess == 0 or self._time_at(guess - 1) < when
+            ):
+                return int(guess)
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._time_at(mid) < when:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+class OutputPool:
+    """Process-wide LRU cache of open :class:`SwmmOutput` readers.
+
+    Entries are keyed by absolute path and validated against the file's size
+    and mtime, so a re-run model is re-parsed automatically.  Least-recently
+    used readers are closed once more than ``max_handles`` files are open or
+    their mapped size exceeds ``max_bytes``.  Readers handed out by
+    :meth:`acquire` are pinned until :meth:`release` and are never evicted
+    while in use.  Readers whose mapping is still referenced by returned
+    views are closed again on later :meth:`release`/:meth:`clear` calls.
+    """
+
+    def __init__(self, max_handles: int = 16, max_bytes: int = 8 * 1024 ** 3):
+        self.max_handles = max_handles
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], SwmmOutput]]" = OrderedDict()
+        self._pins: Dict[SwmmOutput, int] = {}
+        self._unclosed: List[SwmmOutput] = []
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, max_handles: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """Update the caps and evict immediately if they are now exceeded."""
+
+        with self._lock:
+            if max_handles is not None:
+                self.max_handles = max(1, int(max_handles))
+            if max_bytes is not None:
+                self.max_bytes = max(0, int(max_bytes))
+            self._evict()
+
+    def acquire(self, path: str) -> SwmmOutput:
+        """Return a pinned reader for ``path``, opening it on a miss."""
+
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        signature = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature and not entry[1].closing:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                reader = entry[1]
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                    self._close(entry[1])
+                self.misses += 1
+                reader = SwmmOutput(path)
+                self._entries[key] = (signature, reader)
+            self._pins[reader] = self._pins.get(reader, 0) + 1
+            self._evict()
+            return reader
+
+    def release(self, reader: SwmmOutput) -> None:
+        """Unpin a reader returned by :meth:`acquire`."""
+
+        with self._lock:
+            count = self._pins.get(reader, 0) - 1
+            if count > 0:
+                self._pins[reader] = count
+                return
+            self._pins.pop(reader, None)
+            if not any(r is reader for _, r in self._entries.values()):
+                self._close(reader)  # replaced or evicted while pinned
+            self._evict()
+            self._retry_close()
+
+    def clear(self) -> None:
+        """Close every unpinned reader and forget it."""
+
+        with self._lock:
+            for key in list(self._entries):
+                reader = self._entries[key][1]
+                if reader not in self._pins:
+                    del self._entries[key]
+                    self._close(reader)
+            self._retry_close()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and current occupancy."""
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "open": len(self._entries),
+                "mapped_bytes": self._mapped_bytes(),
+            }
+
+    def _mapped_bytes(self) -> int:
+        return sum(sig[0] for sig, _ in self._entries.values())
+
+    def _close(self, reader: SwmmOutput) -> None:
+        if reader not in self._pins:
+            reader.close()
+            if not reader.closed:
+                self._unclosed.append(reader)
+
+    def _retry_close(self) -> None:
+        for reader in self._unclosed:
+            reader.close()
+        self._unclosed = [r for r in self._unclosed if not r.closed]
+
+    def _evict(self) -> None:
+        for key in list(self._entries):
+            if (
+                len(self._entries) <= self.max_handles
+                and self._mapped_bytes() <= self.max_bytes
+            ):
+                break
+            reader = self._entries[key][1]
+            if reader in self._pins:
+                continue
+            del self._entries[key]
+            self._close(reader)
+            self.evictions += 1
+
+
+OUTPUT_POOL = OutputPool()
+
+
+def configure_pool(max_handles: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+    """Set the handle and mapped-byte caps of the shared reader pool."""
+
+    OUTPUT_POOL.configure(max_handles=max_handles, max_bytes=max_bytes)
+
+
+def pool_stats() -> Dict[str, int]:
+    """Return hit/miss statistics for the shared reader pool."""
+
+    return OUTPUT_POOL.stats()
@@ -1,4 +1,5 @@
 
+import multiprocessing
 import sys
 from PyQt5 import QtWidgets, QtGui
 from extracttimeseries.gui import ExtractorWindow, apply_dark_palette, ICON_PATH
@@ -12,4 +13,6 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    # Needed for the --jobs process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
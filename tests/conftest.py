@@ -0,0 +1,86 @@
+import struct
+from datetime import datetime
+
+import pytest
+
+SWMM_MAGIC = 516114522
+
+
+def write_swmm_out(
+    path,
+    *,
+    subcatchments=(),
+    nodes=(),
+    links=(),
+    pollutants=(),
+    n_periods=4,
+    start=datetime(2024, 1, 1),
+    step_seconds=3600,
+    version=51015,
+):
+    """Write a minimal SWMM 5.1 binary output file.
+
+    Every value is deterministic: ``period + 0.001 * column`` where ``column``
+    is the float offset inside the period record, so tests can predict the
+    numbers for any series without storing them.
+    """
+
+    n_sub, n_node, n_link, n_poll = (
+        len(subcatchments), len(nodes), len(links), len(pollutants)
+    )
+    sub_vars = list(range(8 + n_poll))
+    node_vars = list(range(6 + n_poll))
+    link_vars = list(range(5 + n_poll))
+    sys_vars = list(range(15))
+
+    buf = bytearray()
+    buf += struct.pack("<7i", SWMM_MAGIC, version, 0, n_sub, n_node, n_link, n_poll)
+
+    ids_pos = len(buf)
+    for name in (*subcatchments, *nodes, *links, *pollutants):
+        raw = name.encode("ascii")
+        buf += struct.pack("<i", len(raw)) + raw
+    buf += struct.pack(f"<{n_poll}i", *([0] * n_poll))
+
+    prop_pos = len(buf)
+    for count, codes in ((n_sub, [1]), (n_node, [0, 2, 3]), (n_link, [0, 4, 4, 3, 5])):
+        buf += struct.pack(f"<{1 + len(codes)}i", len(codes), *codes)
+        buf += struct.pack(f"<{count * len(codes)}f", *([0.0] * count * len(codes)))
+
+    for codes in (sub_vars, node_vars, link_vars, sys_vars):
+        buf += struct.pack(f"<{1 + len(codes)}i", len(codes), *codes)
+
+    start_days = (start - datetime(1899, 12, 30)).total_seconds() / 86400
+    buf += struct.pack("<di", start_days, step_seconds)
+
+    results_pos = len(buf)
+    n_values = (
+        n_sub * len(sub_vars)
+        + n_node * len(node_vars)
+        + n_link * len(link_vars)
+        + len(sys_vars)
+    )
+    for period in range(n_periods):
+        stamp = start_days + (period + 1) * step_seconds / 86400
+        buf += struct.pack("<d", stamp)
+        buf += struct.pack(
+            f"<{n_values}f",
+            *(period + 0.001 * (2 + col) for col in range(n_values)),
+        )
+
+    buf += struct.pack("<6i", ids_pos, prop_pos, results_pos, n_periods, 0, SWMM_MAGIC)
+    with open(path, "wb") as fh:
+        fh.write(bytes(buf))
+    return str(path)
+
+
+@pytest.fixture
+def swmm_out(tmp_path):
+    """Return a factory that writes a synthetic ``.out`` file under ``tmp_path``."""
+
+    def factory(name="model.out", **kwargs):
+        kwargs.setdefault("nodes", ("J1", "J2"))
+        kwargs.setdefault("links", ("C1",))
+        return write_swmm_out(tmp_path / name, **kwargs)
+
+    return factory
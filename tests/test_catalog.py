@@ -0,0 +1,29 @@
+import os
+
+from extracttimeseries import catalog, logic
+from extracttimeseries.swmm_out import OUTPUT_POOL
+
+from conftest import write_swmm_out
+
+
+def test_discovery_writes_and_reuses_sidecar_catalog(swmm_out):
+    path = swmm_out(n_periods=3)
+    sidecar = path + catalog.CATALOG_SUFFIX
+
+    assert logic.discover_ids(path, "link") == ["C1"]
+    assert os.path.isfile(sidecar)
+
+    OUTPUT_POOL.clear()
+    misses = OUTPUT_POOL.stats()["misses"]
+    assert logic.discover_ids(path, "node") == ["J1", "J2"]
+    assert "Flow_rate" in logic.list_possible_params(path, "link")
+    assert OUTPUT_POOL.stats()["misses"] == misses  # served from the index
+
+    stored = catalog.load_catalog(path)
+    assert stored["n_periods"] == 3
+    assert stored["report_step"] == 3600
+
+    # Re-running the model invalidates the index
+    write_swmm_out(path, nodes=("J9",), links=("C1",), n_periods=3)
+    assert catalog.load_catalog(path) is None
+    assert logic.discover_ids(path, "node") == ["J9"]
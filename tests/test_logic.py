@@ -1,6 +1,24 @@
+import json
+import os
+import pickle
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
 import pandas as pd
+import pytest
 
 from extracttimeseries import logic
+from extracttimeseries.reductions import EventAccumulator, ResampleAccumulator
+
+# Keyword options shared by the export tests; each test overrides what it checks
+EXPORT_OPTIONS = dict(
+    time_format="%m/%d/%Y %H:%M", float_format="%.6f", prefix="", suffix="",
+    dat_template="", tsf_template_sep="", tsf_template_com="", param_short={},
+    label_map={}, param_dimension={}, assume_units={}, to_units={}, unit_overrides={},
+    show_progress=False,
+)
 
 
 def test_export_helpers_accept_plain_filenames(tmp_path, monkeypatch):
@@ -134,3 +152,631 @@ def test_exports_coerce_index_and_format(tmp_path, monkeypatch):
 
     assert dat_lines[2:] == ["01/01/2024 00:00\t1.23", "01/01/2024 01:00\t6.79"]
     assert csv_lines[2:] == ["01/01/2024 00:00,1.23", "01/01/2024 01:00,6.79"]
+
+
+def test_extract_batch_matches_single_series_and_records_errors(swmm_out):
+    path = swmm_out(n_periods=3)
+    keys = [
+        ("node", "J1", "Hydraulic_head"),
+        ("link", "C1", "Flow_rate"),
+        ("node", "missing", "Hydraulic_head"),
+    ]
+
+    block = logic.extract_batch(path, keys)
+
+    assert block.values.shape == (3, 2)
+    assert "missing" in block.errors[keys[2]]
+    for key in keys[:2]:
+        expected = logic.extract_series(path, *key)
+        pd.testing.assert_frame_equal(block.frame(*key), expected)
+
+
+def test_unselected_system_series_are_not_extracted(swmm_out, tmp_path, monkeypatch):
+    path = swmm_out(n_periods=2)
+    assert logic.series_keys("system", [], ["Rainfall"]) == []
+    assert logic.series_keys("system", ["x"], ["Rainfall"]) == [("system", "SYSTEM", "Rainfall")]
+    requested = []
+    extract = logic.extract_batch
+    monkeypatch.setattr(logic, "extract_batch", lambda f, keys, **kw: requested.extend(keys) or extract(f, keys, **kw))
+
+    written, failures = logic.export_outfile(
+        path, [("link", ["C1"], ["Flow_rate"]), ("system", [], ["Rainfall"])],
+        out_format="dat", combine_mode="sep", outdir_root=str(tmp_path), out_subdir="m",
+        **EXPORT_OPTIONS,
+    )
+
+    assert requested == [("link", "C1", "Flow_rate")]
+    assert [t for t, _ in written] == ["link"] and not failures
+
+
+def test_extract_batch_fallback_aligns_on_the_union_of_time_axes(monkeypatch):
+    hours = pd.date_range("2024-01-01", periods=4, freq="h")
+    series = {
+        "A": pd.DataFrame({"value": [1.0, 2.0]}, index=hours[:2]),
+        "B": pd.DataFrame({"value": [3.0, 4.0, 5.0]}, index=hours[1:]),
+    }
+
+    @contextmanager
+    def no_reader(outfile):
+        yield None
+
+    monkeypatch.setattr(logic, "swmm_output", no_reader)
+    monkeypatch.setattr(logic, "extract_series", lambda f, t, i, p, **kw: series[i])
+
+    block = logic.extract_batch("x.out", [("node", "A", "Depth"), ("node", "B", "Depth")])
+
+    expected = pd.concat([df["value"] for df in series.values()], axis=1, join="outer")
+    assert block.index.equals(expected.index)
+    np.testing.assert_array_equal(block.values, expected.to_numpy())
+
+
+def test_time_window_limits_periods_and_fills_template_fields(swmm_out, tmp_path):
+    path = swmm_out(n_periods=48)
+
+    block = logic.extract_batch(
+        path, [("link", "C1", "Flow_rate")], start="2024-01-01 05:30", end="2024-01-01 08:00"
+    )
+    assert [t.strftime("%H:%M") for t in block.index] == ["06:00", "07:00", "08:00"]
+    assert block.values[:, 0].tolist() == pytest.approx([5.014, 6.014, 7.014], abs=1e-5)
+
+    written, failures = logic.process_elements(
+        path, "link", ["C1"], ["Flow_rate"], "csv", "sep", str(tmp_path / "out"),
+        **dict(EXPORT_OPTIONS, float_format="%.3f", dat_template="{id}_{start}_{end}"),
+        start="2024-01-01 06:00", end="2024-01-01 07:00",
+    )
+    assert not failures
+    assert os.path.basename(written[0]) == "C1_202401010600_202401010700.csv"
+    with open(written[0]) as fh:
+        assert fh.read().splitlines()[2:] == ["01/01/2024 06:00,5.014", "01/01/2024 07:00,6.014"]
+
+
+def test_stride_and_report_every_thin_periods(swmm_out):
+    path = swmm_out(n_periods=36, step_seconds=300)
+    key = ("link", "C1", "Flow_rate")
+
+    block = logic.extract_batch(path, [key], stride=12)
+    assert [t.strftime("%H:%M") for t in block.index] == ["00:05", "01:05", "02:05"]
+
+    block = logic.extract_batch(path, [key], report_every="1h")
+    assert [t.strftime("%H:%M") for t in block.index] == ["01:00", "02:00", "03:00"]
+    assert block.values[:, 0].tolist() == pytest.approx([11.014, 23.014, 35.014], abs=1e-5)
+    assert block.covers([key], sampling=(1, pd.Timedelta("1h")))
+    assert not block.covers([key])
+
+
+def test_writer_formats_columns_like_row_by_row_output(tmp_path):
+    index = pd.date_range("2024-01-01 00:00:07", periods=3, freq="37min")
+    df = pd.DataFrame({"a": [1.5, float("nan"), 3.0], "b": ["2", None, "x"]}, index=index)
+    out = tmp_path / "w.csv"
+
+    logic.file_export_csv(df, str(out), "IDs,X\nDate/Time,a,b", "%m/%d/%Y %H:%M:%S", "%.2f")
+
+    assert out.read_text().splitlines() == [
+        "IDs,X",
+        "Date/Time,a,b",
+        "01/01/2024 00:00:07,1.50,2.00",
+        "01/01/2024 00:37:07,nan,nan",
+        "01/01/2024 01:14:07,3.00,x",
+    ]
+    assert list(logic.format_timestamps(index, "%d %b %Y")) == [t.strftime("%d %b %Y") for t in index]
+
+
+def test_time_column_is_formatted_once_per_block(swmm_out, tmp_path, monkeypatch):
+    path = swmm_out(n_periods=5)
+    calls = []
+    original = logic.format_timestamps
+
+    def counting(index, time_format):
+        calls.append(time_format)
+        return original(index, time_format)
+
+    monkeypatch.setattr(logic, "format_timestamps", counting)
+    block = logic.extract_batch(path, logic.series_keys("node", ["J1", "J2"], ["Hydraulic_head", "Depth_above_invert"]))
+    for combine in ("sep", "com"):
+        written, failures = logic.process_elements(
+            path, "node", ["J1", "J2"], ["Hydraulic_head", "Depth_above_invert"], "dat", combine,
+            str(tmp_path / combine), block=block, **EXPORT_OPTIONS,
+        )
+        assert not failures
+
+    assert calls == ["%m/%d/%Y %H:%M"]
+    assert len(block.time_cache) == 1
+
+
+def test_timestamp_cache_evicts_least_recently_used():
+    cache = logic.TimestampCache(max_entries=2)
+    index = pd.date_range("2024-01-01", periods=3, freq="h")
+    first = cache.get("a", index, "%H")
+    second = cache.get("b", index, "%H")
+    assert cache.get("a", index, "%H") is first
+    cache.get("c", index, "%H")  # evicts "b", the least recently used
+    assert len(cache) == 2
+    assert cache.get("a", index, "%H") is first
+    assert cache.get("b", index, "%H") is not second
+
+
+def test_writer_threads_match_inline_output_and_report_write_errors(swmm_out, tmp_path):
+    path = swmm_out(n_periods=5)
+    common = dict(EXPORT_OPTIONS, out_subdir="m")
+    params = ["Hydraulic_head", "Depth_above_invert"]
+    progress = []
+
+    inline, _ = logic.process_elements(
+        path, "node", ["J1", "J2"], params, "csv", "sep", str(tmp_path / "a"), **common
+    )
+    piped, failures = logic.process_elements(
+        path, "node", ["J1", "J2"], params, "csv", "sep", str(tmp_path / "b"),
+        writer_threads=2, progress_callback=lambda d, t, ctx: progress.append(d), **common
+    )
+    assert not failures
+    assert progress == [1, 2, 3, 4]
+    assert [os.path.relpath(p, tmp_path / "b") for p in piped] == [
+        os.path.relpath(p, tmp_path / "a") for p in inline
+    ]
+    for a, b in zip(inline, piped):
+        with open(a) as fa, open(b) as fb:
+            assert fa.read() == fb.read()
+
+    for blocked in piped[:2]:
+        os.remove(blocked)
+        os.makedirs(blocked)
+    segments = logic.SegmentStore()
+    written, failures = logic.process_elements(
+        path, "node", ["J1", "J2"], params, "csv", "sep", str(tmp_path / "b"),
+        writer_threads=2, segments=segments, **common
+    )
+    assert written == piped[2:]
+    assert [(f[2], f[3]) for f in failures] == [("J1", "Hydraulic_head"), ("J1", "Depth_above_invert")]
+    assert sorted(segments.segments) == sorted(written)
+
+
+def test_export_files_process_pool_matches_serial_run(swmm_out, tmp_path):
+    files = [swmm_out(f"s{i}.out", n_periods=3) for i in range(3)]
+    selections = [("node", ["J1", "J2"], ["Hydraulic_head"]), ("link", ["C1"], ["Flow_rate"])]
+
+    def run(root, jobs):
+        options = dict(EXPORT_OPTIONS, out_format="csv", combine_mode="sep", outdir_root=str(tmp_path / root))
+        progress, finished = [], []
+        tasks = [(f, selections, dict(options, out_subdir=os.path.basename(f))) for f in files]
+        new_files, failures = logic.export_files(
+            tasks, jobs=jobs, progress_callback=lambda d, t, ctx: progress.append(ctx["file"]),
+            file_callback=lambda f, written, failed: finished.append(f),
+        )
+        assert not failures
+        assert sorted(progress) == sorted(files * 3)
+        assert sorted(finished) == files
+        return [(t, os.path.relpath(p, tmp_path / root)) for t, p in new_files]
+
+    assert run("parallel", 2) == run("serial", 1)
+
+
+def test_canceled_process_pool_stops_workers_before_raising(swmm_out, tmp_path):
+    nodes = tuple(f"J{i}" for i in range(150))
+    files = [swmm_out(f"c{i}.out", nodes=nodes, n_periods=500) for i in range(2)]
+    options = dict(EXPORT_OPTIONS, out_format="csv", combine_mode="sep", outdir_root=str(tmp_path / "out"))
+    tasks = [(f, [("node", list(nodes), ["Hydraulic_head", "Depth_above_invert"])],
+              dict(options, out_subdir=os.path.basename(f))) for f in files]
+
+    def cancel(done, total, ctx):
+        raise RuntimeError("Canceled by user")
+
+    with pytest.raises(RuntimeError, match="Canceled by user"):
+        logic.export_files(tasks, jobs=2, progress_callback=cancel)
+
+    def snapshot():
+        return {p: p.stat().st_mtime_ns for p in (tmp_path / "out").rglob("*.csv")}
+
+    written = snapshot()
+    assert len(written) < 2 * len(nodes) * 2
+    time.sleep(0.5)
+    assert snapshot() == written
+
+
+def test_threaded_export_keeps_serial_output_order(swmm_out, tmp_path):
+    path = swmm_out(nodes=tuple(f"J{i}" for i in range(7)), links=("C1", "C2"), n_periods=4)
+    selections = [
+        ("node", [f"J{i}" for i in range(7)], ["Hydraulic_head", "Depth_above_invert"]),
+        ("link", ["C1", "C2"], ["Flow_rate"]),
+    ]
+    assert [len(ids) for _, ids, _ in logic.selection_chunks(selections, 3)] == [3, 3, 1, 1, 1]
+
+    def run(root, threads):
+        progress = []
+        new_files, failures = logic.export_outfile(
+            path, selections, threads=threads,
+            progress_callback=lambda d, t, ctx: progress.append((d, t)),
+            out_format="tsf", combine_mode="com", outdir_root=str(tmp_path / root), out_subdir="m",
+            **EXPORT_OPTIONS,
+        )
+        assert not failures
+        assert len(progress) == 16
+        return [(t, os.path.relpath(p, tmp_path / root)) for t, p in new_files]
+
+    assert run("threaded", 3) == run("serial", 1)
+
+
+def test_threaded_export_converts_units_once(swmm_out, tmp_path, monkeypatch):
+    links = tuple(f"C{i}" for i in range(16))
+    path = swmm_out(links=links, n_periods=50)
+    selections = [("link", list(links), ["Flow_rate", "Flow_velocity"])]
+    applied = []
+    apply = logic.UnitPlan.apply
+
+    def slow_apply(plan, values, params):
+        applied.append(values.shape)
+        time.sleep(0.05)  # widen the window for chunk threads racing on the block
+        apply(plan, values, params)
+
+    monkeypatch.setattr(logic.UnitPlan, "apply", slow_apply)
+
+    def run(root, threads):
+        new_files, failures = logic.export_outfile(
+            path, selections, threads=threads,
+            out_format="csv", combine_mode="sep", outdir_root=str(tmp_path / root), out_subdir="m",
+            **dict(EXPORT_OPTIONS, assume_units={"flow": "cfs", "velocity": "ft/s"},
+                   to_units={"flow": "cms", "velocity": "m/s"}),
+        )
+        assert not failures
+        return [(os.path.basename(p), open(p).read()) for _, p in new_files]
+
+    serial = run("serial", 1)
+    assert run("threaded", 8) == serial
+    assert len(applied) == 2
+    c3 = logic.extract_series(path, "link", "C3", "Flow_rate")["value"].to_numpy()
+    written = pd.read_csv(tmp_path / "serial" / "m" / "Flow_rateC3.csv", skiprows=1)
+    np.testing.assert_allclose(written.iloc[:, 1].to_numpy(), c3 / 35.3146667, atol=1e-6)
+
+
+def test_float32_dtype_is_kept_through_units_and_writing(swmm_out, tmp_path):
+    path = swmm_out(n_periods=3)
+    key = ("link", "C1", "Flow_rate")
+
+    block = logic.extract_batch(path, [key], dtype="float32")
+    assert block.values.dtype == "float32"
+    assert block.covers([key], dtype="float32") and not block.covers([key])
+
+    df, unit = logic.apply_units(block.frame(*key), "Flow_rate", {}, {"flow": "cfs"}, {"flow": "cms"}, {})
+    assert unit == "cms" and df["value"].dtype == "float32"
+
+    options = dict(EXPORT_OPTIONS, out_subdir="m")
+    single, _ = logic.process_elements(path, "link", ["C1"], ["Flow_rate"], "csv", "sep",
+                                       str(tmp_path / "f32"), dtype="float32", **options)
+    double, _ = logic.process_elements(path, "link", ["C1"], ["Flow_rate"], "csv", "sep",
+                                       str(tmp_path / "f64"), **options)
+    with open(single[0]) as a, open(double[0]) as b:
+        assert a.read() == b.read()
+    with pytest.raises(ValueError, match="Unsupported dtype"):
+        logic.value_dtype("int8")
+
+
+def test_summary_table_reduces_every_series_in_one_pass(swmm_out, tmp_path):
+    path = swmm_out(n_periods=10, step_seconds=600)
+    keys = [("link", "C1", "Flow_rate"), ("node", "J2", "Hydraulic_head"), ("node", "J9", "Hydraulic_head")]
+
+    rows, failures = logic.summarize_file(
+        path, keys, stride=2, thresholds={"Flow_rate": 0.1},
+        assume_units={"flow": "cfs"}, to_units={"flow": "cms"},
+    )
+    assert [f[2] for f in failures] == ["J9"]
+    flow, head = rows
+
+    series = logic.extract_series(path, "node", "J2", "Hydraulic_head", stride=2)["value"]
+    assert head["Peak"] == pytest.approx(series.max())
+    assert head["Time of peak"] == series.idxmax()
+    assert head["Min"] == pytest.approx(series.min())
+    assert head["Mean"] == pytest.approx(series.mean())
+    assert np.isnan(head["Total volume"])  # volume only means something for flows
+
+    factor = logic.FLOW_TO_CFS["cfs"] / logic.FLOW_TO_CFS["cms"]
+    flow_cms = logic.extract_series(path, "link", "C1", "Flow_rate", stride=2)["value"] * factor
+    assert flow["Unit"] == "cms"
+    assert flow["Total volume"] == pytest.approx(flow_cms.sum() * 1200)
+    assert flow["Peak"] == pytest.approx(flow_cms.max())
+    assert flow["Hours above threshold"] == pytest.approx((flow_cms > 0.1).sum() * 1200 / 3600)
+
+    table = tmp_path / "summary.csv"
+    logic.write_table(rows, str(table), logic.SUMMARY_COLUMNS, "%Y-%m-%d %H:%M", "%.3f")
+    lines = table.read_text().splitlines()
+    assert lines[0].split(",") == logic.SUMMARY_COLUMNS
+    assert lines[2].split(",")[4:8] == ["", "8.009", "2024-01-01 01:30", "0.009"]
+    assert lines[2].split(",")[-2:] == ["", ""]
+    with pytest.raises(ValueError, match="Invalid threshold"):
+        logic.parse_thresholds("Flow_rate=high")
+
+
+@pytest.mark.parametrize("agg", ["mean", "max", "min", "sum"])
+def test_resample_on_read_matches_pandas_resample(swmm_out, monkeypatch, agg):
+    path = swmm_out(n_periods=40, step_seconds=900)
+    keys = [("node", "J1", "Depth_above_invert"), ("link", "C1", "Flow_rate")]
+    block = logic.extract_batch(path, keys, resample="2h", agg=agg, dtype="float32")
+    assert block.values.dtype == "float32"
+    assert block.covers(keys, resampling=logic.resample_spec("2h", agg), dtype="float32")
+    for key in keys:
+        expected = getattr(logic.extract_series(path, *key)["value"].resample("2h"), agg)()
+        got = block.frame(*key)["value"]
+        assert list(got.index) == list(expected.index)
+        assert got.to_numpy() == pytest.approx(expected.to_numpy(), rel=1e-6)
+
+    # Bins straddling read blocks are merged with the carried partial bin
+    raw = logic.extract_batch(path, keys)
+    acc = ResampleAccumulator(2, 7200, agg)
+    for lo in range(0, len(raw.values), 3):
+        acc.update(raw.index.values[lo:lo + 3], raw.values[lo:lo + 3])
+    times, values = acc.result()
+    assert list(times) == list(block.index.values.astype("datetime64[s]"))
+    assert values == pytest.approx(block.values, rel=1e-6)
+
+    with pytest.raises(ValueError, match="Unsupported aggregation"):
+        logic.resample_spec("1h", "median")
+
+
+def test_events_are_runs_above_threshold_across_read_blocks(swmm_out):
+    path = swmm_out(n_periods=6, step_seconds=600)
+    keys = [("node", "J1", "Depth_above_invert"), ("link", "C1", "Flow_rate"), ("link", "C1", "Flow_depth")]
+
+    rows, failures = logic.detect_events(path, keys, {"Flow_rate": 3.0, "Depth_above_invert": 9.0})
+    assert not failures
+    [event] = rows  # Depth never exceeds 9 and Flow_depth has no threshold
+    assert (event["ID"], event["Periods"], event["Duration (hours)"]) == ("C1", 3, 0.5)
+    assert str(event["Start"]) == "2024-01-01T00:40:00"
+    assert event["Peak"] == pytest.approx(5.014) and event["Time of peak"] == event["End"]
+
+    values = np.array([[0, 5], [3, 5], [4, 0], [4, 6], [0, 6], [2, 1], [5, 7]], dtype=float)
+    times = np.datetime64("2024-01-01T00:00", "s") + np.arange(7) * np.timedelta64(60, "s")
+    acc = EventAccumulator(2, np.array([1.0, 4.0]))
+    for lo in range(0, 7, 2):
+        acc.update(times[lo:lo + 2], values[lo:lo + 2])
+    events = acc.result()
+    assert events["series"].tolist() == [0, 0, 1, 1, 1]
+    assert events["periods"].tolist() == [3, 2, 2, 2, 1]
+    assert events["peak"].tolist() == [4, 5, 5, 6, 7]
+    assert (events["peak_time"] - times[0]).astype(int).tolist() == [120, 360, 0, 180, 360]
+
+
+def test_stack_columns_matches_chained_outer_joins():
+    hours = pd.date_range("2024-01-01", periods=4, freq="h")
+    a = pd.DataFrame({"value": [1.0, 2.0, 3.0, 4.0]}, index=hours)
+    b = pd.DataFrame({"value": [5.0, 6.0, 7.0, 8.0]}, index=hours.copy())
+    shifted = pd.DataFrame({"value": [9.0, 10.0]}, index=hours[2:] + pd.Timedelta("30min"))
+
+    for frames in ([(a, "x"), (b, "y (cms)")], [(shifted, "s"), (a, "x"), (b, "y")]):
+        expected = frames[0][0].rename(columns={"value": frames[0][1]})
+        for df, lab in frames[1:]:
+            expected = expected.join(df.rename(columns={"value": lab}), how="outer")
+        pd.testing.assert_frame_equal(logic.stack_columns(frames), expected, check_freq=False)
+    assert logic.stack_columns([(a, "x"), (b, "y")]).index is hours
+
+
+def test_block_series_are_slotted_views_converted_in_place_like_apply_units(swmm_out):
+    path = swmm_out(n_periods=3)
+    keys = [("link", "C1", "Flow_rate"), ("link", "C1", "Flow_velocity"), ("node", "J1", "Hydraulic_head")]
+    maps = ({}, {"flow": "cfs", "velocity": "ft/s"}, {"flow": "cms", "velocity": "m/s"}, {})
+    block = logic.extract_batch(path, keys, dtype="float32")
+
+    ts = block.series(*keys[0])
+    assert np.shares_memory(ts.values, block.values) and ts.index is block.index
+    with pytest.raises(AttributeError):
+        ts.extra = 1
+
+    expected = [logic.apply_units(block.frame(*key), key[2], {}, *maps[1:]) for key in keys]
+    plan = logic.UnitPlan(*maps)
+    block.convert(plan)
+    block.convert(logic.UnitPlan(*maps))  # same plan: no second conversion
+    for key, (df, unit) in zip(keys, expected):
+        converted = block.series(*key)
+        assert converted.unit == unit
+        pd.testing.assert_frame_equal(converted.frame(), df)
+    assert block.covers(keys, dtype="float32", units=plan)
+    assert not block.covers(keys, dtype="float32", units=logic.UnitPlan({}, {}, {}, {}))
+    with pytest.raises(ValueError, match="already converted"):
+        block.convert(logic.UnitPlan({}, {}, {}, {}))
+
+
+def test_derived_series_are_evaluated_over_the_block_and_exported(swmm_out, tmp_path):
+    path = swmm_out(links=("C1", "C2"), n_periods=4)
+    derived = logic.parse_derive(
+        "total=link:C1:Flow_rate + link:C2:Flow_rate; rel=maximum(node:J1:Hydraulic_head - 0.5, 0);"
+        "bad=node:missing:Hydraulic_head * 2"
+    )
+    assert pickle.loads(pickle.dumps(derived[0])).operands == derived[0].operands
+    options = dict(
+        EXPORT_OPTIONS, out_format="csv", combine_mode="sep", outdir_root=str(tmp_path), out_subdir="m",
+        assume_units={"flow": "cfs"}, to_units={"flow": "cms"},
+    )
+
+    written, failures = logic.export_outfile(
+        path, logic.derived_selection(derived), derive=derived, **options
+    )
+
+    assert [(t, os.path.basename(f)) for t, f in written] == [
+        ("derived", "Valuetotal.csv"), ("derived", "Valuerel.csv"),
+    ]
+    assert failures[0][1:4] == ("derived", "bad", "Value") and "missing" in failures[0][4]
+    c1 = logic.extract_series(path, "link", "C1", "Flow_rate")["value"].to_numpy()
+    c2 = logic.extract_series(path, "link", "C2", "Flow_rate")["value"].to_numpy()
+    total = pd.read_csv(written[0][1], skiprows=1)["Value"].to_numpy()
+    np.testing.assert_allclose(total, (c1 + c2) / 35.3146667, atol=1e-6)
+
+
+@pytest.mark.parametrize("spec", [
+    "x=__import__('os')", "x=link:C1:Flow_rate.real", "x=1 + 2", "x=link:C1:Flow_rate +", "noeq",
+])
+def test_derive_rejects_expressions_outside_the_whitelist(spec):
+    with pytest.raises(ValueError):
+        logic.parse_derive(spec)
+
+
+def test_derived_values_are_full_length_writable_float64(swmm_out):
+    column = np.arange(3, dtype=np.float32)
+    d = logic.DerivedSeries("x", "link:C1:Flow_rate * 0 + 1e10 + link:C1:Flow_rate")
+    result = d.evaluate([column])
+    assert result.dtype == np.float64 and result.flags.writeable
+    assert result.tolist() == [1e10, 1e10 + 1, 1e10 + 2]
+    result *= 2  # usable by in-place unit conversion
+
+    key = ("link", "C1", "Flow_rate")
+    block = logic.extract_batch(swmm_out(n_periods=3), [key], dtype="float32")
+    block.add_derived(logic.parse_derive("y=link:C1:Flow_rate * 2"))
+    assert block.values.dtype == np.float32 and block.covers([key], dtype="float32")
+    np.testing.assert_allclose(block.series("derived", "y", "Value").values,
+                               block.series(*key).values * 2)
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_across_combine_uses_kept_segments_and_reads_only_other_files(swmm_out, tmp_path, monkeypatch, spill):
+    files = [swmm_out(f"y{i}.out", n_periods=3, start=datetime(2024, 1, 1 + i)) for i in range(2)]
+    selections = [("node", ["J1"], ["Hydraulic_head"]), ("link", ["C1"], ["Flow_rate"])]
+    options = dict(
+        EXPORT_OPTIONS, out_format="tsf", combine_mode="across", outdir_root=str(tmp_path / "out"),
+        assume_units={"flow": "cfs"}, to_units={"flow": "cms"},
+    )
+    tasks = [(f, selections, dict(options, out_subdir=os.path.basename(f))) for f in files]
+
+    new_files, _ = logic.export_files(tasks)
+    logic.combine_across_files(new_files, "tsf", str(tmp_path / "text"))
+
+    segments = logic.SegmentStore(str(tmp_path / "spill") if spill else None)
+    kept_files, _ = logic.export_files(tasks, segments=segments)
+    previous = tmp_path / "earlier.tsf"
+    previous.write_text("IDs:\tJ1\nDate/Time\tHydraulic_head\n12/31/2023 23:00\t7.000000\n")
+    parsed = []
+    read = logic.read_timeseries_file
+    monkeypatch.setattr(logic, "read_timeseries_file", lambda fp, **kw: parsed.append(fp) or read(fp, **kw))
+    logic.combine_across_files(kept_files + [("node", str(previous))], "tsf", str(tmp_path / "kept"),
+                               segments=segments)
+    segments.clear()
+
+    assert parsed == [str(previous)]
+    for name in ("linkC1Flow_ratecms.tsf", "nodeJ1Hydraulic_head.tsf"):
+        text = (tmp_path / "text" / "combined" / name).read_text().splitlines()
+        kept = (tmp_path / "kept" / "combined" / name).read_text().splitlines()
+        assert kept[:2] == text[:2]
+        assert kept[2:] == (["12/31/2023 23:00\t7.000000"] if name.startswith("node") else []) + text[2:]
+    if spill:
+        assert not list((tmp_path / "spill").iterdir())
+
+
+def test_across_combine_from_segments_rounds_to_the_float_format(swmm_out, tmp_path):
+    files = [swmm_out(f"f{i}.out", n_periods=3, start=datetime(2024, 1, 1 + i)) for i in range(2)]
+    selections = [("link", ["C1"], ["Flow_rate"])]
+    options = dict(
+        EXPORT_OPTIONS, out_format="csv", combine_mode="across", float_format="%.2f",
+        label_map={"Flow_rate": "Flow, rate"}, assume_units={"flow": "cfs"}, to_units={"flow": "cms"},
+    )
+
+    def run(root, segments):
+        tasks = [(f, selections, dict(options, outdir_root=str(tmp_path / root),
+                                       out_subdir=os.path.basename(f))) for f in files]
+        new_files, _ = logic.export_files(tasks, segments=segments)
+        if segments is not None:
+            assert [segments.get(p) for _, p in new_files] == [("C1", "Flow_rate")] * 2
+        logic.combine_across_files(new_files, "csv", str(tmp_path / root), segments=segments,
+                                   float_format="%.2f")
+        return [p for _, p in new_files], (tmp_path / root / "combined" / "Flow_rateC1.csv").read_text()
+
+    per_file, text = run("text", None)
+    _, kept = run("kept", logic.SegmentStore())
+    assert kept == text
+    rows = [line.split(",") for p in per_file for line in open(p).read().splitlines()[2:]]
+    assert kept.splitlines()[2:] == [f"{t},{float(v):.6f}" for t, v in rows]
+
+
+def test_parallel_combine_matches_serial_and_reports_once(swmm_out, tmp_path, caplog):
+    files = [swmm_out(f"p{i}.out", n_periods=4, start=datetime(2024, 1, 1 + i)) for i in range(3)]
+    selections = [("node", ["J1", "J2"], ["Depth_above_invert", "Hydraulic_head"]), ("link", ["C1"], ["Flow_rate"])]
+    options = dict(EXPORT_OPTIONS, out_format="dat", combine_mode="sep", outdir_root=str(tmp_path / "out"))
+    tasks = [(f, selections, dict(options, out_subdir=os.path.basename(f))) for f in files]
+    new_files, _ = logic.export_files(tasks)
+    broken = tmp_path / "broken.dat"
+    broken.write_text("IDs:\tJ1\nDate/Time\tDepth_above_invert\n13/45/2024 00:00\t1\n")
+    new_files += [("node", str(broken)), ("node", str(tmp_path / "missing.dat"))]
+
+    outputs = {}
+    for jobs in (1, 3):
+        caplog.clear()
+        logic.combine_across_files(new_files, "dat", str(tmp_path / f"j{jobs}"), jobs=jobs)
+        combined = tmp_path / f"j{jobs}" / "combined"
+        outputs[jobs] = {p.name: p.read_text() for p in combined.iterdir()}
+        reports = [r for r in caplog.records if r.levelname == "WARNING"]
+        assert len(reports) == 1
+        assert "broken.dat" in reports[0].getMessage() and "missing.dat" in reports[0].getMessage()
+
+    assert len(outputs[1]) == 5
+    assert outputs[3] == outputs[1]
+
+
+def test_across_combine_formats_a_shared_time_axis_once(swmm_out, tmp_path, monkeypatch):
+    files = [swmm_out(f"t{i}.out", n_periods=4, start=datetime(2024, 1, 1 + i)) for i in range(2)]
+    selections = [("node", ["J1", "J2"], ["Depth_above_invert", "Hydraulic_head"])]
+    options = dict(EXPORT_OPTIONS, out_format="dat", combine_mode="across", outdir_root=str(tmp_path / "out"))
+    tasks = [(f, selections, dict(options, out_subdir=os.path.basename(f))) for f in files]
+    new_files, _ = logic.export_files(tasks)
+    calls = []
+    original = logic.format_timestamps
+    monkeypatch.setattr(logic, "format_timestamps", lambda index, fmt: calls.append(len(index)) or original(index, fmt))
+
+    logic.combine_across_files(new_files, "dat", str(tmp_path / "out"))
+
+    assert len(list((tmp_path / "out" / "combined").iterdir())) == 4
+    assert calls == [4, 4]  # one block per source file, each formatted once
+
+
+def test_merge_segments_matches_sorted_concat_keeping_first_file():
+    rng = np.random.default_rng(7)
+    hours = np.datetime64("2024-01-01T00:00", "ns") + np.arange(60) * np.timedelta64(1, "h")
+    # Contiguous years, an overlapping rerun, a gap and a run with a repeated stamp
+    spans = [(0, 10), (10, 20), (15, 25), (40, 50), (50, 55)]
+    sources, frames = [], []
+    for k, (lo, hi) in enumerate(spans):
+        times = hours[lo:hi]
+        if k == 4:
+            times = np.sort(np.concatenate([times, times[:1]]))
+        cols = ["a", "b"] if k == 2 else ["a"]
+        values = rng.random((len(times), len(cols)))
+        sources.append((cols, times, values))
+        frames.append(pd.DataFrame(values, index=times, columns=cols))
+
+    expected = pd.concat(frames).sort_index(kind="stable")
+    expected = expected[~expected.index.duplicated(keep="first")]
+    blocks = list(logic.merge_segments(sources, ["a", "b"], chunk_rows=4))
+
+    assert max(len(t) for t, _ in blocks) == 4
+    np.testing.assert_array_equal(np.concatenate([t for t, _ in blocks]), expected.index.values)
+    np.testing.assert_array_equal(np.concatenate([v for _, v in blocks]), expected.to_numpy())
+
+
+def test_read_timeseries_file_parses_stamps_and_ragged_rows_in_bulk(tmp_path, monkeypatch):
+    path = tmp_path / "part.csv"
+    path.write_text(
+        "IDs,J1\n"
+        "Date/Time,Depth,Head\n"
+        "01/31/2024 23:45,1.5,10\n"
+        "not a data line\n"
+        "02/29/2024 00:00,abc\n"
+        "12/01/1999 07:05,3,4e2,7\n"
+    )
+    monkeypatch.setattr(logic, "READ_CHUNK_BYTES", 16)
+
+    df = logic.read_timeseries_file(str(path), skip=1)
+
+    assert list(df.columns) == ["Depth", "Head", "Depth_3"]
+    assert df.attrs == {"ids": ["J1"], "label": "Depth"}
+    assert [ts for ts, _ in logic.parse_data_lines(str(path), skip=1)] == list(df.index)
+    np.testing.assert_array_equal(
+        df.to_numpy(), [[1.5, 10.0, np.nan], [np.nan, np.nan, np.nan], [3.0, 400.0, 7.0]]
+    )
+
+    path.write_text("IDs,J1\nDate/Time,Depth\n02/30/2024 00:00,1\n")
+    with pytest.raises(ValueError, match="02/30/2024"):
+        logic.read_timeseries_file(str(path))
+
+
+def test_presets_round_trip_report_flags():
+    parser = logic.build_parser()
+    args = parser.parse_args(["m.out", "--summary", "--events", "--thresholds", "Flow_rate=1"])
+    saved = json.loads(json.dumps(logic.args_to_preset(args)))
+
+    plain = parser.parse_args(["m.out"])
+    loaded = logic.merge_preset(plain, saved, plain)
+
+    assert loaded.summary is True and loaded.events is True
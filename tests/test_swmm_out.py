@@ -0,0 +1,184 @@
+import os
+import struct
+
+import numpy as np
+import pytest
+
+from extracttimeseries import logic
+from extracttimeseries.swmm_out import OutputPool, SwmmOutput, SwmmOutputError, swmm_dates_to_datetime64
+
+
+def test_reader_parses_catalog_and_serves_strided_series(swmm_out):
+    path = swmm_out(subcatchments=("S1",), pollutants=("TSS",), n_periods=3)
+
+    with SwmmOutput(path) as out:
+        assert out.ids("node") == ["J1", "J2"]
+        assert out.ids("pollutant") == ["TSS"]
+        assert out.params("link")[:2] == ["Flow_rate", "Flow_depth"]
+        assert out.params("node")[-1] == "TSS"
+        assert out.n_periods == 3
+
+        col = out.column("node", "J2", "Hydraulic_head")
+        values = out.values("node", "J2", "Hydraulic_head")
+        assert values.dtype == np.float32
+        expected = np.arange(3) + 0.001 * col
+        np.testing.assert_allclose(values, expected, rtol=1e-6)
+
+        times = out.times()
+        assert str(times[0]) == "2024-01-01T01:00:00"
+        assert str(times[-1]) == "2024-01-01T03:00:00"
+
+        with pytest.raises(ValueError, match="not found"):
+            out.column("node", "missing", "Hydraulic_head")
+
+
+def test_reader_rejects_non_swmm_files(tmp_path):
+    bogus = tmp_path / "bogus.out"
+    bogus.write_bytes(b"\0" * 128)
+    with pytest.raises(SwmmOutputError):
+        SwmmOutput(str(bogus))
+    with logic.swmm_output(str(bogus)) as reader:
+        assert reader is None
+
+
+def test_logic_discovery_and_extraction_use_native_reader(swmm_out):
+    path = swmm_out(n_periods=2)
+
+    assert logic.discover_ids(path, "node") == ["J1", "J2"]
+    assert "Flow_rate" in logic.list_possible_params(path, "link")
+
+    df = logic.extract_series(path, "link", "C1", "Flow_rate")
+    assert list(df.columns) == ["value"]
+    assert len(df) == 2
+    assert df.index[0].strftime("%m/%d/%Y %H:%M") == "01/01/2024 01:00"
+
+
+def test_discover_all_reads_every_type_from_one_catalog(swmm_out, monkeypatch):
+    path = swmm_out(subcatchments=("S1",), pollutants=("TSS", "BOD"))
+    calls = []
+    catalog = logic.file_catalog
+    monkeypatch.setattr(logic, "file_catalog", lambda f: calls.append(f) or catalog(f))
+
+    ids, params = logic.discover_all(path)
+
+    assert calls == [path]
+    assert ids["node"] == ["J1", "J2"] and ids["subcatchment"] == ["S1"]
+    assert ids["pollutant"] == ["TSS", "BOD"]
+    assert params["pollutant"] == ["Concentration"]
+    assert "TSS" in params["node"] and params["link"] == sorted(params["link"])
+    monkeypatch.setattr(logic, "file_catalog", catalog)
+    for t in ids:
+        assert logic.discover_ids(path, t) == ids[t]
+        assert logic.list_possible_params(path, t) == params[t]
+
+
+def test_pool_reuses_readers_and_evicts_least_recently_used(swmm_out):
+    first = swmm_out("a.out")
+    second = swmm_out("b.out")
+    pool = OutputPool(max_handles=1)
+
+    reader = pool.acquire(first)
+    pool.release(reader)
+    assert pool.acquire(first) is reader
+    pool.release(reader)
+    assert pool.stats()["hits"] == 1
+
+    other = pool.acquire(second)
+    pool.release(other)
+    assert reader.closed
+    assert pool.stats() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 1,
+        "open": 1,
+        "mapped_bytes": os.path.getsize(second),
+    }
+    pool.clear()
+    assert other.closed
+
+
+def test_evicted_reader_stays_open_while_views_live_and_closes_later(swmm_out):
+    first = swmm_out("a.out")
+    second = swmm_out("b.out")
+    pool = OutputPool(max_handles=1)
+
+    reader = pool.acquire(first)
+    view = reader.values("node", "J1", "Hydraulic_head")
+    view_column = reader.column("node", "J1", "Hydraulic_head")
+    pool.release(reader)
+    pool.release(pool.acquire(second))  # evicts the first reader
+    assert reader.closing and not reader.closed
+    assert float(view[0]) == pytest.approx(0.001 * view_column)
+    with pytest.raises(ValueError, match="closed"):
+        reader.values("node", "J1", "Hydraulic_head")
+
+    again = pool.acquire(first)
+    assert again is not reader
+    del view
+    pool.release(again)
+    assert reader.closed
+    pool.clear()
+
+
+def test_read_columns_honours_period_stride_across_chunks(swmm_out):
+    path = swmm_out(n_periods=10)
+
+    with SwmmOutput(path) as out:
+        cols = [out.column("node", "J1", "Depth_above_invert"), out.column("link", "C1", "Flow_rate")]
+        full = out.read_columns(cols)
+        periods = out.sample(out.period_range(), 3)
+        thinned = out.read_columns(cols, periods=periods, chunk_bytes=1)
+        np.testing.assert_array_equal(thinned, full[::3])
+        assert len(out.times(periods)) == 4
+
+
+def test_threaded_read_matches_single_threaded_read(swmm_out):
+    path = swmm_out(n_periods=25)
+
+    with SwmmOutput(path) as out:
+        cols = list(range(out.period_floats))
+        periods = out.sample(out.period_range(), 2)
+        np.testing.assert_array_equal(
+            out.read_columns(cols, periods=periods, threads=4, chunk_bytes=1),
+            out.read_columns(cols, periods=periods),
+        )
+
+
+def test_iter_columns_streams_the_same_values_in_blocks(swmm_out):
+    path = swmm_out(n_periods=9)
+
+    with SwmmOutput(path) as out:
+        cols = [out.column("node", "J1", "Depth_above_invert"), out.column("link", "C1", "Flow_rate")]
+        periods = out.sample(out.period_range(), 2)
+        blocks = list(out.iter_columns(cols, periods=periods, chunk_bytes=2 * out.period_bytes))
+        assert [len(b) for _, b in blocks] == [2, 2, 1]
+        np.testing.assert_array_equal(
+            np.concatenate([b for _, b in blocks]), out.read_columns(cols, periods=periods)
+        )
+        np.testing.assert_array_equal(
+            np.concatenate([out.times(p) for p, _ in blocks]), out.times(periods)
+        )
+
+
+def test_time_axis_is_arithmetic_and_falls_back_to_stored_stamps(swmm_out):
+    path = swmm_out(n_periods=5, step_seconds=900)
+
+    with SwmmOutput(path) as out:
+        first, step = out.time_axis()
+        assert str(first) == "2024-01-01T00:15:00" and step == np.timedelta64(900, "s")
+        periods = out.sample(out.period_range(), 2)
+        np.testing.assert_array_equal(out.times(periods), swmm_dates_to_datetime64(out.raw_dates()[periods]))
+        stamp_at = out.results_offset + 3 * out.period_bytes
+
+    # A shifted stamp (e.g. an irregular reporting step) disables the shortcut
+    with open(path, "r+b") as fh:
+        fh.seek(stamp_at)
+        (days,) = struct.unpack("<d", fh.read(8))
+        fh.seek(stamp_at)
+        fh.write(struct.pack("<d", days + 60 / 86400))
+
+    with SwmmOutput(path) as out:
+        assert out.time_axis() is None
+        assert str(out.times()[3]) == "2024-01-01T01:01:00"
+        index = logic.time_index(out, slice(0, 5))
+        assert logic.time_index(out, slice(None)) is index